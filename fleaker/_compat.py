@@ -18,6 +18,8 @@ if PY2:
     text_type = unicode
     string_types = (str, unicode)
     from urllib import urlencode
+    import Queue as queue
+    from collections import Mapping
     iteritems = lambda dictlike: dictlike.iteritems()
 
     # taken straight from werkzeug:
@@ -40,6 +42,8 @@ else:
     text_type = str
     string_types = (str,)
     from urllib.parse import urlencode
+    import queue
+    from collections.abc import Mapping
     iteritems = lambda dictlike: iter(dictlike.items())
 
     # taken straight from werkzeug:
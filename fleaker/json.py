@@ -5,6 +5,14 @@ fleaker.json
 
 Custom JSON classes so more complex objects can be serialized by Flask. This
 will be your default JSON Encoder if you use the standard Fleaker app.
+
+The ``JSON_BACKEND`` config value picks the library that does the encoding:
+
+* ``'simplejson'``: The default, which uses :class:`FleakerJSONEncoder`.
+* ``'orjson'``: Uses :class:`FleakerOrjsonEncoder`, which is much faster and
+  serializes everything but non finite floats the same way, as it shares
+  :meth:`FleakerJSONEncoder.default`. If ``orjson`` isn't installed,
+  ``simplejson`` is used instead.
 """
 
 from __future__ import absolute_import
@@ -18,10 +26,41 @@ import pendulum
 import phonenumbers
 import simplejson
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ._compat import text_type
 from .base import BaseApplication
 
 
+# The serializer found for each (encoder class, type)
+_resolved_serializers = {}
+
+
+def _serialize_decimal(obj):
+    """Serialize a Decimal with no trailing zeros or unnecessary values."""
+    str_digit = text_type(format(obj, 'f'))
+
+    return (str_digit.rstrip('0').rstrip('.')
+            if '.' in str_digit
+            else str_digit)
+
+
+def _serialize_phone_number(obj):
+    """Serialize a PhoneNumber to an E.164 phone number."""
+    return phonenumbers.format_number(
+        obj,
+        phonenumbers.PhoneNumberFormat.E164
+    )
+
+
+def _serialize_isoformat(obj):
+    """Serialize a date or datetime to an ISO8601 string."""
+    return obj.isoformat()
+
+
 class FleakerJSONEncoder(simplejson.JSONEncoder):
     """Custom JSON encoder that will serialize more complex datatypes.
 
@@ -47,6 +86,14 @@ class FleakerJSONEncoder(simplejson.JSONEncoder):
     not ISO8601. This isn't really acceptable for our use cases, so we will
     continue to override those types.
 
+    Any other iterable is serialized to a list.
+
+    The serializers are kept in a registry that maps types to the functions
+    serializing them, and more types can be supported by registering them
+    with :meth:`register`. The serializer of an object is the one registered
+    for the first type in its MRO that has one, so subclasses of registered
+    types are supported as well. The serializer found for a type is cached.
+
     Extended from http://flask.pocoo.org/snippets/119/.
 
     .. versionadded:: 0.1.0
@@ -55,6 +102,116 @@ class FleakerJSONEncoder(simplejson.JSONEncoder):
 
     # @TODO (json, doc): Fix links in above; intersphinx to libs.
 
+    _serializers = {
+        decimal.Decimal: _serialize_decimal,
+        phonenumbers.PhoneNumber: _serialize_phone_number,
+        pendulum.Pendulum: text_type,
+        arrow.Arrow: text_type,
+        datetime.datetime: _serialize_isoformat,
+        datetime.date: _serialize_isoformat,
+    }
+
+    @classmethod
+    def register(cls, type_, serializer=None):
+        """Register the function that serializes a type.
+
+        Serializers registered on a subclass of this encoder are only used
+        by that subclass.
+
+        Example:
+            .. code-block:: python
+
+                import uuid
+
+                from fleaker.json import FleakerJSONEncoder
+
+                FleakerJSONEncoder.register(uuid.UUID, str)
+
+                @FleakerJSONEncoder.register(Money)
+                def serialize_money(money):
+                    return {'amount': money.amount,
+                            'currency': money.currency}
+
+        Args:
+            type_ (type): The type to serialize.
+
+        Keyword Args:
+            serializer (callable, optional): The function that takes an
+                instance of the type and returns its JSON serializable
+                representation. If not provided, a decorator that registers
+                the function it decorates is returned.
+
+        Returns:
+            callable: The serializer, or a decorator if it wasn't provided.
+        """
+        if serializer is None:
+            def decorator(func):
+                cls.register(type_, func)
+                return func
+
+            return decorator
+
+        # Subclasses get their own registry, layered over their parent's
+        if '_serializers' not in cls.__dict__:
+            cls._serializers = {}
+
+        cls._serializers[type_] = serializer
+        _resolved_serializers.clear()
+
+        return serializer
+
+    @classmethod
+    def unregister(cls, type_):
+        """Remove the serializer registered for a type on this encoder.
+
+        Serializers registered on a parent encoder are left in place.
+
+        Args:
+            type_ (type): The type whose serializer is removed.
+
+        Returns:
+            callable|None: The removed serializer, or ``None`` if this encoder
+                had none registered for the type.
+        """
+        serializer = vars(cls).get('_serializers', {}).pop(type_, None)
+        _resolved_serializers.clear()
+
+        return serializer
+
+    @classmethod
+    def get_serializer(cls, type_):
+        """Return the serializer for a type, looking through its MRO.
+
+        Args:
+            type_ (type): The type of the object to serialize.
+
+        Returns:
+            callable|None: The serializer, or ``None`` if there isn't one.
+        """
+        try:
+            return _resolved_serializers[cls, type_]
+        except KeyError:
+            pass
+
+        registries = [vars(encoder)['_serializers']
+                      for encoder in cls.__mro__
+                      if '_serializers' in vars(encoder)]
+        serializer = None
+
+        for base in getattr(type_, '__mro__', (type_,)):
+            for registry in registries:
+                serializer = registry.get(base)
+
+                if serializer is not None:
+                    break
+
+            if serializer is not None:
+                break
+
+        _resolved_serializers[cls, type_] = serializer
+
+        return serializer
+
     def __init__(self, *args, **kwargs):
         super(FleakerJSONEncoder, self).__init__(*args, **kwargs)
 
@@ -73,28 +230,10 @@ class FleakerJSONEncoder(simplejson.JSONEncoder):
             str: The stringified, valid JSON representation of our provided
                 object.
         """
-        if isinstance(obj, decimal.Decimal):
-            obj = format(obj, 'f')
-            str_digit = text_type(obj)
-
-            return (str_digit.rstrip('0').rstrip('.')
-                    if '.' in str_digit
-                    else str_digit)
-
-        elif isinstance(obj, phonenumbers.PhoneNumber):
-            return phonenumbers.format_number(
-                obj,
-                phonenumbers.PhoneNumberFormat.E164
-            )
-
-        elif isinstance(obj, pendulum.Pendulum):
-            return text_type(obj)
+        serializer = self.get_serializer(type(obj))
 
-        elif isinstance(obj, arrow.Arrow):
-            return text_type(obj)
-
-        elif isinstance(obj, (datetime.datetime, datetime.date)):
-            return obj.isoformat()
+        if serializer is not None:
+            return serializer(obj)
 
         try:
             return list(iter(obj))
@@ -104,6 +243,101 @@ class FleakerJSONEncoder(simplejson.JSONEncoder):
         return super(FleakerJSONEncoder, self).default(obj)
 
 
+class FleakerOrjsonEncoder(FleakerJSONEncoder):
+    """JSON encoder that encodes with ``orjson``, using the same
+    :meth:`FleakerJSONEncoder.default` for everything ``orjson`` doesn't
+    serialize natively, including dates and datetimes.
+
+    The output is always compact and never escapes non ASCII characters.
+    Anything ``orjson`` can't do, like an indent other than 2 or integers
+    larger than 64 bits, is encoded by ``simplejson`` instead.
+    :class:`simplejson.RawJSON` text can't be written out as it is, so it is
+    decoded and encoded again. Objects with an ``_asdict`` method, like
+    namedtuples, are encoded as JSON objects, as ``simplejson`` encodes them.
+
+    ``NaN`` and infinite floats are written as ``null`` by ``orjson``, where
+    ``simplejson`` writes ``NaN`` and ``Infinity``, which aren't valid JSON,
+    or raises a :class:`ValueError` if ``allow_nan`` is off. They can't be
+    found without walking the whole object, so they are left to ``orjson``.
+    """
+
+    _serializers = {
+        simplejson.RawJSON: lambda obj: simplejson.loads(obj.encoded_json),
+    }
+
+    def _get_option(self):
+        """Return the ``orjson`` option for the encoder's settings, or
+        ``None`` if ``orjson`` can't encode with them.
+        """
+        if orjson is None or self.indent not in (None, 2, '  '):
+            return None
+
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        if self.indent is not None:
+            option |= orjson.OPT_INDENT_2
+
+        return option
+
+    def iterencode(self, o, _one_shot=False):
+        """Encode the object, yielding the JSON string in one chunk.
+
+        Args:
+            o (object): The object to encode.
+
+        Returns:
+            iterator[str]: The chunks of the JSON string.
+        """
+        option = self._get_option()
+
+        if option is None:
+            return super(FleakerOrjsonEncoder, self).iterencode(o, _one_shot)
+
+        # Values like iterators can only be converted once, so keep what was
+        # converted in case simplejson has to encode the object after all
+        converted = {}
+
+        def default(obj):
+            # orjson passes tuple subclasses on, and simplejson encodes
+            # namedtuples as objects before anything else
+            asdict = self.namedtuple_as_object and getattr(
+                obj, '_asdict', None
+            )
+            value = asdict() if callable(asdict) else self.default(obj)
+            converted[id(obj)] = (obj, value)
+
+            return value
+
+        try:
+            return iter([orjson.dumps(o, default=default,
+                                      option=option).decode('utf-8')])
+        except orjson.JSONEncodeError:
+            pass
+
+        def fallback(obj):
+            if id(obj) in converted:
+                return converted[id(obj)][1]
+
+            return FleakerOrjsonEncoder.default(self, obj)
+
+        self.default = fallback
+
+        try:
+            chunks = super(FleakerOrjsonEncoder, self).iterencode(o, True)
+            return iter([''.join(chunks)])
+        finally:
+            del self.default
+
+
+JSON_BACKENDS = {
+    'simplejson': FleakerJSONEncoder,
+    'orjson': FleakerOrjsonEncoder,
+}
+
+
 class FleakerJSONApp(BaseApplication):
     """App class mixin that defines a custom JSON encoder.
 
@@ -113,7 +347,8 @@ class FleakerJSONApp(BaseApplication):
         json (flask.json): An alias to ``flask.json`` so it can be accessed via
             the app because that's convenient.
         json_encoder (json.JSONEncoder): The JSON encoder that the App should
-            use by default.
+            use by default. This is picked by the ``JSON_BACKEND`` config
+            value, unless it has been set to another encoder.
 
     .. versionadded:: 0.1.0
        This has been around since before Fleaker was made public.
@@ -126,3 +361,101 @@ class FleakerJSONApp(BaseApplication):
         self.json_encoder = FleakerJSONEncoder
         self.json = flask.json
         self.config.setdefault('JSON_SORT_KEYS', True)
+        self.config.setdefault('JSON_BACKEND', 'simplejson')
+
+        self.add_post_configure_callback(self._configure_json_backend)
+
+    def _configure_json_backend(self, config, *args):
+        """Set the JSON encoder for the configured ``JSON_BACKEND``.
+
+        Raises:
+            ValueError: Raised if the backend isn't a known backend.
+        """
+        backend = config['JSON_BACKEND']
+
+        if backend not in JSON_BACKENDS:
+            raise ValueError(
+                "The JSON backend '{}' is not valid. Please use one of: "
+                "{}.".format(backend, ', '.join(sorted(JSON_BACKENDS)))
+            )
+
+        if backend == 'orjson' and orjson is None:
+            self.logger.warning("orjson is not installed, so simplejson will "
+                                "be used instead.")
+            backend = 'simplejson'
+
+        # Leave custom encoders alone
+        if self.json_encoder in JSON_BACKENDS.values():
+            self.json_encoder = JSON_BACKENDS[backend]
+
+    def stream_json(self, query, schema=None, chunk_size=100):
+        """Return a streamed response with a JSON array of the query's rows.
+
+        The rows are fetched from the cursor one at a time with
+        ``query.iterator()``, so the query's results are never all held in
+        memory, and the response starts as soon as the first rows are read.
+        The query runs and the rows are dumped while the response is sent,
+        within the request's context, so the request's database connection
+        stays open until the last row is read.
+
+        Example:
+            .. code-block:: python
+
+                @app.route('/users')
+                def list_users():
+                    return app.stream_json(User.base_query(), UserSchema)
+
+        Args:
+            query (peewee.SelectQuery|iterable): The query, or any other
+                iterable, whose rows should be returned.
+            schema (marshmallow.Schema|type, optional): The schema, or schema
+                class, each row is dumped with before it is encoded. If this
+                isn't provided, the rows are encoded as they are.
+            chunk_size (int, optional): The number of rows sent in each chunk
+                of the response. This defaults to 100.
+
+        Returns:
+            flask.Response: The streamed response.
+        """
+        if isinstance(schema, type):
+            schema = schema()
+
+        # The response may be sent after the app context is gone, so the
+        # encoder is made now
+        encoder = self.json_encoder(
+            separators=(',', ':'),
+            sort_keys=self.config['JSON_SORT_KEYS'],
+        )
+
+        def generate():
+            # The query only runs once the response is sent
+            rows = query.iterator() if hasattr(query, 'iterator') else query
+            chunk = []
+            prefix = '['
+
+            for row in rows:
+                if schema is not None:
+                    row = schema.dump(row).data
+
+                chunk.append(encoder.encode(row))
+
+                if len(chunk) >= chunk_size:
+                    yield prefix + ','.join(chunk)
+                    chunk = []
+                    prefix = ','
+
+            if chunk:
+                yield prefix + ','.join(chunk) + ']'
+            elif prefix == '[':
+                yield '[]'
+            else:
+                yield ']'
+
+        body = generate()
+
+        # Keep the request, and its database connection, around until the
+        # whole body is sent
+        if flask.has_request_context():
+            body = flask.stream_with_context(body)
+
+        return self.response_class(body, mimetype='application/json')
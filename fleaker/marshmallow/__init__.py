@@ -60,5 +60,6 @@ from .extension import MarshmallowAwareApp, marsh
 from .json_schema import FleakerJSONSchema
 from .schema import Schema
 from .fields import (
-    ArrowField, ForeignKeyField, PendulumField, PhoneNumberField
+    ArrowField, ForeignKeyField, PendulumField, PhoneNumberField,
+    normalize_phone_numbers
 )
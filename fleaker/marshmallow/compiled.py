@@ -0,0 +1,372 @@
+# ~*~ coding: utf-8 ~*~
+"""
+fleaker.marshmallow.compiled
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Module that provides the compiled dumping of Fleaker's Marshmallow schemas.
+
+Marshmallow dumps every field of every object through several layers of
+generic calls. A compiled schema instead works out once, for each combination
+of fields, how every field gets its value and how that value is converted, and
+then dumps each object with a single loop over those steps. The common fields,
+including Fleaker's ``ArrowField``, ``PendulumField``, ``ForeignKeyField`` and
+``PhoneNumberField``, are converted directly, and foreign keys are read from
+Peewee instances without loading the related records. Every other field is
+serialized by the field itself.
+
+The output is the same as Marshmallow's. If any field fails to serialize, the
+objects are dumped again by Marshmallow, so errors are reported as they always
+are.
+
+Example:
+    To compile a schema, set ``Meta.compiled``.
+
+    .. code-block:: python
+
+        from marshmallow import fields
+
+        from fleaker.marshmallow import ArrowField, Schema
+
+        class UserSchema(Schema):
+            id = fields.Integer()
+            name = fields.String()
+            created = ArrowField()
+
+            class Meta:
+                compiled = True
+
+        UserSchema(many=True).dump(User.base_query())
+"""
+
+from __future__ import absolute_import
+
+from marshmallow import ValidationError, fields, utils
+from marshmallow.marshalling import Marshaller, missing
+from peewee import (
+    FieldDescriptor, ForeignKeyField as PeeweeForeignKeyField, Model
+)
+
+from fleaker._compat import string_types
+
+from .fields import (
+    ArrowField, ForeignKeyField, PendulumField, PhoneNumberField
+)
+
+# The errors the direct conversions raise where Marshmallow would raise
+# a ValidationError
+_CONVERSION_ERRORS = (ValidationError, AttributeError, TypeError, ValueError)
+
+
+def _reads_data(model_class, key, foreign_key=False):
+    """Return whether the key's value can be read from the ``_data`` of the
+    model's instances.
+
+    These are the fields of the model that are read through the plain Peewee
+    descriptors, or foreign keys to an ``id`` primary key, whose ``_data``
+    holds the id of the related record.
+    """
+    field = model_class._meta.fields.get(key)
+
+    if foreign_key:
+        return (isinstance(field, PeeweeForeignKeyField) and
+                field.to_field.name == 'id')
+
+    if field is None:
+        return False
+
+    for klass in model_class.__mro__:
+        if key in vars(klass):
+            return type(vars(klass)[key]) is FieldDescriptor
+
+    return False
+
+
+def _get_getter(key, foreign_key=False):
+    """Return a function that gets the value of the key from an object like
+    :func:`marshmallow.utils.get_value` does.
+
+    The values of Peewee instances are read directly from their ``_data``
+    when the model's descriptor would only do the same.
+    """
+    if not isinstance(key, string_types) or '.' in key:
+        return lambda obj: utils.get_value(key, obj, missing)
+
+    # Whether each model's values are read from its instances' data
+    reads_data = {}
+
+    def getter(obj):
+        obj_type = type(obj)
+        direct = reads_data.get(obj_type)
+
+        if direct is None:
+            direct = reads_data[obj_type] = (
+                issubclass(obj_type, Model) and
+                _reads_data(obj_type, key, foreign_key=foreign_key)
+            )
+
+        if direct:
+            return obj._data.get(key)
+        elif hasattr(obj, '__getitem__'):
+            try:
+                return obj[key]
+            except (KeyError, AttributeError, IndexError, TypeError):
+                pass
+
+        try:
+            value = getattr(obj, key)
+        except AttributeError:
+            return missing
+
+        return value() if callable(value) else value
+
+    if not foreign_key:
+        return getter
+
+    def foreign_key_getter(obj):
+        value = getter(obj)
+
+        # The data of Peewee instances only holds the id, and ForeignKeyField
+        # only takes the id of truthy values
+        if reads_data[type(obj)] or not value:
+            return value
+
+        return value.id
+
+    return foreign_key_getter
+
+
+def _compile_value(getter, converter, default):
+    """Return a function that gets a value from an object and converts it
+    when it isn't ``None``.
+    """
+    def dump_field(obj):
+        value = getter(obj)
+
+        if value is missing:
+            return default() if callable(default) else default
+        elif value is None:
+            return None
+
+        return converter(value)
+
+    return dump_field
+
+
+def _get_key(attr_name, field):
+    """Return the key of the field's value on the dumped objects."""
+    attribute = getattr(field, 'attribute', None)
+
+    return attr_name if attribute is None else attribute
+
+
+def compile_serialize(attr_name, field):
+    """Dump a field by calling its ``serialize`` method."""
+    return lambda obj: field.serialize(attr_name, obj)
+
+
+def compile_string(attr_name, field):
+    """Dump a :class:`marshmallow.fields.String`."""
+    return _compile_value(
+        _get_getter(_get_key(attr_name, field)), utils.ensure_text_type,
+        field.default
+    )
+
+
+def compile_integer(attr_name, field):
+    """Dump a :class:`marshmallow.fields.Integer` that isn't dumped as
+    a string.
+    """
+    return _compile_value(
+        _get_getter(_get_key(attr_name, field)), int, field.default
+    )
+
+
+def compile_foreign_key(attr_name, field):
+    """Dump a :class:`fleaker.marshmallow.ForeignKeyField`."""
+    return _compile_value(
+        _get_getter(_get_key(attr_name, field), foreign_key=True), int,
+        field.default
+    )
+
+
+def compile_datetime(attr_name, field):
+    """Dump a :class:`marshmallow.fields.DateTime`, including
+    :class:`fleaker.marshmallow.ArrowField` and
+    :class:`fleaker.marshmallow.PendulumField`.
+    """
+    dateformat = field.dateformat or field.DEFAULT_FORMAT
+    format_func = field.DATEFORMAT_SERIALIZATION_FUNCS.get(dateformat)
+    localtime = field.localtime
+
+    if format_func is None:
+        def converter(value):
+            return value.strftime(dateformat)
+    else:
+        def converter(value):
+            return format_func(value, localtime=localtime)
+
+    if isinstance(field, ArrowField):
+        def arrow_converter(value):
+            return converter(getattr(value, 'datetime', value))
+
+        return _compile_value(
+            _get_getter(_get_key(attr_name, field)), arrow_converter,
+            field.default
+        )
+
+    return _compile_value(
+        _get_getter(_get_key(attr_name, field)), converter, field.default
+    )
+
+
+def compile_phone_number(attr_name, field):
+    """Dump a :class:`fleaker.marshmallow.PhoneNumberField`, with its options
+    resolved once.
+    """
+    options = field.get_phone_options()
+
+    def converter(value):
+        value = utils.ensure_text_type(value)
+
+        if value:
+            value = field._format_phone_number(value, attr_name, options)
+
+        return value
+
+    return _compile_value(
+        _get_getter(_get_key(attr_name, field)), converter, field.default
+    )
+
+
+def get_field_compiler(field):
+    """Return the function that compiles the dumping of a field.
+
+    Only the fields whose classes are known exactly are dumped directly, as
+    subclasses may change how their values are serialized.
+
+    Args:
+        field (marshmallow.fields.Field): The field to dump.
+
+    Returns:
+        callable: The compiler, which takes the name of the field on the
+            schema and the field, and returns a function that takes an object
+            and returns the field's dumped value, or ``missing`` if it has
+            none.
+    """
+    field_type = type(field)
+
+    if field_type is fields.String:
+        return compile_string
+    elif field_type is fields.Integer and not field.as_string:
+        return compile_integer
+    elif field_type is ForeignKeyField and not field.as_string:
+        return compile_foreign_key
+    elif field_type in (fields.DateTime, ArrowField, PendulumField):
+        return compile_datetime
+    elif field_type is PhoneNumberField:
+        return compile_phone_number
+
+    return compile_serialize
+
+
+class CompiledMarshaller(Marshaller):
+    """Marshaller that dumps objects with the compiled fields of a schema.
+
+    How each field is compiled is worked out once for each schema class and
+    set of fields, which depends on the schema's ``only`` and ``exclude``, and
+    cached on the class. The compiled fields are then bound to the fields of
+    each schema instance, as their context may differ.
+
+    Args:
+        schema (fleaker.marshmallow.Schema): The schema that is dumped.
+
+    Keyword Args:
+        This takes all the same arguments as
+        :class:`marshmallow.marshalling.Marshaller`.
+    """
+
+    def __init__(self, schema, **kwargs):
+        super(CompiledMarshaller, self).__init__(**kwargs)
+
+        self.schema = schema
+        self._dumpers = (None, None)
+
+    def _get_plan(self, fields_dict):
+        """Return the key, name and compiler of every dumped field."""
+        schema_class = type(self.schema)
+        plans = vars(schema_class).get('_compiled_plans')
+
+        if plans is None:
+            plans = schema_class._compiled_plans = {}
+
+        key = (
+            tuple(self.schema.only or ()), tuple(self.schema.exclude or ()),
+            self.prefix, tuple(fields_dict),
+        )
+        plan = plans.get(key)
+
+        if plan is None:
+            plan = plans[key] = tuple(
+                ((self.prefix or '') + (field.dump_to or attr_name), attr_name,
+                 get_field_compiler(field))
+                for attr_name, field in fields_dict.items()
+                if not getattr(field, 'load_only', False)
+            )
+
+        return plan
+
+    def _get_dumpers(self, fields_dict):
+        """Return the key and compiled field of every dumped field."""
+        if self._dumpers[0] is not fields_dict:
+            dumpers = tuple(
+                (key, compile_field(attr_name, fields_dict[attr_name]))
+                for key, attr_name, compile_field
+                in self._get_plan(fields_dict)
+            )
+            self._dumpers = (fields_dict, dumpers)
+
+        return self._dumpers[1]
+
+    def serialize(self, obj, fields_dict, many=False, accessor=None,
+                  dict_class=dict, index_errors=True, index=None):
+        """Dump the objects with the compiled fields, or with Marshmallow if
+        any of them fail.
+        """
+        if self._pending:
+            return super(CompiledMarshaller, self).serialize(
+                obj, fields_dict, many=many, accessor=accessor,
+                dict_class=dict_class, index_errors=index_errors, index=index
+            )
+
+        dumpers = self._get_dumpers(fields_dict)
+
+        def dump(item):
+            items = []
+
+            for key, dump_field in dumpers:
+                value = dump_field(item)
+
+                if value is not missing:
+                    items.append((key, value))
+
+            return dict_class(items)
+
+        if many and obj is not None:
+            # The objects may only be iterable once
+            obj = list(obj)
+
+        try:
+            self.reset_errors()
+
+            if many and obj is not None:
+                return [dump(item) for item in obj]
+
+            return dump(obj)
+        except _CONVERSION_ERRORS:
+            return super(CompiledMarshaller, self).serialize(
+                obj, fields_dict, many=many, accessor=accessor,
+                dict_class=dict_class, index_errors=index_errors, index=index
+            )
+
+    # Make an instance callable
+    __call__ = serialize
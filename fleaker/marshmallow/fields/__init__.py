@@ -3,4 +3,4 @@
 from .arrow import ArrowField
 from .foreign_key import ForeignKeyField
 from .pendulum import PendulumField
-from .phone_number import PhoneNumberField
+from .phone_number import PhoneNumberField, normalize_phone_numbers
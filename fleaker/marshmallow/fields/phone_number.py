@@ -1,14 +1,188 @@
 # ~*~ coding: utf-8 ~*~
 """Module that defines a Marshmallow field for working with phone numbers."""
 
+import multiprocessing
 import re
 
 import phonenumbers
 
 from marshmallow import ValidationError, fields
 
+from fleaker._compat import text_type
+from fleaker.constants import MISSING
+from fleaker.utils import LRUCache
+
 from .mixin import FleakerFieldMixin
 
+# Excess special chars, except for the plus sign
+_SPECIAL_CHARS = re.compile(r'[^\w+]')
+
+# The error for numbers that were parsed but aren't valid
+INVALID_NUMBER = 'invalid'
+
+
+def strip_phone_number(value):
+    """Remove the excess special chars of a phone number, except for the plus
+    sign.
+    """
+    return _SPECIAL_CHARS.sub('', value)
+
+
+def format_phone_number(stripped_value, strict_validation=False,
+                        strict_region=False, region='US',
+                        phone_number_format=None):
+    """Parse, validate and format a stripped phone number.
+
+    Args:
+        stripped_value (str): The phone number, stripped by
+            :func:`strip_phone_number`.
+
+    Keyword Args:
+        These are the options described by :class:`PhoneNumberField`.
+
+    Returns:
+        tuple(str, object): The formatted number, or ``None``, and the error,
+            which is ``None``, :data:`INVALID_NUMBER` if the number isn't
+            possible or strictly valid, or the
+            :class:`phonenumbers.NumberParseException` if it couldn't be
+            parsed.
+    """
+    if phone_number_format is None:
+        phone_number_format = phonenumbers.PhoneNumberFormat.INTERNATIONAL
+
+    try:
+        if not stripped_value.startswith('+') and not strict_region:
+            phone = phonenumbers.parse(stripped_value, region)
+        else:
+            phone = phonenumbers.parse(stripped_value)
+    except phonenumbers.phonenumberutil.NumberParseException as exc:
+        return None, exc
+
+    if (not phonenumbers.is_possible_number(phone) or
+            not phonenumbers.is_valid_number(phone) and strict_validation):
+        return None, INVALID_NUMBER
+
+    return phonenumbers.format_number(phone, phone_number_format), None
+
+
+def _format_phone_numbers(args):
+    """Format a chunk of stripped phone numbers in a worker process.
+
+    The errors are returned as text, as libphonenumber's exceptions can't be
+    pickled.
+    """
+    stripped_values, options = args
+    results = []
+
+    for stripped_value in stripped_values:
+        formatted, error = format_phone_number(stripped_value, *options)
+
+        if error is not None and error != INVALID_NUMBER:
+            error = text_type(error)
+
+        results.append((formatted, error))
+
+    return results
+
+
+def normalize_phone_numbers(values, region='US', strict=False,
+                            phone_number_format=None, processes=None,
+                            chunk_size=5000):
+    """Format and validate many phone numbers at once, like
+    :class:`PhoneNumberField` does for each one.
+
+    Every distinct phone number is only parsed once. When there are more
+    distinct numbers than fit in one chunk, the chunks are parsed by a pool of
+    processes.
+
+    Example:
+        .. code-block:: python
+
+            formatted, errors = normalize_phone_numbers(
+                row['phone'] for row in csv.DictReader(contacts)
+            )
+
+    Args:
+        values (iterable[str]): The phone numbers. Empty values are returned
+            as they are.
+
+    Keyword Args:
+        region (str, optional): The region of the numbers without a leading
+            country code. This defaults to ``US``.
+        strict (bool, optional): Should the numbers and their regions be
+            strictly validated? See ``strict_validation`` and
+            ``strict_region`` in :class:`PhoneNumberField`.
+        phone_number_format (phonenumbers.PhoneNumberFormat, optional): The
+            format of the numbers. This defaults to
+            ``phonenumbers.PhoneNumberFormat.INTERNATIONAL``.
+        processes (int, optional): The number of processes that parse the
+            numbers. This defaults to the number of CPUs. The numbers are
+            parsed in this process if this is ``1``.
+        chunk_size (int, optional): The number of distinct numbers each
+            process parses at a time.
+
+    Returns:
+        tuple(list[str], list[str]): The formatted numbers and the error of
+            each number, in the order of the values. The formatted number of
+            an invalid number is ``None``, and the error of a valid one is
+            ``None``.
+    """
+    if phone_number_format is None:
+        phone_number_format = phonenumbers.PhoneNumberFormat.INTERNATIONAL
+
+    values = list(values)
+    options = (strict, strict, region, phone_number_format)
+    stripped = [strip_phone_number(value) if value else None
+                for value in values]
+    distinct = list(set(stripped) - set([None]))
+    chunks = [distinct[idx:idx + chunk_size]
+              for idx in range(0, len(distinct), chunk_size)]
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    processes = min(processes, len(chunks))
+
+    if processes > 1:
+        pool = multiprocessing.Pool(processes)
+
+        try:
+            chunk_results = pool.map(
+                _format_phone_numbers,
+                [(chunk, options) for chunk in chunks]
+            )
+        finally:
+            pool.terminate()
+            pool.join()
+    else:
+        chunk_results = [_format_phone_numbers((chunk, options))
+                         for chunk in chunks]
+
+    results = {}
+
+    for chunk, chunk_result in zip(chunks, chunk_results):
+        results.update(zip(chunk, chunk_result))
+
+    formatted_values = []
+    errors = []
+
+    for value, stripped_value in zip(values, stripped):
+        if stripped_value is None:
+            formatted, error = value, None
+        else:
+            formatted, error = results[stripped_value]
+
+        if error == INVALID_NUMBER:
+            error = "{} is not a valid phone number.".format(value)
+        elif not strict:
+            # Numbers that can't be parsed are only errors when strict
+            error = None
+
+        formatted_values.append(formatted)
+        errors.append(error)
+
+    return formatted_values, errors
+
 
 class PhoneNumberField(fields.String, FleakerFieldMixin):
     """Marshmallow field that can format and validate phone numbers.
@@ -38,53 +212,90 @@ class PhoneNumberField(fields.String, FleakerFieldMixin):
             format in which to format the phone number. It defaults to
             ``phonenumbers.PhoneNumberFormat.INTERNATIONAL``.
 
+    The options are resolved once when the field is bound to a schema, and
+    again only if the schema's ``context`` is replaced. Formatted numbers are
+    cached by :attr:`cache` for every stripped value and set of options, as
+    libphonenumber's parsing is expensive.
+
+    Attributes:
+        cache (fleaker.utils.LRUCache): The results of formatting the phone
+            numbers, shared by every field.
+
     .. _libphonenumber: https://github.com/daviddrysdale/python-phonenumbers
     """
 
+    cache = LRUCache(max_size=10000)
+
+    # The context the options were resolved for, and the options
+    _phone_options = None
+
     def _jsonschema_type_mapping(self):
         """Define the JSON Schema type for this field."""
         return {
             'type': 'string',
         }
 
-    def _format_phone_number(self, value, attr):
+    def _add_to_schema(self, field_name, schema):
+        """Resolve the options again when the field is bound to a schema."""
+        super(PhoneNumberField, self)._add_to_schema(field_name, schema)
+
+        self._phone_options = None
+
+    def get_phone_options(self):
+        """Return the options the phone numbers are formatted with.
+
+        Returns:
+            tuple(bool, bool, str, int): Whether the number and its region are
+                strictly validated, the default region and the format.
+        """
+        context = self.context
+        resolved = self._phone_options
+
+        if resolved is None or resolved[0] is not context:
+            strict_validation = self.get_field_value(
+                'strict_phone_validation',
+                default=False
+            )
+            strict_region = self.get_field_value(
+                'strict_phone_region',
+                default=strict_validation
+            )
+            region = self.get_field_value('region', 'US')
+            phone_number_format = self.get_field_value(
+                'phone_number_format',
+                default=phonenumbers.PhoneNumberFormat.INTERNATIONAL
+            )
+
+            self._phone_options = (context, (
+                strict_validation, strict_region, region, phone_number_format
+            ))
+
+        return self._phone_options[1]
+
+    def _format_phone_number(self, value, attr, options=None):
         """Format and validate a phone number."""
-        strict_validation = self.get_field_value(
-            'strict_phone_validation',
-            default=False
-        )
-        strict_region = self.get_field_value(
-            'strict_phone_region',
-            default=strict_validation
-        )
-        region = self.get_field_value('region', 'US')
-        phone_number_format = self.get_field_value(
-            'phone_number_format',
-            default=phonenumbers.PhoneNumberFormat.INTERNATIONAL
-        )
-
-        # Remove excess special chars, except for the plus sign
-        stripped_value = re.sub(r'[^\w+]', '', value)
+        if options is None:
+            options = self.get_phone_options()
 
-        try:
-            if not stripped_value.startswith('+') and not strict_region:
-                phone = phonenumbers.parse(stripped_value, region)
-            else:
-                phone = phonenumbers.parse(stripped_value)
-
-            if (not phonenumbers.is_possible_number(phone) or
-                    not phonenumbers.is_valid_number(phone) and
-                    strict_validation):
-                raise ValidationError(
-                    "The value for {} ({}) is not a valid phone "
-                    "number.".format(attr, value)
-                )
-
-            return phonenumbers.format_number(phone, phone_number_format)
-
-        except phonenumbers.phonenumberutil.NumberParseException as exc:
-            if strict_validation or strict_region:
-                raise ValidationError(exc)
+        strict_validation, strict_region = options[:2]
+        key = (strip_phone_number(value),) + options
+        result = self.cache.get(key, MISSING)
+
+        if result is MISSING:
+            result = format_phone_number(*key)
+            self.cache.set(key, result)
+
+        formatted, error = result
+
+        if error == INVALID_NUMBER:
+            raise ValidationError(
+                "The value for {} ({}) is not a valid phone "
+                "number.".format(attr, value)
+            )
+        elif error is not None and (strict_validation or strict_region):
+            raise ValidationError(error)
+
+        return formatted
 
     def _deserialize(self, value, attr, data):
         """Format and validate the phone number using libphonenumber."""
@@ -1,10 +1,39 @@
 # ~*~ coding: utf-8 ~*~
 """Module that defines a strict but fair base Marshmallow schema."""
 
-from marshmallow import ValidationError, validates_schema
+import threading
 
+from contextlib import contextmanager
+
+import marshmallow
+
+from marshmallow import ValidationError, pre_load, validates_schema
+from marshmallow.utils import is_collection
+
+from fleaker._compat import Mapping
+
+from .compiled import CompiledMarshaller
 from .extension import marsh
 
+INVALID_FIELD = "Invalid field"
+
+# The idle schema instances of each schema class, context and strictness
+_schema_pools = {}
+_schema_pools_lock = threading.Lock()
+
+
+def _get_pool_key(schema_class, context, strict):
+    """Return the key of the pool of schemas built with these arguments, or
+    ``None`` if the context can't be a key.
+    """
+    try:
+        key = (schema_class, frozenset((context or {}).items()), strict)
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
 
 class Schema(marsh.Schema):
     """Base schema that defines sensible default rules for Marshmallow.
@@ -26,6 +55,10 @@ class Schema(marsh.Schema):
         Meta.model (peewee.Model|sqlalchemy.Model): The model that this
             schema's ``make_instance`` method should use when serializing the
             data into a model instance.
+        Meta.compiled (bool): Should the schema dump objects with compiled
+            fields, which is much faster for long lists of objects? See
+            :mod:`fleaker.marshmallow.compiled`. Schemas that override
+            ``get_attribute`` are never compiled.
     """
 
     def __init__(self, **kwargs):
@@ -37,14 +70,98 @@ class Schema(marsh.Schema):
         if self.context.get('strict') is not None:
             self.strict = self.context.get('strict')
 
+        if (getattr(self.Meta, 'compiled', False) and
+                type(self).get_attribute == marshmallow.Schema.get_attribute):
+            self._marshal = CompiledMarshaller(self, prefix=self.prefix)
+
+        self._accepted_keys = (None, frozenset())
+
+    #: The most idle instances of each schema class, context and strictness
+    #: that are kept by :meth:`borrow`.
+    pool_size = 8
+
     @classmethod
-    def make_instance(cls, data):
+    @contextmanager
+    def borrow(cls, context=None, strict=None):
+        """Borrow a ready schema instance from the class's pool.
+
+        Building a schema copies and binds all of its fields, so the schemas
+        used to load data are pooled for each class, context and strictness.
+        The instance is only used by one caller at a time, which makes this
+        safe to use from threads and greenlets. Schemas whose context can't be
+        hashed aren't pooled.
+
+        Example:
+            .. code-block:: python
+
+                with UserSchema.borrow() as schema:
+                    data = schema.load(payload).data
+
+        Keyword Args:
+            context (dict, optional): The context of the schema. A fresh copy
+                of it is restored when the schema goes back to the pool.
+            strict (bool, optional): The strictness of the schema.
+
+        Yields:
+            Schema: The schema instance, which goes back to the pool once the
+                ``with`` block ends.
+        """
+        key = _get_pool_key(cls, context, strict)
+        schema = None
+
+        if key is not None:
+            with _schema_pools_lock:
+                pool = _schema_pools.get(key)
+
+                if pool:
+                    schema = pool.pop()
+
+        if schema is None:
+            schema = cls(context=dict(context or {}), strict=strict)
+
+        try:
+            yield schema
+        finally:
+            if key is not None:
+                # Anything written to the context while the schema was
+                # borrowed mustn't reach the next borrower
+                schema.context = dict(context or {})
+
+                with _schema_pools_lock:
+                    pool = _schema_pools.setdefault(key, [])
+
+                    if len(pool) < cls.pool_size:
+                        pool.append(schema)
+
+    @classmethod
+    def _get_model(cls):
+        """Return the model the schema makes instances of.
+
+        Raises:
+            AttributeError: This is raised if ``Meta.model`` isn't set on the
+                schema's definition.
+        """
+        if not hasattr(cls.Meta, 'model'):
+            raise AttributeError("In order to make an instance, a model for "
+                                 "the schema must be defined in the Meta "
+                                 "class.")
+
+        return cls.Meta.model
+
+    @classmethod
+    def make_instance(cls, data, context=None, strict=None):
         """Validate the data and create a model instance from the data.
 
         Args:
             data (dict): The unserialized data to insert into the new model
                 instance through it's constructor.
 
+        Keyword Args:
+            context (dict, optional): The context of the schema that loads
+                the data.
+            strict (bool, optional): The strictness of the schema that loads
+                the data.
+
         Returns:
             peewee.Model|sqlalchemy.Model: The model instance with it's data
                 inserted into it.
@@ -53,19 +170,77 @@ class Schema(marsh.Schema):
             AttributeError: This is raised if ``Meta.model`` isn't set on the
                 schema's definition.
         """
-        schema = cls()
+        model = cls._get_model()
 
-        if not hasattr(schema.Meta, 'model'):
-            raise AttributeError("In order to make an instance, a model for "
-                                 "the schema must be defined in the Meta "
-                                 "class.")
+        with cls.borrow(context=context, strict=strict) as schema:
+            serialized_data = schema.load(data).data
+
+        return model(**serialized_data)
+
+    @classmethod
+    def make_instances(cls, data, context=None, strict=None):
+        """Validate a list of data and create a model instance from each item,
+        loading all of them with one schema.
+
+        Args:
+            data (list[dict]): The unserialized data of each model instance.
+
+        Keyword Args:
+            context (dict, optional): The context of the schema that loads
+                the data.
+            strict (bool, optional): The strictness of the schema that loads
+                the data.
+
+        Returns:
+            list[peewee.Model|sqlalchemy.Model]: The model instances, in the
+                order of the data.
+
+        Raises:
+            AttributeError: This is raised if ``Meta.model`` isn't set on the
+                schema's definition.
+            marshmallow.ValidationError: Raised if any of the objects have
+                keys that aren't in the schema, even if the schema isn't
+                strict, as none of the objects are loaded then.
+        """
+        model = cls._get_model()
+
+        with cls.borrow(context=context, strict=strict) as schema:
+            result = schema.load(data, many=True)
+
+        if result.data is None:
+            raise ValidationError(result.errors)
+
+        return [model(**item) for item in result.data]
 
-        serialized_data = schema.load(data).data
+    def get_accepted_keys(self):
+        """Return the keys that the schema can load.
 
-        return cls.Meta.model(**serialized_data)
+        These are the names of the schema's fields and their ``load_from``
+        names. They're computed once for the schema's fields.
 
-    @validates_schema(pass_original=True)
-    def invalid_fields(self, data, original_data):
+        Returns:
+            frozenset: The accepted keys.
+        """
+        if self._accepted_keys[0] is not self.fields:
+            keys = set(self.fields)
+            keys.update(field.load_from for field in self.fields.values()
+                        if getattr(field, 'load_from', None))
+            self._accepted_keys = (self.fields, frozenset(keys))
+
+        return self._accepted_keys[1]
+
+    @staticmethod
+    def _get_invalid_keys(data, accepted_keys):
+        """Return the keys of the data that aren't accepted, which are only
+        gathered when there are any.
+        """
+        if not isinstance(data, Mapping) or accepted_keys.issuperset(data):
+            return None
+
+        return [key for key in data if key not in accepted_keys]
+
+    @validates_schema(pass_many=True, pass_original=True)
+    def invalid_fields(self, data, original_data, many=False):
         """Validator that checks if any keys provided aren't in the schema.
 
         Say your schema has support for keys ``a`` and ``b`` and the data
@@ -73,19 +248,58 @@ class Schema(marsh.Schema):
         the schema, a :class:`marshmallow.ValidationError` will be raised
         informing the developer that excess keys have been provided.
 
+        When many objects are loaded, they are checked by
+        :meth:`invalid_fields_many` instead.
+
         Raises:
             marshmallow.ValidationError: Raised if extra keys exist in the
                 passed in data.
         """
-        errors = []
+        if many:
+            return
+
+        invalid_keys = self._get_invalid_keys(
+            original_data, self.get_accepted_keys()
+        )
+
+        if invalid_keys:
+            raise ValidationError(INVALID_FIELD, field_names=invalid_keys)
 
-        for field in original_data:
-            # Skip nested fields because they will loop infinitely
-            if isinstance(field, (set, list, tuple, dict)):
+    @pre_load(pass_many=True)
+    def invalid_fields_many(self, data, many=False):
+        """Check that none of the objects loaded at once have keys that
+        aren't in the schema.
+
+        The errors are reported under the index of each invalid object, and
+        the objects are only loaded when none of them have invalid keys. When
+        the schema isn't strict, the data of the result is then ``None``.
+
+        Raises:
+            marshmallow.ValidationError: Raised if extra keys exist in any of
+                the passed in objects.
+        """
+        if not many or not is_collection(data):
+            return data
+
+        accepted_keys = self.get_accepted_keys()
+        index_errors = self.opts.index_errors
+        errors = {}
+
+        for index, item in enumerate(data):
+            invalid_keys = self._get_invalid_keys(item, accepted_keys)
+
+            if not invalid_keys:
                 continue
 
-            if field not in self.fields.keys():
-                errors.append(field)
+            if index_errors:
+                item_errors = errors.setdefault(index, {})
+            else:
+                item_errors = errors
+
+            for key in invalid_keys:
+                item_errors.setdefault(key, []).append(INVALID_FIELD)
 
         if errors:
-            raise ValidationError("Invalid field", field_names=errors)
+            raise ValidationError(errors)
+
+        return data
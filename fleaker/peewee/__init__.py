@@ -23,9 +23,12 @@ easy to use as well!
 
 from .fields import ArrowDateTimeField, JSONField, PendulumDateTimeField
 from .model import Model
+from .query import Record, RecordQuery
 from .mixins import (
     FieldSignatureMixin, ArchivedMixin, CreatedMixin, CreatedModifiedMixin,
-    SearchMixin, EventMixin, EventStorageMixin,  ArrowArchivedMixin,
+    SearchMixin, EventMixin, EventSink, EventStorageMixin, ArrowArchivedMixin,
     ArrowCreatedMixin, ArrowCreatedModifiedMixin, PendulumArchivedMixin,
-    PendulumCreatedMixin, PendulumCreatedModifiedMixin
+    PendulumCreatedMixin, PendulumCreatedModifiedMixin, AsyncEventWriter,
+    FullTextSearchBackend, LikeSearchBackend, PostgresFTSSearchBackend,
+    SearchBackend, SearchCache, SqliteFTSSearchBackend, TrigramSearchBackend
 )
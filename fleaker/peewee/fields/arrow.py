@@ -41,6 +41,10 @@ Example:
         assert isinstance(event.occured, arrow.Arrow)
         assert isinstance(event.created, arrow.Arrow)
 
+    Naive and UTC datetimes, and ISO 8601 strings, from the database are
+    converted directly instead of by :func:`arrow.get`. With ``lazy=True``,
+    they are only converted when the field is accessed on a model
+    instance.
 
 .. _Arrow: http://crsmithdev.com/arrow/
 """
@@ -51,12 +55,16 @@ import datetime
 
 import arrow
 
-from peewee import DateTimeField
+from dateutil import tz
 
 from fleaker._compat import string_types
 
+from .dates import BaseDateTimeField
 
-class ArrowDateTimeField(DateTimeField):
+_UTC = tz.tzutc()
+
+
+class ArrowDateTimeField(BaseDateTimeField):
     """Peewee field that produces Arrow_ instances from Peewee fields.
 
     The big advantages to this are automatic timezone setting and that
@@ -65,14 +73,29 @@ class ArrowDateTimeField(DateTimeField):
     .. _Arrow: http://crsmithdev.com/arrow/
     """
 
-    def python_value(self, value):
+    value_type = arrow.Arrow
+
+    # The timezone of each UTC offset that has been loaded
+    _offsets = {0: _UTC}
+
+    def from_datetime(self, value, offset):
+        """Build the Arrow object of a naive datetime and its UTC offset."""
+        tzinfo = self._offsets.get(offset)
+
+        if tzinfo is None:
+            tzinfo = self._offsets.setdefault(offset,
+                                              tz.tzoffset(None, offset))
+
+        return arrow.Arrow(value.year, value.month, value.day, value.hour,
+                           value.minute, value.second, value.microsecond,
+                           tzinfo)
+
+    def convert_value(self, value):
         """Return the value in the data base as an arrow object.
 
         Returns:
             arrow.Arrow: An instance of arrow with the field filled in.
         """
-        value = super(ArrowDateTimeField, self).python_value(value)
-
         if (isinstance(value, (datetime.datetime, datetime.date,
                                string_types))):
             return arrow.get(value)
@@ -0,0 +1,186 @@
+# ~*~ coding: utf-8 ~*~
+"""
+fleaker.peewee.fields.dates
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Module that provides the base class of the datetime fields that return
+objects from a datetime library, like Arrow or Pendulum, instead of
+a :class:`datetime.datetime`.
+
+The datetimes that databases usually return are converted directly, without
+going through the library's generic parsing. These are naive and UTC
+datetimes, and ISO 8601 strings, which is how SQLite stores datetimes.
+Everything else is converted by the field's ``convert_value`` method.
+"""
+
+from __future__ import absolute_import
+
+import datetime
+import re
+
+from peewee import DateTimeField, FieldDescriptor
+
+from fleaker._compat import string_types
+
+_ISO_DATETIME = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?'
+    r'(?:(Z)|([+-])(\d{2}):?(\d{2}))?$'
+)
+
+
+def parse_iso_datetime(value):
+    """Parse the common forms of ISO 8601 datetime strings.
+
+    Args:
+        value (str): The string to parse, like
+            ``'2016-12-13 02:09:48.075736+00:00'``.
+
+    Returns:
+        tuple(datetime.datetime, int|None)|None: The naive datetime and the
+            UTC offset in seconds, which is ``None`` if the string has no
+            offset. ``None`` is returned if the string isn't in a common
+            form.
+    """
+    match = _ISO_DATETIME.match(value)
+
+    if match is None:
+        return None
+
+    (year, month, day, hour, minute, second, fraction, zulu, sign,
+     offset_hours, offset_minutes) = match.groups()
+
+    naive = datetime.datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second),
+        int(fraction.ljust(6, '0')) if fraction else 0
+    )
+
+    if zulu:
+        offset = 0
+    elif sign:
+        offset = int(offset_hours) * 3600 + int(offset_minutes) * 60
+
+        if sign == '-':
+            offset = -offset
+    else:
+        offset = None
+
+    return naive, offset
+
+
+class LazyDateTimeDescriptor(FieldDescriptor):
+    """Descriptor that converts the value of a lazy datetime field the first
+    time it's accessed on an instance.
+    """
+
+    def __get__(self, instance, instance_type=None):
+        if instance is None:
+            return self.field
+
+        value = instance._data.get(self.att_name)
+
+        if value is not None and not isinstance(value,
+                                                self.field.value_type):
+            value = self.field.to_python(value)
+            instance._data[self.att_name] = value
+
+        return value
+
+
+class BaseDateTimeField(DateTimeField):
+    """Base class of the datetime fields that return another type than
+    :class:`datetime.datetime`.
+
+    Subclasses set :attr:`value_type` and implement :meth:`from_datetime`
+    and :meth:`convert_value`.
+
+    Keyword Args:
+        This field takes all the same arguments as
+        :class:`peewee.DateTimeField`, as well as:
+
+        lazy (bool, optional):
+            Will keep the value from the database until the field is accessed
+            on an instance, instead of converting it as every row is loaded.
+            This applies to the model instances returned by the queries of
+            a :class:`fleaker.peewee.Model`. Every other row, like those of
+            ``.dicts()`` queries, holds the converted value.
+
+    Attributes:
+        value_type (type): The type of the field's values.
+    """
+
+    value_type = None
+
+    def __init__(self, *args, **kwargs):
+        self.lazy = kwargs.pop('lazy', False)
+
+        super(BaseDateTimeField, self).__init__(*args, **kwargs)
+
+    def add_to_class(self, model_class, name):
+        """Add the field to the model, converting it on access if it's lazy.
+        """
+        super(BaseDateTimeField, self).add_to_class(model_class, name)
+
+        if self.lazy:
+            setattr(model_class, name, LazyDateTimeDescriptor(self))
+
+    def from_datetime(self, value, offset):
+        """Build the field's value from a naive datetime.
+
+        Args:
+            value (datetime.datetime): The naive datetime.
+            offset (int): The UTC offset of the datetime in seconds.
+
+        Returns:
+            object: The field's value.
+        """
+        raise NotImplementedError()
+
+    def convert_value(self, value):
+        """Convert any other value from the database, like a date or
+        a datetime in a timezone, into the field's value.
+        """
+        raise NotImplementedError()
+
+    def to_python(self, value):
+        """Convert a value from the database into the field's value.
+
+        Returns:
+            object: The field's value.
+        """
+        if type(value) is datetime.datetime:
+            tzinfo = value.tzinfo
+
+            if tzinfo is None:
+                return self.from_datetime(value, 0)
+
+            offset = tzinfo.utcoffset(value)
+
+            # Only UTC datetimes are converted directly, as the timezones
+            # of the others may have to be kept
+            if not offset:
+                return self.from_datetime(value.replace(tzinfo=None), 0)
+        elif isinstance(value, string_types):
+            parsed = parse_iso_datetime(value)
+
+            if parsed is not None:
+                value, offset = parsed
+                return self.from_datetime(
+                    value, 0 if offset is None else offset
+                )
+
+            value = super(BaseDateTimeField, self).python_value(value)
+
+        return self.convert_value(value)
+
+    def python_value(self, value):
+        """Return the value in the database as the field's value."""
+        if value is None or isinstance(value, self.value_type):
+            return value
+
+        return self.to_python(value)
+
+    def lazy_value(self, value):
+        """Return the value in the database as it is, for model instances to
+        convert when the field is accessed.
+        """
+        return value
@@ -37,21 +37,261 @@ Example:
             explict_immutable_json_field = JSONField(
                 object_pairs_hook=ImmutableDict
             )
+            # The JSON field can be decoded only when it's accessed.
+            lazy_json_field = JSONField(lazy=True)
 
+    On the instances of a :class:`fleaker.peewee.Model`, a lazy field holds
+    the JSON text from the database until the field is accessed, and the
+    decoded value is then kept on that instance. Rows from ``.dicts()`` and
+    ``.tuples()`` queries hold the decoded value.
+    :meth:`JSONField.get_raw_json` gives the text as
+    a :class:`simplejson.RawJSON`, which the Fleaker JSON encoder writes out
+    as is, so the JSON never has to be decoded and encoded again.
+
+    .. code-block:: python
+
+        @app.route('/models/<int:model_id>/data')
+        def get_model_data(model_id):
+            instance = MyModel.get(MyModel.id == model_id)
+            return flask.jsonify(
+                data=MyModel.lazy_json_field.get_raw_json(instance)
+            )
+
+    Values that were loaded and can't have changed since are saved with the
+    text they were loaded from instead of being encoded again. These are
+    undecoded lazy values and immutable values, such as the
+    :class:`~werkzeug.datastructures.ImmutableDict` of an immutable field
+    that has no lists in it. Mutable values may have been changed in place,
+    so they are always encoded.
+
+    Values inside the JSON can be queried by indexing the field with their
+    path, which is compiled to ``json_extract`` on SQLite and ``->>`` on
+    Postgres, and paths that are queried often can be indexed.
+
+    .. code-block:: python
+
+        Model.select().where(Model.reg_json_field['user']['id'] == 5)
+
+        Model.reg_json_field['user']['id'].create_index()
 """
 
+import re
+import weakref
+
 from collections import OrderedDict
 
 import flask.json
 
-from peewee import TextField
-from werkzeug.datastructures import ImmutableDict
+from peewee import (
+    Clause, FieldDescriptor, PostgresqlDatabase, SQL, TextField, fn
+)
+from simplejson import RawJSON
+from werkzeug.datastructures import ImmutableDict, ImmutableDictMixin
+
+from fleaker._compat import string_types
+
+_SCALAR_TYPES = string_types + (bool, int, float, type(None))
+
+# Keys are written into the SQL, so they can't have quotes or placeholders
+_INVALID_KEY_CHARS = re.compile(r'[\'"%\\]')
+
+
+def is_frozen(value):
+    """Can't the decoded JSON value be changed in place?
+
+    Args:
+        value (object): The decoded JSON value.
+
+    Returns:
+        bool: ``True`` if the value and everything in it is immutable.
+    """
+    if isinstance(value, ImmutableDictMixin):
+        return all(is_frozen(item) for item in value.values())
+    elif isinstance(value, tuple):
+        return all(is_frozen(item) for item in value)
+
+    return isinstance(value, _SCALAR_TYPES)
+
+
+def _get_database(model):
+    """Return the database of the model, looking through a Peewee proxy."""
+    database = model._meta.database
+
+    return getattr(database, 'obj', None) or database
+
+
+class JSONPath(Clause):
+    """Expression for the value at a path inside a :class:`JSONField`.
+
+    These are made by indexing the field, or another path, with the key of
+    an object or the index of an array. On Postgres the value is extracted
+    as text with ``->>``, so it should be cast to compare it to a number. On
+    every other database it is extracted with ``json_extract``, like SQLite
+    and MySQL do.
+
+    Example:
+        .. code-block:: python
+
+            user_id = Model.meta['user']['id']
+
+            Model.select().where(user_id.cast('integer') == 5)
+            Model.select().where(Model.meta['tags'][0] == 'new')
+
+    Args:
+        field (JSONField): The field the JSON is stored in.
+        path (tuple[str|int]): The keys and indexes of the value.
+
+    Keyword Args:
+        cast (str, optional): The SQL type the value is cast to.
+
+    Raises:
+        ValueError: Raised if a key contains a quote, a backslash or a
+            ``%``, or isn't a string or an integer.
+    """
+
+    def __init__(self, field, path, cast=None):
+        for key in path:
+            if isinstance(key, bool) or not isinstance(
+                    key, string_types + (int,)):
+                raise ValueError("The JSON path key {!r} is not a string or "
+                                 "an integer.".format(key))
+
+            if (isinstance(key, string_types) and
+                    _INVALID_KEY_CHARS.search(key)):
+                raise ValueError("The JSON path key {!r} can't contain "
+                                 "quotes, backslashes or '%'.".format(key))
+
+        self.field = field
+        self.path = tuple(path)
+        self.cast_type = cast
+
+        super(JSONPath, self).__init__(self._build(field))
+
+    def __getitem__(self, key):
+        return JSONPath(self.field, self.path + (key,), cast=self.cast_type)
+
+    def clone_base(self):
+        return JSONPath(self.field, self.path, cast=self.cast_type)
+
+    def cast(self, type_):
+        """Return this path with its value cast to a SQL type.
+
+        Args:
+            type_ (str): The SQL type, like ``'integer'``.
+
+        Returns:
+            JSONPath: The cast path.
+
+        Raises:
+            ValueError: Raised if the type isn't a valid name.
+        """
+        if not re.match(r'^\w+$', type_):
+            raise ValueError("The type '{}' is not a valid SQL "
+                             "type.".format(type_))
+
+        return JSONPath(self.field, self.path, cast=type_)
+
+    def _is_postgres(self):
+        return isinstance(_get_database(self.field.model_class),
+                          PostgresqlDatabase)
+
+    def _build(self, column):
+        """Build the expression that extracts the value from the column."""
+        if self._is_postgres():
+            keys = ["'{}'".format(key) if isinstance(key, string_types)
+                    else str(key)
+                    for key in self.path]
+            operators = ['->'] * (len(keys) - 1) + ['->>']
+            expression = Clause(
+                fn.CAST(Clause(column, SQL('AS jsonb'))).coerce(False),
+                SQL(''.join(op + key for op, key in zip(operators, keys))),
+                glue='', parens=True
+            )
+        else:
+            path = ''.join('."{}"'.format(key)
+                           if isinstance(key, string_types)
+                           else '[{}]'.format(key)
+                           for key in self.path)
+            expression = fn.json_extract(column, SQL("'${}'".format(path)))
+            # The extracted values aren't JSON documents, so they mustn't be
+            # decoded by the field
+            expression = expression.coerce(False)
+
+        if self.cast_type:
+            expression = fn.CAST(
+                Clause(expression, SQL('AS ' + self.cast_type))
+            ).coerce(False)
+
+        return expression
+
+    def get_index_name(self):
+        """Return the name of the index on this path."""
+        parts = [self.field.model_class._meta.db_table, self.field.db_column]
+        parts.extend(str(key) for key in self.path)
+
+        if self.cast_type:
+            parts.append(self.cast_type)
+
+        return re.sub(r'\W', '_', '_'.join(parts))
+
+    def create_index(self, name=None, unique=False):
+        """Create an index on the expression of this path, so queries on it
+        don't have to scan the table. Queries only use the index if they
+        use the same cast as it.
+
+        Keyword Args:
+            name (str, optional): The name of the index. This defaults to the
+                table, column, keys and cast joined by underscores.
+            unique (bool, optional): Should the index be unique?
+        """
+        database = _get_database(self.field.model_class)
+        column = SQL('"{}"'.format(self.field.db_column))
+        expression, _ = database.compiler().parse_node(self._build(column))
+
+        database.execute_sql(
+            'CREATE {unique}INDEX IF NOT EXISTS "{name}" ON "{table}" '
+            '({expression})'.format(
+                unique='UNIQUE ' if unique else '',
+                name=name or self.get_index_name(),
+                table=self.field.model_class._meta.db_table,
+                expression=expression,
+            )
+        )
+
+    def drop_index(self, name=None):
+        """Drop the index on the expression of this path.
+
+        Keyword Args:
+            name (str, optional): The name the index was created with.
+        """
+        _get_database(self.field.model_class).execute_sql(
+            'DROP INDEX IF EXISTS "{}"'.format(name or self.get_index_name())
+        )
+
+
+class LazyJSONDescriptor(FieldDescriptor):
+    """Descriptor that decodes the JSON text of a lazy :class:`JSONField`
+    the first time it's accessed on an instance.
+    """
+
+    def __get__(self, instance, instance_type=None):
+        if instance is None:
+            return self.field
+
+        value = instance._data.get(self.att_name)
+
+        if isinstance(value, RawJSON):
+            value = self.field.decode(value.encoded_json)
+            instance._data[self.att_name] = value
+
+        return value
 
 
 class JSONField(TextField):
     """Peewee field that will load and dump JSON to and from the database.
 
-    @TODO Get this working for searching using JSON searching.
+    Indexing the field with a key returns a :class:`JSONPath` that can be
+    used to query the values inside the JSON.
 
     Keyword Args:
         This field takes all the same arguments as :class:`peewee.TextField`,
@@ -74,11 +314,17 @@ class JSONField(TextField):
             a :class:`werkzeug.datastructures.ImmutableDict` when the value is
             loaded from the database. This arg will override the
             ``object_pairs_hook`` when set to ``True``.
-        immutable (bool, optional):
-            Will return the dict as
-            a :class:`werkzeug.datastructures.ImmutableDict` when the value is
-            loaded from the database. This arg will override the
-            ``object_pairs_hook`` when set to ``True``.
+        lazy (bool, optional):
+            Will keep the JSON text from the database until the field is
+            accessed, instead of decoding it as every row is loaded. This
+            applies to the model instances returned by the queries of
+            a :class:`fleaker.peewee.Model`. Every other row, like those of
+            ``.dicts()`` queries, holds the decoded value.
+        compact (bool, optional):
+            Will store the JSON without any whitespace.
+        sort_keys (bool, optional):
+            Should the keys of objects be sorted when the value is stored?
+            This defaults to the app's ``JSON_SORT_KEYS`` setting.
     """
 
     _load_kwarg_keys = ('object_hook', 'object_pairs_hook')
@@ -96,26 +342,130 @@ class JSONField(TextField):
         if kwargs.pop('ordered', False):
             self._load_kwargs['object_pairs_hook'] = OrderedDict
 
+        self._dump_kwargs = {}
+
+        if kwargs.pop('compact', False):
+            self._dump_kwargs['separators'] = (',', ':')
+
+        sort_keys = kwargs.pop('sort_keys', None)
+
+        if sort_keys is not None:
+            self._dump_kwargs['sort_keys'] = sort_keys
+
+        self.lazy = kwargs.pop('lazy', False)
+
+        # The text each loaded immutable value was decoded from, keyed by the
+        # value's id and removed when the value is garbage collected
+        self._loaded_text = {}
+
         super(JSONField, self).__init__(**kwargs)
 
+    def __getitem__(self, key):
+        return JSONPath(self, (key,))
+
+    def add_to_class(self, model_class, name):
+        """Add the field to the model, decoding it on access if it's lazy."""
+        super(JSONField, self).add_to_class(model_class, name)
+
+        if self.lazy:
+            setattr(model_class, name, LazyJSONDescriptor(self))
+
+    def decode(self, value):
+        """Decode the JSON text from the database.
+
+        Args:
+            value (str): The JSON text.
+
+        Returns:
+            object: The decoded value.
+        """
+        decoded = flask.json.loads(value, **self._load_kwargs)
+
+        if isinstance(decoded, ImmutableDictMixin) and is_frozen(decoded):
+            self._remember_text(decoded, value)
+
+        return decoded
+
+    def encode(self, value):
+        """Encode a value as JSON text for the database.
+
+        Args:
+            value (object): The value to encode.
+
+        Returns:
+            str: The JSON text, which is the text the value was loaded from
+                if it can't have changed since.
+        """
+        if isinstance(value, RawJSON):
+            return value.encoded_json
+
+        key = id(value)
+
+        if key in self._loaded_text:
+            ref, text = self._loaded_text[key]
+
+            if ref() is value:
+                return text
+
+        # Everything is encoded being before being surfaced
+        return flask.json.dumps(value, **self._dump_kwargs)
+
+    def _remember_text(self, value, text):
+        """Remember the text an immutable value was decoded from."""
+        key = id(value)
+        loaded_text = self._loaded_text
+
+        def forget(ref):
+            if loaded_text.get(key, (None,))[0] is ref:
+                del loaded_text[key]
+
+        loaded_text[key] = (weakref.ref(value, forget), text)
+
+    def get_raw_json(self, instance):
+        """Return the field's value on an instance as JSON text, without
+        decoding it if it hasn't been accessed yet.
+
+        Args:
+            instance (peewee.Model): The instance to get the value from.
+
+        Returns:
+            simplejson.RawJSON: The value as JSON text.
+        """
+        value = instance._data.get(self.name)
+
+        if not isinstance(value, RawJSON):
+            value = RawJSON(self.encode(value))
+
+        return value
+
     def python_value(self, value):
         """Return the JSON in the database as a ``dict``.
 
         Returns:
-            dict: The field run through json.loads
+            dict: The field run through json.loads.
         """
         value = super(JSONField, self).python_value(value)
 
         if value is not None:
-            return flask.json.loads(value, **self._load_kwargs)
+            return self.decode(value)
+
+    def lazy_value(self, value):
+        """Return the JSON in the database as it is, for model instances to
+        decode when the field is accessed.
+
+        Returns:
+            simplejson.RawJSON: The JSON text.
+        """
+        value = super(JSONField, self).python_value(value)
+
+        if value is not None:
+            return RawJSON(value)
 
     def db_value(self, value):
         """Store the value in the database.
 
         If the value is a dict like object, it is converted to a string before
-        storing.
+        storing. JSON text that was never decoded, and immutable values that
+        were loaded, are stored as they were loaded.
         """
-        # Everything is encoded being before being surfaced
-        value = flask.json.dumps(value)
-
-        return super(JSONField, self).db_value(value)
+        return super(JSONField, self).db_value(self.encode(value))
@@ -41,6 +41,10 @@ Example:
         assert isinstance(event.occured, pendulum.Pendulum)
         assert isinstance(event.created, pendulum.Pendulum)
 
+    Naive and UTC datetimes, and ISO 8601 strings, from the database are
+    converted directly instead of by :func:`pendulum.instance` and
+    :func:`pendulum.parse`. With ``lazy=True``, they are only converted when
+    the field is accessed on a model instance.
 
 .. _Pendulum: https://pendulum.eustace.io/
 """
@@ -51,12 +55,17 @@ import datetime
 
 import pendulum
 
-from peewee import DateTimeField
-
 from fleaker._compat import string_types
 
+from .dates import BaseDateTimeField
+
+
+def _get_tzinfo(offset):
+    """Return the Pendulum tzinfo of a UTC offset in seconds."""
+    return pendulum.Pendulum(2000, 1, 1, tzinfo=offset / 3600.0).tzinfo
 
-class PendulumDateTimeField(DateTimeField):
+
+class PendulumDateTimeField(BaseDateTimeField):
     """Peewee field that produces Pendulum_ instances from Peewee fields.
 
     The big advantages to this are automatic timezone setting and that
@@ -65,15 +74,31 @@ class PendulumDateTimeField(DateTimeField):
     .. _Pendulum: https://pendulum.eustace.io/
     """
 
-    def python_value(self, value):
+    value_type = pendulum.Pendulum
+
+    # The tzinfo of each UTC offset that has been loaded. Passing these,
+    # instead of a timezone, skips Pendulum's timezone conversion.
+    _offsets = {0: pendulum.Pendulum(2000, 1, 1, tzinfo=pendulum.UTC).tzinfo}
+
+    def from_datetime(self, value, offset):
+        """Build the Pendulum object of a naive datetime and its UTC offset.
+        """
+        tzinfo = self._offsets.get(offset)
+
+        if tzinfo is None:
+            tzinfo = self._offsets.setdefault(offset, _get_tzinfo(offset))
+
+        return pendulum.Pendulum(value.year, value.month, value.day,
+                                 value.hour, value.minute, value.second,
+                                 value.microsecond, tzinfo=tzinfo)
+
+    def convert_value(self, value):
         """Return the value in the database as an Pendulum object.
 
         Returns:
             pendulum.Pendulum:
                 An instance of Pendulum with the field filled in.
         """
-        value = super(PendulumDateTimeField, self).python_value(value)
-
         if isinstance(value, datetime.datetime):
             value = pendulum.instance(value)
         elif isinstance(value, datetime.date):
@@ -1,4 +1,5 @@
-from .event import EventMixin, EventStorageMixin
+from .event import EventMixin, EventSink, EventStorageMixin
+from .event_writer import AsyncEventWriter
 from .field_signature import FieldSignatureMixin
 from .time import (
     ArchivedMixin, CreatedMixin, CreatedModifiedMixin, ArrowArchivedMixin,
@@ -6,3 +7,8 @@ from .time import (
     PendulumCreatedMixin, PendulumCreatedModifiedMixin
 )
 from .search import SearchMixin
+from .search_backends import (
+    FullTextSearchBackend, LikeSearchBackend, PostgresFTSSearchBackend,
+    SearchBackend, SqliteFTSSearchBackend, TrigramSearchBackend
+)
+from .search_cache import SearchCache
@@ -20,6 +20,14 @@ Because of how Peewee's event system works, event tracking only works when an
 instance is created/updated using :func:`peewee.Model.save` or deleted using
 :func:`peewee.Model.delete_instance`.
 
+By default, every Event is saved on its own. If many Events are created in
+a short period of time, they can be collected in an :class:`EventSink` and
+written with a single ``INSERT`` statement instead. A sink can cover a single
+save (``Meta.batch_events``), a block of code (using the sink as a context
+manager), or a whole request (:meth:`EventSink.init_app`). Events written
+through a sink are not sent through Peewee's signals, but their codes are
+still validated.
+
 Since Fleaker does not provide migrations of any sort, you must create the
 Event storage table yourself. Here is some SQL to create the bare essentials
 for Event storage. Be sure to add foreign keys to the tables you'd like to
@@ -326,18 +334,26 @@ Example:
 
 """
 
+import copy
+
+from collections import OrderedDict
+
 import peewee
 
-from flask import render_template_string
+from flask import current_app
 from flask_login import current_user
 from playhouse.signals import (
-    Model as SignalModel, post_save, pre_delete, pre_save
+    Model as SignalModel, post_init, post_save, pre_delete, pre_save
 )
+from simplejson import RawJSON
+from werkzeug.local import LocalStack
 from werkzeug.utils import cached_property
 
 from fleaker import DEFAULT_DICT, MISSING, db
 from fleaker._compat import iteritems
 from fleaker.peewee import JSONField
+from fleaker.peewee.fields.json import is_frozen
+from fleaker.utils import LRUCache
 
 from .time import CreatedModifiedMixin
 
@@ -355,11 +371,29 @@ class EventMixin(SignalModel):
         Meta.create_message (dict):
             This is an Event "mapping" that will be used to grab attributes
             from the  new model to save it in place.
+        Meta.batch_events (bool):
+            Should all the Events created by a single save be written with
+            one ``INSERT`` through an :class:`EventSink`? This defaults to
+            ``False``. If an :class:`EventSink` is already active, it will be
+            used regardless of this setting.
+        Meta.event_writer (fleaker.peewee.AsyncEventWriter):
+            An optional writer that will write the Events in a background
+            thread, instead of in the request. An active :class:`EventSink`
+            still takes precedence over the writer.
+        Meta.snapshot_original (bool):
+            Should the instance remember its data when it is loaded from the
+            database and after every save? If so, :meth:`get_original` is
+            built from that snapshot instead of querying the database again
+            before each save. This defaults to ``False``.
     """
     _original = MISSING
+    _snapshot = None
 
     class Meta(object):
         event_ready = True
+        batch_events = False
+        event_writer = None
+        snapshot_original = False
         create_message = DEFAULT_DICT
         delete_message = DEFAULT_DICT
         update_messages = DEFAULT_DICT
@@ -398,6 +432,9 @@ class EventMixin(SignalModel):
     def get_original(self):
         """Get the original instance of this instance before it's updated.
 
+        If a snapshot of the instance has been taken, the original is built
+        from it. Otherwise, the original is queried from the database.
+
         Returns:
             fleaker.peewee.EventMixin:
                 The original instance of the model.
@@ -405,12 +442,35 @@ class EventMixin(SignalModel):
         pk_value = self._get_pk_value()
 
         if isinstance(pk_value, int) and not self._original:
-            self._original = (
-                self.select().where(self.__class__.id == pk_value).get()
-            )
+            if self._snapshot is not None:
+                data, obj_cache = self._snapshot
+                self._original = self.__class__(**data)
+                self._original._obj_cache.update(obj_cache)
+            else:
+                self._original = (
+                    self.select().where(self.__class__.id == pk_value).get()
+                )
 
         return self._original
 
+    def take_snapshot(self):
+        """Remember the current data of the instance, so it can be used as the
+        original for the next save.
+
+        Related instances that have already been loaded are remembered as well,
+        so paths through them in the original don't need to be queried again.
+        Values that can be changed in place, like the ``dict`` of
+        a :class:`fleaker.peewee.JSONField`, are copied, so changing them
+        still creates the update Events.
+        """
+        data = {
+            name: (copy.deepcopy(value)
+                   if isinstance(value, (dict, list)) and not is_frozen(value)
+                   else value)
+            for name, value in iteritems(self._data)
+        }
+        self._snapshot = (data, dict(self._obj_cache))
+
     def create_creation_event(self):
         """Parse the create message DSL to insert the data into the Event.
 
@@ -426,8 +486,7 @@ class EventMixin(SignalModel):
             event.meta = self.parse_meta(self._meta.create_message['meta'])
 
         self.create_event_callback(event)
-
-        event.save()
+        self.save_events([event])
 
         return event
 
@@ -445,7 +504,8 @@ class EventMixin(SignalModel):
                 fields = (fields,)
 
             changed = any([
-                getattr(self, field) != getattr(self.get_original(), field)
+                self._get_raw_value(field) !=
+                self.get_original()._get_raw_value(field)
                 for field in fields
             ])
 
@@ -456,13 +516,28 @@ class EventMixin(SignalModel):
                 events.append(event)
 
         self.update_event_callback(events)
-
-        with db.database.atomic():
-            for event in events:
-                event.save()
+        self.save_events(events)
 
         return events
 
+    def _get_raw_value(self, name):
+        """Return the value of a field or attribute for comparisons.
+
+        Fields are read straight from the instance's data, so foreign keys are
+        compared by their IDs without loading the related instances. The JSON
+        text of lazy :class:`fleaker.peewee.JSONField` values that haven't
+        been accessed is decoded, as it only compares equal to itself.
+        """
+        if name in self._meta.fields:
+            value = self._data.get(name)
+
+            if isinstance(value, RawJSON):
+                value = self._meta.fields[name].decode(value.encoded_json)
+
+            return value
+
+        return getattr(self, name)
+
     def create_deletion_event(self):
         """Parse the delete message DSL to insert data into the Event.
 
@@ -477,11 +552,42 @@ class EventMixin(SignalModel):
             event.meta = self.parse_meta(self._meta.delete_message['meta'])
 
         self.delete_event_callback(event)
-
-        event.save()
+        self.save_events([event])
 
         return event
 
+    def save_events(self, events):
+        """Persist the Events created by an operation on this instance.
+
+        If an :class:`EventSink` is active, the Events are handed to it and
+        will be written when it is flushed. Otherwise, if
+        ``Meta.event_writer`` is set, the Events are handed to it. Otherwise,
+        if ``Meta.batch_events`` is set, they are written immediately with one
+        ``INSERT``. If none of these are the case, each Event is saved on its
+        own.
+
+        Args:
+            events (list[fleaker.peewee.EventStorageMixin]):
+                The unsaved Events to persist.
+        """
+        if not events:
+            return
+
+        sink = EventSink.get_current()
+
+        if sink is not None:
+            sink.add(*events)
+        elif self._meta.event_writer is not None:
+            self._meta.event_writer.write(events)
+        elif self._meta.batch_events:
+            sink = EventSink()
+            sink.add(*events)
+            sink.flush()
+        else:
+            with db.database.atomic():
+                for event in events:
+                    event.save()
+
     def parse_meta(self, meta):
         """Parses the meta field in the message, copies it's keys into a new
         dict and replaces the values, which should be attribute paths relative
@@ -489,6 +595,9 @@ class EventMixin(SignalModel):
         path. This function will run recursively when it encounters other dicts
         inside the meta dict.
 
+        The meta dicts of the messages defined in ``Meta`` are only parsed
+        into resolvers once per model, see :meth:`get_meta_resolvers`.
+
         Args:
             meta (dict):
                 The dictionary of mappings to pull structure of the meta from.
@@ -498,22 +607,64 @@ class EventMixin(SignalModel):
                 A copy of the keys from the meta dict with the values pulled
                 from the paths.
         """
+        cached = self.get_meta_resolvers().get(id(meta))
+
+        if cached is not None and cached[0] is meta:
+            resolvers = cached[1]
+        else:
+            resolvers = _compile_meta(type(self), meta)
+
+        return self._resolve_meta(resolvers)
+
+    def _resolve_meta(self, resolvers):
+        """Build the meta dict from the resolvers made by
+        :func:`_compile_meta`.
+        """
         res = {}
 
-        for key, val in meta.items():
-            if not val:
+        for key, source, resolver in resolvers:
+            if source is None:
+                res[key] = self._resolve_meta(resolver)
                 continue
-            elif isinstance(val, dict):
-                res[key] = self.parse_meta(val)
-            elif val.startswith('current_user.'):
-                res[key] = self.get_path_attribute(current_user, val)
-            elif val.startswith('original.'):
-                res[key] = self.get_path_attribute(self.get_original(), val)
+
+            if source is _CURRENT_USER:
+                obj = current_user
+            elif source is _ORIGINAL:
+                obj = self.get_original()
             else:
-                res[key] = self.get_path_attribute(self, val)
+                obj = self
+
+            res[key] = _resolve_path(obj, resolver)
 
         return res
 
+    @classmethod
+    def get_meta_resolvers(cls):
+        """Return the resolvers for the meta dicts of the messages defined in
+        ``Meta``, parsing them the first time this is called for the model.
+
+        Returns:
+            dict:
+                A mapping of the ``id`` of each meta dict to a tuple of the
+                meta dict itself and its resolvers.
+        """
+        resolvers = _meta_resolvers.get(cls)
+
+        if resolvers is None:
+            messages = [cls._meta.create_message, cls._meta.delete_message]
+            messages.extend(cls._meta.update_messages.values())
+            resolvers = {}
+
+            for message in messages:
+                meta = message.get('meta') if message else None
+
+                if meta:
+                    resolvers[id(meta)] = (meta, _compile_meta(cls, meta))
+
+            _meta_resolvers[cls] = resolvers
+
+        return resolvers
+
     @staticmethod
     def get_path_attribute(obj, path):
         """Given a path like `related_record.related_record2.id`, this method
@@ -534,20 +685,7 @@ class EventMixin(SignalModel):
         # Strip out ignored keys passed in
         path = path.replace('original.', '').replace('current_user.', '')
 
-        attr_parts = path.split('.')
-        res = obj
-
-        try:
-            for part in attr_parts:
-                try:
-                    res = getattr(res, part)
-                except AttributeError:
-                    res = getattr(res.get(), part)
-
-        except (peewee.DoesNotExist, AttributeError):
-            return None
-
-        return res
+        return _resolve_path(obj, _compile_path(None, path))
 
     def copy_foreign_keys(self, event):
         """Copies possible foreign key values from the object into the Event,
@@ -615,8 +753,143 @@ class EventMixin(SignalModel):
             event (Event): The Event instance to attach the data to
             instance (fleaker.db.Model): The newly created/updated model
         """
-        event.updated = self._data
-        event.original = self.get_original()._data
+        # Copy the data so Events that are written later on by an EventSink
+        # aren't effected by further changes to the instance.
+        event.updated = dict(self._data)
+        event.original = dict(self.get_original()._data)
+
+
+# Sources that the paths in a message's meta can be relative to
+_SELF = 'self'
+_ORIGINAL = 'original'
+_CURRENT_USER = 'current_user'
+
+# Parsed meta dicts of the messages defined in each model's Meta
+_meta_resolvers = {}
+
+
+def _get_attribute(obj, name):
+    """Get an attribute, falling back to the first result of a query."""
+    try:
+        return getattr(obj, name)
+    except AttributeError:
+        return getattr(obj.get(), name)
+
+
+def _attribute_step(name):
+    """Return a step of a path that gets an attribute of its object."""
+    def step(obj):
+        return _get_attribute(obj, name)
+
+    return step
+
+
+def _foreign_key_id_step(name, to_field):
+    """Return a step of a path that gets the ID of a foreign key.
+
+    If the object is a model instance, the ID is read from its data so the
+    related instance is never queried for.
+    """
+    def step(obj):
+        data = getattr(obj, '_data', None)
+
+        if data is not None and name in data:
+            return data[name]
+
+        return _get_attribute(_get_attribute(obj, name), to_field)
+
+    return step
+
+
+def _compile_path(model, path):
+    """Parse an attribute path into a list of steps.
+
+    Args:
+        model (type|None): The model the path starts from, if it is known.
+            This allows foreign key IDs at the end of the path to be read
+            without querying for the related instance.
+        path (str): The dotted path to parse, without its source.
+
+    Returns:
+        list[callable]: The steps to apply, in order, to get the value.
+    """
+    parts = path.split('.')
+    steps = []
+    index = 0
+
+    while index < len(parts):
+        name = parts[index]
+        field = model._meta.fields.get(name) if model is not None else None
+        index += 1
+
+        if isinstance(field, peewee.ForeignKeyField):
+            if (index < len(parts) and
+                    parts[index] == field.to_field.name):
+                steps.append(_foreign_key_id_step(name, parts[index]))
+                model = None
+                index += 1
+                continue
+
+            model = field.rel_model
+        else:
+            model = None
+
+        steps.append(_attribute_step(name))
+
+    return steps
+
+
+def _resolve_path(obj, steps):
+    """Apply the steps of a path to an object.
+
+    Returns:
+        object: The value at the end of the path. ``None`` if it doesn't exist
+            at any point in the path.
+    """
+    try:
+        for step in steps:
+            obj = step(obj)
+    except (peewee.DoesNotExist, AttributeError):
+        return None
+
+    return obj
+
+
+def _compile_meta(model, meta):
+    """Parse the meta dict of a message into resolvers.
+
+    Args:
+        model (type): The model the message belongs to.
+        meta (dict): The mapping of keys to attribute paths to parse.
+
+    Returns:
+        list[tuple]: A ``(key, source, steps)`` tuple for every path in the
+            meta dict. Nested dicts have a source of ``None`` and their parsed
+            resolvers instead of steps.
+    """
+    resolvers = []
+
+    for key, val in meta.items():
+        if not val:
+            continue
+        elif isinstance(val, dict):
+            resolvers.append((key, None, _compile_meta(model, val)))
+            continue
+
+        if val.startswith('current_user.'):
+            source = _CURRENT_USER
+            path_model = None
+        elif val.startswith('original.'):
+            source = _ORIGINAL
+            path_model = model
+        else:
+            source = _SELF
+            path_model = model
+
+        path = val.replace('original.', '').replace('current_user.', '')
+        resolvers.append((key, source, _compile_path(path_model, path)))
+
+    return resolvers
 
 
 @pre_save(sender=EventMixin)
@@ -634,7 +907,13 @@ def post_save_event_listener(sender, instance, created):
     if not instance._meta.event_ready:
         return
 
+    snapshot = instance._meta.snapshot_original
+
     if created:
+        # The newly inserted record is its own original
+        if snapshot:
+            instance.take_snapshot()
+
         instance.create_creation_event()
     else:
         instance.create_update_event()
@@ -642,6 +921,16 @@ def post_save_event_listener(sender, instance, created):
     # Reset the original key
     instance._original = None
 
+    if snapshot:
+        instance.take_snapshot()
+
+
+@post_init(sender=EventMixin)
+def snapshot_after_load(sender, instance):
+    """Event listener to snapshot instances loaded from the database."""
+    if instance._meta.event_ready and instance._meta.snapshot_original:
+        instance.take_snapshot()
+
 
 @pre_delete(sender=EventMixin)
 def pre_delete_event_listener(sender, instance):
@@ -652,6 +941,189 @@ def pre_delete_event_listener(sender, instance):
     instance.create_deletion_event()
 
 
+_event_sinks = LocalStack()
+
+
+def _serialize_event(event):
+    """Validate an unsaved Event and convert it into a row for a bulk insert.
+
+    The values are converted to their database representation right away, so
+    the row can be written later on, even outside of the app context.
+
+    Returns:
+        tuple(type, dict): The Event's model and the row to insert.
+
+    Raises:
+        ValueError: Raised if the Event's code is not a valid one.
+    """
+    validate_event_type(type(event), event, created=True)
+
+    fields = event._meta.fields
+    pk_name = event._meta.primary_key.name
+    row = {}
+
+    for name, value in iteritems(event._data):
+        if name == pk_name and value is None:
+            continue
+
+        row[name] = peewee.Param(fields[name].db_value(value))
+
+    return type(event), row
+
+
+def _insert_event_rows(rows):
+    """Write serialized Events with one ``INSERT`` per model.
+
+    Rows are grouped by their model and the fields that have been set on
+    them, so columns with database defaults are left to the database just
+    like :func:`peewee.Model.save` would. All the groups are written inside
+    a single transaction.
+
+    Args:
+        rows (list[tuple(type, dict)]): Rows from :func:`_serialize_event`.
+    """
+    groups = OrderedDict()
+
+    for model, row in rows:
+        groups.setdefault((model, tuple(sorted(row))), []).append(row)
+
+    if not groups:
+        return
+
+    with db.database.atomic():
+        for (model, _), model_rows in iteritems(groups):
+            model.insert_many(model_rows).execute()
+
+
+class EventSink(object):
+    """Collects unsaved Events so they can be written with a single
+    ``INSERT`` statement per Event model.
+
+    While a sink is active, every Event created by an
+    :class:`EventMixin` instance is added to it instead of being saved. The
+    sink can be used as a context manager, in which case the Events are
+    written when the block exits cleanly and discarded if an exception is
+    raised. This pairs nicely with a transaction:
+
+    .. code-block:: python
+
+        with db.database.atomic(), EventSink():
+            folder.name = 'etc'
+            folder.parent_folder = root_folder
+            folder.save()
+
+            passwd_file.folder = folder
+            passwd_file.save()
+
+    Because the Events are inserted in bulk, Peewee's signals aren't sent for
+    them and they will not have their primary keys set after being written.
+    The Event codes are still validated before anything is written.
+
+    Attributes:
+        events (list[fleaker.peewee.EventStorageMixin]):
+            The Events that are waiting to be written.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def __len__(self):
+        return len(self.events)
+
+    def __enter__(self):
+        self.push()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.pop()
+
+        if exc_type is None:
+            self.flush()
+        else:
+            self.clear()
+
+    @staticmethod
+    def get_current():
+        """Return the active sink for this context, if there is one.
+
+        Returns:
+            EventSink|None: The most recently pushed sink.
+        """
+        return _event_sinks.top
+
+    def push(self):
+        """Make this sink the active one for this context."""
+        _event_sinks.push(self)
+
+    def pop(self):
+        """Deactivate this sink without writing its Events.
+
+        Raises:
+            RuntimeError: Raised if this sink isn't the active one.
+        """
+        if _event_sinks.top is not self:
+            raise RuntimeError("Popped the wrong EventSink.")
+
+        _event_sinks.pop()
+
+    def add(self, *events):
+        """Add unsaved Events to the sink."""
+        self.events.extend(events)
+
+    def clear(self):
+        """Discard all the Events in the sink without writing them."""
+        self.events = []
+
+    def flush(self):
+        """Write all the Events in the sink to the database.
+
+        One ``INSERT`` is issued per Event model, inside a single transaction.
+
+        Returns:
+            list[fleaker.peewee.EventStorageMixin]: The Events written.
+
+        Raises:
+            ValueError: Raised if any Event's code is not a valid one. No
+                Events will be written if this is raised.
+        """
+        events, self.events = self.events, []
+        _insert_event_rows([_serialize_event(event) for event in events])
+
+        return events
+
+    @classmethod
+    def init_app(cls, app):
+        """Collect all the Events created during a request in one sink.
+
+        The sink is flushed after the view returns successfully. If the
+        request fails with an exception, the Events are discarded.
+
+        Args:
+            app (flask.Flask): The app to register the request hooks on.
+        """
+        @app.before_request
+        def push_event_sink():
+            cls().push()
+
+        @app.after_request
+        def flush_event_sink(response):
+            sink = cls.get_current()
+
+            if sink is not None:
+                sink.flush()
+
+            return response
+
+        @app.teardown_request
+        def pop_event_sink(exc=None):
+            sink = cls.get_current()
+
+            if sink is not None:
+                sink.clear()
+                sink.pop()
+
+
 class EventStorageMixin(CreatedModifiedMixin):
     """Model that is used to store Events in the database.
 
@@ -677,6 +1149,9 @@ class EventStorageMixin(CreatedModifiedMixin):
             A copy of the newly saved data.
         model (str):
             The name of the model that the instance is.
+        template_cache (fleaker.utils.LRUCache):
+            The cache of compiled message templates, shared by all Event
+            models. Replace it to change how many templates are kept.
     """
     body = peewee.TextField(null=True)
     code = peewee.CharField(max_length=255, null=False, default='AUDIT')
@@ -688,6 +1163,8 @@ class EventStorageMixin(CreatedModifiedMixin):
 
     _default_event_codes = ['AUDIT_CREATE', 'AUDIT_DELETE', 'AUDIT_UPDATE']
 
+    template_cache = LRUCache(max_size=256)
+
     class Meta:
         event_codes = []
 
@@ -708,16 +1185,73 @@ class EventStorageMixin(CreatedModifiedMixin):
         - ``version``: This is the version of the event DSL.
 
         This property is cached because Jinja rendering is slower than raw
-        Python string formatting.
+        Python string formatting. The compiled template is cached as well, so
+        it is only parsed once per ``body``. When formatting many Events at
+        once, use :meth:`render_messages` instead.
         """
-        return render_template_string(
-            self.body,
-            event=self,
-            meta=self.meta,
-            original=self.original,
-            updated=self.updated,
-            version=self.version,
-        )
+        return self.render_messages([self])[0]
+
+    @classmethod
+    def get_template(cls, body):
+        """Return the compiled Jinja template for a message body.
+
+        Templates are compiled with the current app's Jinja environment and
+        kept in ``template_cache``.
+
+        Args:
+            body (str): The template text of the message.
+
+        Returns:
+            jinja2.Template: The compiled template.
+        """
+        jinja_env = current_app.jinja_env
+        key = (jinja_env, body)
+        template = cls.template_cache.get(key)
+
+        if template is None:
+            template = jinja_env.from_string(body)
+            cls.template_cache.set(key, template)
+
+        return template
+
+    @classmethod
+    def render_messages(cls, events):
+        """Format the messages of many Events at once.
+
+        The Flask template context is only built once for all the Events and
+        each distinct ``body`` is only compiled once. The rendered message is
+        stored as the ``formatted_message`` of each Event as well.
+
+        Args:
+            events (list[fleaker.peewee.EventStorageMixin]):
+                The Events to format the messages of.
+
+        Returns:
+            list[str]: The formatted messages, in the same order as the
+                Events.
+        """
+        base_context = {}
+        current_app.update_template_context(base_context)
+        messages = []
+
+        for event in events:
+            message = event.__dict__.get('formatted_message')
+
+            if message is None:
+                context = dict(base_context)
+                context.update(
+                    event=event,
+                    meta=event.meta,
+                    original=event.original,
+                    updated=event.updated,
+                    version=event.version,
+                )
+                message = cls.get_template(event.body).render(context)
+                event.__dict__['formatted_message'] = message
+
+            messages.append(message)
+
+        return messages
 
     @classmethod
     def event_codes(cls):
@@ -0,0 +1,336 @@
+# ~*~ coding: utf-8 ~*~
+"""
+fleaker.peewee.mixins.event_writer
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Module that provides a writer that takes the Events created by
+:class:`fleaker.peewee.EventMixin` out of the request path. Events are
+validated and serialized when they are created, put into a bounded queue,
+and then written in batches by a background thread.
+
+This is useful when the table storing the Events is slow to write to, as
+audited requests will no longer wait on it. The trade off is that Events are
+written shortly after the change they describe, instead of alongside it, and
+that Events still waiting in the queue are lost if the process is killed.
+
+Only Events of changes that have been committed are queued. Events created
+while the calling thread has a transaction open are written in that
+transaction instead, so they are committed or rolled back with the change
+they describe and can reference the rows it made.
+
+In order to make maximum use of this module, there are some application
+configuration variables that you should be aware of. They are read by
+:meth:`AsyncEventWriter.init_app` and override the values given to the
+writer's constructor:
+
+* ``EVENT_WRITER_MAX_SIZE``: The maximum number of Events that can wait in the
+  queue.
+* ``EVENT_WRITER_BATCH_SIZE``: The maximum number of Events written in one
+  ``INSERT``.
+* ``EVENT_WRITER_FLUSH_INTERVAL``: The maximum number of seconds an Event waits
+  in the queue before it is written.
+* ``EVENT_WRITER_OVERFLOW``: What to do when the queue is full. See
+  :class:`AsyncEventWriter` for the possible values.
+* ``EVENT_WRITER_SYNCHRONOUS``: Should the Events be written immediately in
+  the calling thread? This defaults to ``True`` when the app is testing, so
+  tests can assert on the Events right away.
+
+Example:
+    To use the writer, create one and set it as the ``Meta.event_writer`` of
+    the models whose Events it should write.
+
+    .. code-block:: python
+
+        import peewee
+
+        from fleaker import db
+        from fleaker.peewee import AsyncEventWriter, EventMixin
+
+        event_writer = AsyncEventWriter(batch_size=500, flush_interval=0.5)
+
+        class Folder(EventMixin, db.Model):
+            name = peewee.CharField(max_length=255)
+
+            class Meta:
+                event_writer = event_writer
+
+        def create_app():
+            app = App.create_app(__name__)
+            event_writer.init_app(app)
+
+            return app
+
+"""
+
+import atexit
+import logging
+import threading
+import time
+import weakref
+
+from fleaker import db
+from fleaker._compat import queue
+
+from .event import _insert_event_rows, _serialize_event
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Put into the queue to make the background thread exit
+_STOP = object()
+
+# Every writer, so their queued Events are written when the process exits
+_writers = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_writers():
+    """Write the queued Events of every writer and stop their threads."""
+    for writer in list(_writers):
+        writer.stop()
+
+
+class AsyncEventWriter(object):
+    """Writes Events in batches from a bounded queue in a background thread.
+
+    The background thread is started the first time an Event is written and
+    it groups the queued Events into batches of at most ``batch_size`` Events,
+    waiting at most ``flush_interval`` seconds for a batch to fill up. Each
+    batch is written with one ``INSERT`` per Event model, just like
+    :class:`fleaker.peewee.EventSink` does. If a batch fails to be written,
+    the error is logged and the batch is dropped.
+
+    Events created while a transaction is open in the calling thread are
+    written right away, in that transaction, instead of being queued.
+
+    Keyword Args:
+        max_size (int): The maximum number of Events that can wait in the
+            queue. This defaults to 10000.
+        batch_size (int): The maximum number of Events written in one batch.
+            This defaults to 500.
+        flush_interval (float): The maximum number of seconds to wait for
+            a batch to fill up. This defaults to 1 second.
+        overflow (str): What to do with an Event when the queue is full. This
+            can be ``'block'`` to wait for room in the queue, ``'drop'`` to
+            discard the Event, or ``'sync'`` to write the Event in the calling
+            thread. This defaults to ``'block'``.
+        synchronous (bool): Should Events be written immediately in the
+            calling thread instead? This is useful for tests. This defaults to
+            ``False``.
+
+    Attributes:
+        written (int): The number of Events that have been written.
+        dropped (int): The number of Events discarded because the queue was
+            full.
+        failed (int): The number of Events that could not be written.
+
+    Raises:
+        ValueError: Raised if ``overflow`` is not a valid policy.
+    """
+
+    OVERFLOW_POLICIES = ('block', 'drop', 'sync')
+
+    def __init__(self, max_size=10000, batch_size=500, flush_interval=1.0,
+                 overflow='block', synchronous=False):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.synchronous = synchronous
+
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._queue = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+
+        self._validate_overflow()
+
+        _writers.add(self)
+
+    def _validate_overflow(self):
+        if self.overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(
+                "The overflow policy '{}' is not valid. Please use one of: "
+                "{}.".format(self.overflow, ', '.join(self.OVERFLOW_POLICIES))
+            )
+
+    def init_app(self, app):
+        """Configure the writer from the app's config.
+
+        Args:
+            app (flask.Flask): The app to read the configuration from.
+        """
+        config = app.config
+        self.max_size = config.get('EVENT_WRITER_MAX_SIZE', self.max_size)
+        self.batch_size = config.get('EVENT_WRITER_BATCH_SIZE',
+                                     self.batch_size)
+        self.flush_interval = config.get('EVENT_WRITER_FLUSH_INTERVAL',
+                                         self.flush_interval)
+        self.overflow = config.get('EVENT_WRITER_OVERFLOW', self.overflow)
+        self.synchronous = config.get('EVENT_WRITER_SYNCHRONOUS',
+                                      self.synchronous or app.testing)
+
+        self._validate_overflow()
+
+    @property
+    def running(self):
+        """bool: Is the background thread running?"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background thread, if it isn't running already."""
+        with self._lock:
+            if self.running:
+                return
+
+            self._queue = queue.Queue(maxsize=self.max_size)
+            self._thread = threading.Thread(
+                target=self._run,
+                name='fleaker-event-writer',
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Write all the queued Events and stop the background thread.
+
+        Keyword Args:
+            timeout (float, optional): The maximum number of seconds to wait
+                for the thread to finish.
+        """
+        with self._lock:
+            if not self.running:
+                return
+
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def flush(self):
+        """Block until every Event queued so far has been written."""
+        if self.running:
+            self._queue.join()
+
+    def write(self, events):
+        """Queue Events to be written by the background thread.
+
+        The Events are validated and serialized right away, so invalid Events
+        are reported to the caller and later changes to them are ignored. If
+        a transaction is open in the calling thread, the Events are written
+        in it instead, as the change they describe hasn't been committed yet.
+
+        Args:
+            events (list[fleaker.peewee.EventStorageMixin]): The unsaved
+                Events to write.
+
+        Raises:
+            ValueError: Raised if any Event's code is not a valid one. None of
+                the Events will be queued if this is raised.
+        """
+        rows = [_serialize_event(event) for event in events]
+
+        if not rows:
+            return
+
+        if self.synchronous or self._in_transaction():
+            self._write_rows(rows)
+            return
+
+        if not self.running:
+            self.start()
+
+        overflowed = []
+
+        for row in rows:
+            if self.overflow == 'block':
+                self._queue.put(row)
+                continue
+
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                overflowed.append(row)
+
+        if not overflowed:
+            return
+
+        if self.overflow == 'sync':
+            self._write_rows(overflowed)
+        else:
+            self._count('dropped', len(overflowed))
+            LOGGER.warning("The Event queue is full, dropped %d Events.",
+                           len(overflowed))
+
+    @staticmethod
+    def _in_transaction():
+        """Does the calling thread have changes that aren't committed yet?"""
+        return (db.database.transaction_depth() > 0 or
+                not db.database.get_autocommit())
+
+    def _count(self, name, amount):
+        """Add to one of the writer's counters, which are shared by every
+        thread writing Events.
+        """
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def _write_rows(self, rows):
+        _insert_event_rows(rows)
+        self._count('written', len(rows))
+
+    def _write_batch(self, batch):
+        try:
+            self._write_rows(batch)
+        except Exception:  # pylint: disable=broad-except
+            self._count('failed', len(batch))
+            LOGGER.exception("Failed to write a batch of %d Events.",
+                             len(batch))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self):
+        """Main loop of the background thread."""
+        stopping = False
+
+        while not stopping:
+            item = self._queue.get()
+
+            if item is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            deadline = time.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+
+                batch.append(item)
+
+            self._write_batch(batch)
+
+        self._close_connection()
+
+    @staticmethod
+    def _close_connection():
+        """Close the background thread's database connection."""
+        if not db.database.is_closed():
+            db.database.close()
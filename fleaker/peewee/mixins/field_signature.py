@@ -61,11 +61,24 @@ Example:
         etc_folder.archive_instance()
         assert folder.signature is None
 
+    Imports can find the rows that already exist with one query, instead of
+    looking them up one at a time.
+
+    .. code-block:: python
+
+        rows = [{'name': 'etc', 'parent_folder': None},
+                {'name': 'apt', 'parent_folder': etc_folder.id}]
+        existing = Folder.find_existing(rows)
+
+        new_folders = [Folder(**row)
+                       for row, folder in zip(rows, existing)
+                       if folder is None]
+
 """
 
 from hashlib import sha1
 
-from peewee import FixedCharField
+from peewee import FixedCharField, ForeignKeyField, Model
 from playhouse.signals import Model as SignalModel, pre_save
 
 from fleaker._compat import text_type
@@ -99,40 +112,145 @@ class FieldSignatureMixin(SignalModel):
     class Meta:
         signature_fields = ()
 
-    def update_signature(self):
-        """Update the signature field by hashing the ``signature_fields``.
+    @classmethod
+    def compute_signature(cls, values):
+        """Compute the signature of a record's values.
+
+        Args:
+            values (dict): The values of the record, keyed by field name.
+                Related records can be given as instances or primary keys.
+
+        Returns:
+            str|None: The ``sha1`` hash of the values, or ``None`` if the
+                record is archived.
 
         Raises:
             AttributeError: This is raised if ``Meta.signature_fields`` has no
-                values in it or if a field in there is not a field on the
-                model.
+                values in it.
         """
-        if not self._meta.signature_fields:
+        if not cls._meta.signature_fields:
             raise AttributeError(
                 "No fields defined in {}.Meta.signature_fields. Please define "
-                "at least one.".format(type(self).__name__)
+                "at least one.".format(cls.__name__)
             )
 
         # If the field is archived, unset the signature so records in the
         # future can have this value.
-        if getattr(self, 'archived', False):
-            self.signature = None
-            return
+        if values.get('archived'):
+            return None
+
+        computed = []
+
+        for name in cls._meta.signature_fields:
+            value = values.get(name)
+
+            # Related records are hashed by their primary key
+            if isinstance(value, Model):
+                value = value._get_pk_value()
+
+            computed.append(text_type(value or ' '))
 
         # Otherwise, combine the values of the fields together and SHA1 them
-        computed = [getattr(self, value) or ' '
-                    for value in self._meta.signature_fields]
-        computed = ''.join([text_type(value) for value in computed])
+        return sha1(''.join(computed).encode('utf-8')).hexdigest()
+
+    @classmethod
+    def compute_signatures(cls, rows):
+        """Compute the signatures of many records.
+
+        Args:
+            rows (iterable[dict|FieldSignatureMixin]): The values of the
+                records, keyed by field name, or the instances themselves.
+
+        Returns:
+            list[str|None]: The signature of each row, in order.
+        """
+        return [cls.compute_signature(row._get_signature_values()
+                                      if isinstance(row, cls) else row)
+                for row in rows]
+
+    @classmethod
+    def find_existing(cls, rows, chunk_size=500):
+        """Find the records that already exist with the signatures of the
+        rows.
+
+        The signatures are looked up with one ``IN`` query for every
+        ``chunk_size`` rows.
+
+        Args:
+            rows (iterable[dict|FieldSignatureMixin]): The values of the
+                records, keyed by field name, or the instances themselves.
+
+        Keyword Args:
+            chunk_size (int): The maximum number of signatures in one query.
+                This defaults to 500.
+
+        Returns:
+            list[FieldSignatureMixin|None]: The existing record for each row,
+                in order, or ``None`` if there is none.
+        """
+        signatures = cls.compute_signatures(rows)
+        wanted = sorted(set(signature for signature in signatures
+                            if signature is not None))
+        existing = {}
+
+        for start in range(0, len(wanted), chunk_size):
+            chunk = wanted[start:start + chunk_size]
+
+            for record in cls.select().where(cls.signature << chunk):
+                existing[record.signature] = record
+
+        return [existing.get(signature) for signature in signatures]
+
+    def _get_signature_values(self):
+        """Return the values the signature is computed from."""
+        values = {'archived': getattr(self, 'archived', None)}
+
+        for name in self._meta.signature_fields:
+            field = self._meta.fields.get(name)
+
+            # Don't load related records just for their primary keys
+            if isinstance(field, ForeignKeyField):
+                values[name] = self._data.get(name)
+            else:
+                values[name] = getattr(self, name)
+
+        return values
+
+    def signature_is_stale(self):
+        """Could the signature be out of date with the instance's fields?
+
+        Returns:
+            bool: ``True`` if there is no signature, or if a signature field
+                or ``archived`` has changed since the instance was loaded or
+                saved.
+        """
+        return (self.signature is None or 'archived' in self._dirty or
+                not self._dirty.isdisjoint(self._meta.signature_fields))
+
+    def update_signature(self):
+        """Update the signature field by hashing the ``signature_fields``.
+
+        Raises:
+            AttributeError: This is raised if ``Meta.signature_fields`` has no
+                values in it or if a field in there is not a field on the
+                model.
+        """
+        for name in self._meta.signature_fields:
+            if name not in self._meta.fields:
+                raise AttributeError(
+                    "No field named {} for model {}".format(
+                        name, type(self).__name__
+                    )
+                )
 
-        # If computed is a falsey value, that means all the fields were
-        # None or blank and that will lead to some pain.
-        if computed:
-            self.signature = sha1(computed.encode('utf-8')).hexdigest()
+        self.signature = self.compute_signature(self._get_signature_values())
 
 
 @pre_save(sender=FieldSignatureMixin)
 def update_signature(sender, instance, **kwargs):
     """Peewee event listener that will update the unique hash for the field
-    before saving the record.
+    before saving the record, if any of the fields it's computed from have
+    changed.
     """
-    instance.update_signature()
+    if instance.signature_is_stale():
+        instance.update_signature()
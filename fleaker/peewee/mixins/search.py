@@ -4,9 +4,11 @@ fleaker.peewee.mixins.search
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 Module that provides a mixin that can do generic SQL ``LIKE`` queries. If more
-complex searching is required, it is strongly recommended that the developer
-looks into a searching technology, like ElasticSearch, instead of attempting to
-make this more complex.
+complex searching is required, the database's full text search can be used by
+setting ``Meta.search_backend``, see
+:mod:`fleaker.peewee.mixins.search_backends`. Past that, it is strongly
+recommended that the developer looks into a searching technology, like
+ElasticSearch, instead of attempting to make this more complex.
 
 Example:
     To use this mixin, add it to the classes inheritance chain.
@@ -70,13 +72,13 @@ Example:
 
 """
 
-from functools import reduce
-
-from playhouse.shortcuts import case
-from peewee import operator
+from peewee import Clause, EnclosedClause, SQL
+from playhouse.signals import post_delete, post_save
 
 from fleaker.orm import PeeweeModel
 
+from .search_backends import LikeSearchBackend
+
 
 class SearchMixin(PeeweeModel):
     """Mixin that provides generic SQL ``LIKE`` searching across columns.
@@ -88,19 +90,28 @@ class SearchMixin(PeeweeModel):
             items in this lists order. Which is to say, given a two item list,
             any type of matches for the first item will come before an exact
             match for an item in the second.
+        Meta.search_backend (fleaker.peewee.SearchBackend): The backend that
+            builds the search queries and maintains the index they use. This
+            defaults to a :class:`fleaker.peewee.LikeSearchBackend`.
+        Meta.search_cache (fleaker.peewee.SearchCache): An optional cache for
+            the pages returned by :meth:`search_page`. This defaults to
+            ``None``, which doesn't cache them.
     """
 
     class Meta(object):
         search_fields = ()
+        search_backend = LikeSearchBackend()
+        search_cache = None
 
     @classmethod
     def search(cls, term, fields=()):
-        """Generic SQL search function that uses SQL ``LIKE`` to search the
-        database for matching records. The records are sorted by their
-        relavancey to the search term.
+        """Search the database for matching records using the model's
+        ``Meta.search_backend``. The records are sorted by their relavancey
+        to the search term.
 
-        The query searches and sorts on the folling criteria, in order, where
-        the target string is ``exactly``:
+        With the default backend, the query uses SQL ``LIKE`` and searches and
+        sorts on the folling criteria, in order, where the target string is
+        ``exactly``:
 
         1. Straight equality (``x = 'exactly'``)
         2. Right hand ``LIKE`` (``x LIKE 'exact%'``)
@@ -120,6 +131,86 @@ class SearchMixin(PeeweeModel):
             AttributeError: Raised if `search_fields` isn't defined in the
                 class and `fields` aren't provided for the function.
         """
+        fields = cls._get_search_fields(fields)
+
+        return cls._meta.search_backend.search(cls, term, fields)
+
+    @classmethod
+    def search_page(cls, term, fields=(), after=None, limit=20):
+        """Return one page of the records that :meth:`search` finds, using
+        keyset pagination.
+
+        Instead of skipping the records of the previous pages with
+        ``OFFSET``, which gets slower the further along the pages go, the
+        records are filtered to those ranked after the last record of the
+        previous page. Ties in the ranking are broken by the primary key.
+
+        If the model has a ``Meta.search_cache``, the pages are cached there
+        and the term is normalized by it first.
+
+        Args:
+            term (str): The search term to apply to the query.
+
+        Keyword Args:
+            fields (list|tuple|None): An optional list of fields to apply the
+                search to. If not provided, the class variable
+                ``Meta.search_fields`` will be used by default.
+            after (tuple|None): The cursor returned with the previous page. If
+                not provided, the first page is returned.
+            limit (int): The maximum number of records on the page. This
+                defaults to 20.
+
+        Returns:
+            tuple(list, tuple|None): The records on the page and the cursor
+                for the next page, which is ``None`` on the last page.
+
+        Raises:
+            AttributeError: Raised if `search_fields` isn't defined in the
+                class and `fields` aren't provided for the function.
+        """
+        fields = cls._get_search_fields(fields)
+        cache = cls._meta.search_cache
+
+        if cache is not None:
+            term = cache.normalize(term)
+            generation = cache.get_generation(cls)
+            page = cache.get_page(cls, fields, term, after, limit)
+
+            if page is not None:
+                return page
+
+        query, ranking = cls._meta.search_backend.rank(cls, term, fields)
+        ranking = list(ranking) + [cls._meta.primary_key]
+        rank_names = ['search_rank_{}'.format(index)
+                      for index in range(len(ranking))]
+
+        selection = list(cls._meta.sorted_fields)
+        selection.extend(rank.alias(name)
+                         for rank, name in zip(ranking, rank_names))
+        query = query.select(*selection)
+
+        if after is not None:
+            query = query.where(Clause(EnclosedClause(*ranking), SQL('>'),
+                                       EnclosedClause(*after)))
+
+        query = query.order_by(*[rank.asc() for rank in ranking])
+        records = list(query.limit(limit + 1))
+
+        if len(records) <= limit:
+            cursor = None
+        else:
+            records = records[:limit]
+            cursor = tuple(getattr(records[-1], name) for name in rank_names)
+
+        if cache is not None:
+            cache.set_page(cls, fields, term, after, limit, records, cursor,
+                           generation=generation)
+
+        return records, cursor
+
+    @classmethod
+    def _get_search_fields(cls, fields):
+        """Return the fields to search, defaulting to the class's."""
         if not any((cls._meta.search_fields, fields)):
             raise AttributeError(
                 "A list of searchable fields must be provided in the class's "
@@ -131,50 +222,47 @@ class SearchMixin(PeeweeModel):
         if not fields:
             fields = cls._meta.search_fields
 
-        query = cls.select()
-
-        # Cache the LIKE terms
-        like_term = ''.join((term, '%'))
-        full_like_term = ''.join(('%', term, '%'))
-
-        # Cache the order by terms
-        # @TODO Peewee's order_by supports an `extend` kwarg will will allow
-        # for updating of the order by part of the query, but it's only
-        # supported in Peewee 2.8.5 and newer. Determine if we can support this
-        # before switching.
-        # http://docs.peewee-orm.com/en/stable/peewee/api.html#SelectQuery.order_by
-        order_by = []
-
-        # Store the clauses seperately because it is needed to perform an OR on
-        # them and that's somehow impossible with their query builder in
-        # a loop.
-        clauses = []
-
-        for field_name in fields:
-            # Cache the field, raising an exception if the field doesn't
-            # exist.
-            field = getattr(cls, field_name)
-
-            # Apply the search term case insensitively
-            clauses.append(
-                (field == term) |
-                (field ** like_term) |
-                (field ** full_like_term)
-            )
+        return tuple(fields)
+
+    @classmethod
+    def create_search_index(cls):
+        """Create the search index for this model and fill it with the
+        existing records. Call this after the table has been created.
+        """
+        cls._meta.search_backend.create_index(cls)
+
+    @classmethod
+    def drop_search_index(cls):
+        """Drop the search index for this model."""
+        cls._meta.search_backend.drop_index(cls)
+
+    @classmethod
+    def rebuild_search_index(cls):
+        """Rebuild the search index for this model from all of its records.
+
+        This is needed after records have been changed without sending
+        signals, such as with ``insert_many`` or ``update``. It also drops
+        the cached searches of this model.
+        """
+        cls._meta.search_backend.rebuild_index(cls)
+        cls.invalidate_search_cache()
+
+    @classmethod
+    def invalidate_search_cache(cls):
+        """Drop the cached searches of this model, if it has a cache."""
+        if cls._meta.search_cache is not None:
+            cls._meta.search_cache.invalidate(cls)
 
-            order_by.append(case(None, (
-                # Straight matches should show up first
-                (field == term, 0),
-                # Similar terms should show up second
-                (field ** like_term, 1),
-                # Substring matches should show up third
-                (field ** full_like_term, 2),
-            ), default=3).asc())
 
-        # Apply the clauses to the query
-        query = query.where(reduce(operator.or_, clauses))
+@post_save(sender=SearchMixin)
+def update_search_index(sender, instance, created):
+    """Update the search index of the instance after it is saved."""
+    instance._meta.search_backend.update_instance(instance)
+    instance.invalidate_search_cache()
 
-        # Apply the sort order so it's influenced by the search term relevance.
-        query = query.order_by(*order_by)
 
-        return query
+@post_delete(sender=SearchMixin)
+def remove_from_search_index(sender, instance):
+    """Remove the instance from the search index after it is deleted."""
+    instance._meta.search_backend.delete_instance(instance)
+    instance.invalidate_search_cache()
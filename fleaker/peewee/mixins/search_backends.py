@@ -0,0 +1,758 @@
+# ~*~ coding: utf-8 ~*~
+"""
+fleaker.peewee.mixins.search_backends
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Module that provides the backends that :class:`fleaker.peewee.SearchMixin`
+uses to search. A backend is set per model in ``Meta.search_backend``.
+
+By default, the :class:`LikeSearchBackend` is used, which uses SQL ``LIKE``
+queries and needs no setup at all. The downside is that these queries can't
+use an index, so they will slow down as the table grows.
+
+The :class:`TrigramSearchBackend` returns the same results as ``LIKE``, but
+keeps an index of the n-grams of every searched field in a side table, so only
+the records that can match have to be looked at. This is a good fit for
+substring and prefix searches on short fields, like names and emails.
+
+The :class:`FullTextSearchBackend` uses the full text search of the database
+instead. On SQLite, an FTS5_ table is kept next to the model's table and it is
+updated through Peewee's signals, which means the model must be a signal
+enabled model, such as :class:`fleaker.peewee.Model`. The same goes for the
+:class:`TrigramSearchBackend` on any database. Rows that are changed without
+:func:`peewee.Model.save`, such as with ``insert_many``, need the index to be
+rebuilt with :meth:`SearchMixin.rebuild_search_index`. On Postgres,
+a ``GIN`` index on a ``tsvector`` expression is used, which Postgres keeps up
+to date on its own. On any other database, ``LIKE`` queries are used.
+
+Full text search matches whole words instead of substrings. On SQLite, every
+word in the search term is matched as a prefix so partially typed words still
+match.
+
+Example:
+    To use full text search, set the backend on the model and create the index
+    after the table has been created.
+
+    .. code-block:: python
+
+        import peewee
+
+        from fleaker.peewee import FullTextSearchBackend, Model, SearchMixin
+
+        class Post(SearchMixin, Model):
+            title = peewee.CharField(max_length=255, null=False)
+            body = peewee.TextField(null=False, default='')
+
+            class Meta:
+                search_fields = ('title', 'body')
+                search_backend = FullTextSearchBackend(config='english')
+
+        Post.create_table()
+        Post.create_search_index()
+
+        Post(title='Welcome!', body='Content').save()
+
+        # Results are ordered by how well they match the term
+        assert Post.search('cont').get().title == 'Welcome!'
+
+.. _FTS5: https://www.sqlite.org/fts5.html
+"""
+
+import re
+
+from functools import reduce
+
+from peewee import (
+    CharField, Clause, CompositeKey, IntegerField, Model, PostgresqlDatabase,
+    SQL, SqliteDatabase, TextField, fn, operator
+)
+from playhouse.shortcuts import case
+
+from fleaker._compat import text_type
+
+
+_ASCII_UPPER = re.compile('[A-Z]+')
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+
+def _fold_ascii(value):
+    """Lowercase only the ASCII letters in the value, like SQLite's ``LIKE``
+    does.
+    """
+    return _ASCII_UPPER.sub(lambda match: match.group().lower(), value)
+
+
+def _get_database(model):
+    """Return the database of the model, looking through a Peewee proxy."""
+    database = model._meta.database
+
+    return getattr(database, 'obj', None) or database
+
+
+def _check_indexed(model, fields):
+    """Ensure that all the fields are in the model's ``Meta.search_fields``,
+    as only those fields are indexed.
+    """
+    for field_name in fields:
+        if field_name not in model._meta.search_fields:
+            raise AttributeError(
+                "The field {} is not in {}.Meta.search_fields, so it isn't "
+                "indexed.".format(field_name, model.__name__)
+            )
+
+
+class SearchBackend(object):
+    """Base class of all the search backends.
+
+    Only :meth:`rank` must be implemented. The remaining methods maintain
+    the index that the backend uses, if there is one, and do nothing by
+    default.
+    """
+
+    def rank(self, model, term, fields):
+        """Build a query for the records matching the term, along with the
+        expressions that rank them.
+
+        Args:
+            model (type): The model to search.
+            term (str): The search term.
+            fields (tuple[str]): The names of the fields to search.
+
+        Returns:
+            tuple(peewee.SelectQuery, list): An unordered query for the
+                records and the expressions that put the best matches first
+                when sorted ascending.
+        """
+        raise NotImplementedError()
+
+    def search(self, model, term, fields):
+        """Build a query for the records matching the term.
+
+        Args:
+            model (type): The model to search.
+            term (str): The search term.
+            fields (tuple[str]): The names of the fields to search.
+
+        Returns:
+            peewee.SelectQuery: An unexecuted query for the records, ordered
+                by their relevancy.
+        """
+        query, ranking = self.rank(model, term, fields)
+
+        return query.order_by(*[rank.asc() for rank in ranking])
+
+    def rank_data(self, model, term, fields, data):
+        """Rank a record in memory exactly like :meth:`rank` would in the
+        database.
+
+        This lets :class:`fleaker.peewee.SearchCache` answer a search by
+        filtering the results of a shorter term.
+
+        Args:
+            model (type): The model that is searched.
+            term (str): The search term.
+            fields (tuple[str]): The names of the fields to search.
+            data (dict): The record's data, by field name.
+
+        Returns:
+            tuple|None: The record's ranking, without the primary key, or
+                ``None`` if it doesn't match.
+
+        Raises:
+            NotImplementedError: Raised if this backend, or this term, can't
+                be ranked in memory.
+        """
+        raise NotImplementedError()
+
+    def create_index(self, model):
+        """Create the index for the model."""
+
+    def drop_index(self, model):
+        """Drop the index for the model."""
+
+    def rebuild_index(self, model):
+        """Rebuild the index for the model from all of its records."""
+
+    def update_instance(self, instance):
+        """Update the index after the instance has been saved."""
+
+    def delete_instance(self, instance):
+        """Remove the instance from the index after it has been deleted."""
+
+
+class LikeSearchBackend(SearchBackend):
+    """Search backend that uses SQL ``LIKE`` queries.
+
+    The query searches and sorts on the folling criteria, in order, where the
+    target string is ``exactly``:
+
+    1. Straight equality (``x = 'exactly'``)
+    2. Right hand ``LIKE`` (``x LIKE 'exact%'``)
+    3. Substring ``LIKE`` (``x LIKE %act%``)
+    """
+
+    def rank(self, model, term, fields):
+        """Build a ``LIKE`` query for the records matching the term."""
+        query = model.select()
+
+        # Cache the LIKE terms
+        like_term = ''.join((term, '%'))
+        full_like_term = ''.join(('%', term, '%'))
+
+        # Cache the order by terms
+        ranking = []
+
+        # Store the clauses seperately because it is needed to perform an OR on
+        # them and that's somehow impossible with their query builder in
+        # a loop.
+        clauses = []
+
+        for field_name in fields:
+            # Cache the field, raising an exception if the field doesn't
+            # exist.
+            field = getattr(model, field_name)
+
+            # Apply the search term case insensitively
+            clauses.append(
+                (field == term) |
+                (field ** like_term) |
+                (field ** full_like_term)
+            )
+
+            ranking.append(case(None, (
+                # Straight matches should show up first
+                (field == term, 0),
+                # Similar terms should show up second
+                (field ** like_term, 1),
+                # Substring matches should show up third
+                (field ** full_like_term, 2),
+            ), default=3))
+
+        # Apply the clauses to the query
+        query = query.where(reduce(operator.or_, clauses))
+
+        # The sort order is influenced by the search term relevance.
+        return query, ranking
+
+    def rank_data(self, model, term, fields, data):
+        """Rank a record's data in memory, like the ``CASE`` expressions
+        from :meth:`rank` do.
+        """
+        # Wildcards and the case folding of non ASCII characters can't be
+        # matched the same way the databases do
+        if '%' in term or '_' in term or _NON_ASCII.search(term):
+            raise NotImplementedError()
+
+        folded_term = _fold_ascii(term)
+        ranks = []
+
+        for field_name in fields:
+            value = data.get(field_name)
+
+            if value is None:
+                ranks.append(3)
+                continue
+
+            value = text_type(value)
+            folded_value = _fold_ascii(value)
+
+            if value == term:
+                ranks.append(0)
+            elif folded_value.startswith(folded_term):
+                ranks.append(1)
+            elif folded_term in folded_value:
+                ranks.append(2)
+            else:
+                ranks.append(3)
+
+        if min(ranks) == 3:
+            return None
+
+        return tuple(ranks)
+
+
+class TrigramSearchBackend(SearchBackend):
+    """Search backend that uses an index of n-grams to find the candidates
+    for a ``LIKE`` search.
+
+    The n-grams, every substring of up to three characters, of the lowercased
+    values of the fields in ``Meta.search_fields`` are kept in a table named
+    ``${table}_trigram``. Searches look up the records that have every n-gram
+    of the search term in one field through that table's index, and only those
+    records are filtered and ordered exactly like :class:`LikeSearchBackend`
+    does. As such, the results are the same, but the table doesn't need to be
+    scanned.
+
+    This works best for short fields, like names and emails, as the index
+    has roughly three rows per character. The model must have an integer
+    primary key.
+
+    Keyword Args:
+        chunk_size (int): The number of n-grams inserted per query when the
+            index is rebuilt. This defaults to 300.
+    """
+
+    gram_size = 3
+
+    def __init__(self, chunk_size=300):
+        self.chunk_size = chunk_size
+        self.like = LikeSearchBackend()
+        self._index_models = {}
+
+    def get_index_model(self, model):
+        """Return a model for the n-gram table of the model.
+
+        Args:
+            model (type): The searchable model.
+
+        Returns:
+            type: A Peewee model for the n-gram table.
+        """
+        index_model = self._index_models.get(model)
+
+        if index_model is None:
+            table_name = '{}_trigram'.format(model._meta.db_table)
+            attrs = {
+                'gram': CharField(max_length=self.gram_size),
+                'field': CharField(max_length=64),
+                'record_id': IntegerField(index=True),
+                'Meta': type('Meta', (object,), {
+                    'database': model._meta.database,
+                    'db_table': table_name,
+                    'primary_key': CompositeKey('gram', 'field', 'record_id'),
+                }),
+            }
+
+            index_model = type(
+                '{}TrigramIndex'.format(model.__name__), (Model,), attrs
+            )
+            self._index_models[model] = index_model
+
+        return index_model
+
+    @classmethod
+    def get_grams(cls, value):
+        """Return every substring of up to :attr:`gram_size` characters of
+        the value.
+
+        Args:
+            value (str): The value to split.
+
+        Returns:
+            set[str]: The lowercased n-grams of the value.
+        """
+        value = text_type(value).lower()
+
+        return {
+            value[index:index + size]
+            for size in range(1, cls.gram_size + 1)
+            for index in range(len(value) - size + 1)
+        }
+
+    @classmethod
+    def get_term_grams(cls, term):
+        """Return the n-grams that a value must have to contain the term.
+
+        Args:
+            term (str): The search term.
+
+        Returns:
+            set[str]: The lowercased n-grams to look up.
+        """
+        term = term.lower()
+
+        if len(term) <= cls.gram_size:
+            return {term} if term else set()
+
+        return {
+            term[index:index + cls.gram_size]
+            for index in range(len(term) - cls.gram_size + 1)
+        }
+
+    def rank(self, model, term, fields):
+        """Build a ``LIKE`` query that only considers the records with all the
+        n-grams of the term.
+        """
+        _check_indexed(model, fields)
+
+        query, ranking = self.like.rank(model, term, fields)
+        grams = list(self.get_term_grams(term))
+
+        if not grams:
+            return query, ranking
+
+        index_model = self.get_index_model(model)
+        candidates = (
+            index_model
+            .select(index_model.record_id)
+            .where((index_model.gram << grams) &
+                   (index_model.field << list(fields)))
+            .group_by(index_model.record_id, index_model.field)
+            .having(fn.COUNT(index_model.gram) == len(grams))
+        )
+
+        return query.where(model._meta.primary_key << candidates), ranking
+
+    def rank_data(self, model, term, fields, data):
+        """Rank a record's data in memory, like :class:`LikeSearchBackend`
+        does.
+        """
+        return self.like.rank_data(model, term, fields, data)
+
+    def _get_rows(self, model, records):
+        """Build the n-gram rows for ``(pk, value, ...)`` tuples of
+        records.
+        """
+        search_fields = model._meta.search_fields
+
+        for record in records:
+            for field_name, value in zip(search_fields, record[1:]):
+                if value is None:
+                    continue
+
+                for gram in self.get_grams(value):
+                    yield {'gram': gram, 'field': field_name,
+                           'record_id': record[0]}
+
+    def _insert_rows(self, model, rows):
+        index_model = self.get_index_model(model)
+        chunk = []
+
+        for row in rows:
+            chunk.append(row)
+
+            if len(chunk) >= self.chunk_size:
+                index_model.insert_many(chunk).execute()
+                chunk = []
+
+        if chunk:
+            index_model.insert_many(chunk).execute()
+
+    def create_index(self, model):
+        """Create the n-gram table and index the existing records."""
+        self.get_index_model(model).create_table(True)
+        self.rebuild_index(model)
+
+    def drop_index(self, model):
+        """Drop the n-gram table."""
+        self.get_index_model(model).drop_table(True)
+
+    def rebuild_index(self, model):
+        """Replace the contents of the n-gram table with all the records."""
+        index_model = self.get_index_model(model)
+        source = [model._meta.primary_key]
+        source.extend(getattr(model, field_name)
+                      for field_name in model._meta.search_fields)
+        records = model.select(*source).tuples().iterator()
+
+        with model._meta.database.atomic():
+            index_model.delete().execute()
+            self._insert_rows(model, self._get_rows(model, records))
+
+    def update_instance(self, instance):
+        """Replace the instance's n-grams."""
+        model = type(instance)
+        index_model = self.get_index_model(model)
+        record = [instance._get_pk_value()]
+        record.extend(getattr(instance, field_name)
+                      for field_name in model._meta.search_fields)
+
+        with model._meta.database.atomic():
+            index_model.delete().where(
+                index_model.record_id == record[0]
+            ).execute()
+            self._insert_rows(model, self._get_rows(model, [record]))
+
+    def delete_instance(self, instance):
+        """Remove the instance's n-grams."""
+        index_model = self.get_index_model(type(instance))
+
+        index_model.delete().where(
+            index_model.record_id == instance._get_pk_value()
+        ).execute()
+
+
+class SqliteFTSSearchBackend(SearchBackend):
+    """Search backend that uses an SQLite FTS5 table as the index.
+
+    The FTS5 table is named ``${table}_search`` and has a column for every
+    field in ``Meta.search_fields``. Its ``rowid`` is the primary key of the
+    record it indexes. Results are ordered by their BM25 score, where fields
+    earlier in ``Meta.search_fields`` weigh more.
+    """
+
+    def __init__(self):
+        self._index_models = {}
+
+    def get_index_model(self, model):
+        """Return a model for the FTS5 table of the model.
+
+        Args:
+            model (type): The searchable model.
+
+        Returns:
+            type: A Peewee model for the FTS5 table.
+        """
+        index_model = self._index_models.get(model)
+
+        if index_model is None:
+            table_name = '{}_search'.format(model._meta.db_table)
+            attrs = {
+                'rowid': IntegerField(primary_key=True),
+                # The hidden column FTS5 uses for MATCH and ranking
+                'match_column': TextField(db_column=table_name),
+                'Meta': type('Meta', (object,), {
+                    'database': model._meta.database,
+                    'db_table': table_name,
+                }),
+            }
+
+            for field_name in model._meta.search_fields:
+                attrs[field_name] = TextField(null=True)
+
+            index_model = type(
+                '{}SearchIndex'.format(model.__name__), (Model,), attrs
+            )
+            self._index_models[model] = index_model
+
+        return index_model
+
+    @staticmethod
+    def _quote(name):
+        return '"{}"'.format(name.replace('"', '""'))
+
+    @classmethod
+    def build_match(cls, term, fields):
+        """Build an FTS5 query that matches every word of the term as
+        a prefix in any of the fields.
+
+        Args:
+            term (str): The search term from the user.
+            fields (tuple[str]): The names of the fields to search.
+
+        Returns:
+            str|None: The FTS5 query, or ``None`` if the term has no words.
+        """
+        words = ['{}*'.format(cls._quote(word)) for word in term.split()]
+
+        if not words:
+            return None
+
+        return '{{{}}} : ({})'.format(' '.join(fields), ' '.join(words))
+
+    def rank(self, model, term, fields):
+        """Build a query for the records matching the term in the FTS5
+        table.
+        """
+        _check_indexed(model, fields)
+
+        index_model = self.get_index_model(model)
+        index_fields = model._meta.search_fields
+        match = self.build_match(term, fields)
+
+        if match is None:
+            return model.select(), []
+
+        weights = [float(len(index_fields) - index)
+                   for index in range(len(index_fields))]
+        pk_field = model._meta.primary_key
+
+        query = (
+            model.select()
+            .join(index_model, on=(index_model.rowid == pk_field))
+            .where(Clause(index_model.match_column, SQL('MATCH'), match))
+        )
+
+        rank = fn.bm25(index_model.match_column, *weights).coerce(False)
+
+        return query, [rank]
+
+    def create_index(self, model):
+        """Create the FTS5 table and index the existing records."""
+        index_model = self.get_index_model(model)
+        columns = ', '.join(self._quote(field_name)
+                            for field_name in model._meta.search_fields)
+
+        model._meta.database.execute_sql(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS {} USING fts5({})'.format(
+                self._quote(index_model._meta.db_table), columns
+            )
+        )
+
+        self.rebuild_index(model)
+
+    def drop_index(self, model):
+        """Drop the FTS5 table."""
+        index_model = self.get_index_model(model)
+
+        model._meta.database.execute_sql('DROP TABLE IF EXISTS {}'.format(
+            self._quote(index_model._meta.db_table)
+        ))
+
+    def rebuild_index(self, model):
+        """Replace the contents of the FTS5 table with all the records."""
+        index_model = self.get_index_model(model)
+        search_fields = model._meta.search_fields
+        source = [model._meta.primary_key]
+        source.extend(model._meta.fields[field_name]
+                      for field_name in search_fields)
+
+        with model._meta.database.atomic():
+            index_model.delete().execute()
+            index_model.insert_from(
+                [index_model.rowid] + [index_model._meta.fields[field_name]
+                                       for field_name in search_fields],
+                model.select(*source)
+            ).execute()
+
+    def update_instance(self, instance):
+        """Replace the instance's row in the FTS5 table."""
+        model = type(instance)
+        index_model = self.get_index_model(model)
+        pk_value = instance._get_pk_value()
+        row = {'rowid': pk_value}
+
+        for field_name in model._meta.search_fields:
+            value = getattr(instance, field_name)
+            row[field_name] = None if value is None else text_type(value)
+
+        with model._meta.database.atomic():
+            index_model.delete().where(index_model.rowid == pk_value).execute()
+            index_model.insert(**row).execute()
+
+    def delete_instance(self, instance):
+        """Remove the instance's row from the FTS5 table."""
+        index_model = self.get_index_model(type(instance))
+        pk_value = instance._get_pk_value()
+
+        index_model.delete().where(index_model.rowid == pk_value).execute()
+
+
+class PostgresFTSSearchBackend(SearchBackend):
+    """Search backend that uses Postgres' ``tsvector`` full text search.
+
+    The searched fields are combined into a ``tsvector``, where fields earlier
+    in ``Meta.search_fields`` weigh more, and results are ordered by their
+    ``ts_rank``. A ``GIN`` index on the same expression, named
+    ``${table}_search``, makes these queries fast and is kept up to date by
+    Postgres itself.
+
+    Keyword Args:
+        config (str): The name of the text search configuration to use. This
+            defaults to ``'english'``.
+
+    Raises:
+        ValueError: Raised if the config isn't a valid name.
+    """
+
+    _weights = ('A', 'B', 'C', 'D')
+
+    def __init__(self, config='english'):
+        if not re.match(r'^\w+$', config):
+            raise ValueError("The text search config '{}' is not a valid "
+                             "name.".format(config))
+
+        self.config = config
+
+    def _weight(self, index):
+        return self._weights[min(index, len(self._weights) - 1)]
+
+    def get_vector(self, model, fields):
+        """Build the ``tsvector`` expression for the fields of the model."""
+        vectors = [
+            fn.setweight(
+                fn.to_tsvector(self.config,
+                               fn.COALESCE(getattr(model, field_name), '')),
+                self._weight(index)
+            )
+            for index, field_name in enumerate(fields)
+        ]
+
+        return reduce(lambda lhs, rhs: Clause(lhs, SQL('||'), rhs), vectors)
+
+    def rank(self, model, term, fields):
+        """Build a query for the records whose ``tsvector`` matches the
+        term.
+        """
+        if not term.split():
+            return model.select(), []
+
+        vector = self.get_vector(model, fields)
+        query = fn.plainto_tsquery(self.config, term)
+
+        return (
+            model.select().where(Clause(vector, SQL('@@'), query)),
+            # Negated so the best matches sort first
+            [fn.ts_rank(vector, query) * -1],
+        )
+
+    def create_index(self, model):
+        """Create the ``GIN`` index on the ``tsvector`` expression."""
+        vectors = [
+            "setweight(to_tsvector('{}', COALESCE(\"{}\", '')), '{}')".format(
+                self.config,
+                model._meta.fields[field_name].db_column,
+                self._weight(index)
+            )
+            for index, field_name in enumerate(model._meta.search_fields)
+        ]
+
+        model._meta.database.execute_sql(
+            'CREATE INDEX IF NOT EXISTS "{table}_search" ON "{table}" '
+            'USING GIN (({vector}))'.format(
+                table=model._meta.db_table, vector=' || '.join(vectors)
+            )
+        )
+
+    def drop_index(self, model):
+        """Drop the ``GIN`` index."""
+        model._meta.database.execute_sql(
+            'DROP INDEX IF EXISTS "{}_search"'.format(model._meta.db_table)
+        )
+
+
+class FullTextSearchBackend(SearchBackend):
+    """Search backend that uses the full text search of the model's database.
+
+    SQLite databases use :class:`SqliteFTSSearchBackend`, Postgres databases
+    use :class:`PostgresFTSSearchBackend`, and everything else falls back to
+    :class:`LikeSearchBackend`.
+
+    Keyword Args:
+        config (str): The name of the Postgres text search configuration to
+            use. This defaults to ``'english'``.
+    """
+
+    def __init__(self, config='english'):
+        self.sqlite = SqliteFTSSearchBackend()
+        self.postgres = PostgresFTSSearchBackend(config=config)
+        self.fallback = LikeSearchBackend()
+
+    def get_backend(self, model):
+        """Return the backend to use for the database of the model."""
+        database = _get_database(model)
+
+        if isinstance(database, SqliteDatabase):
+            return self.sqlite
+        elif isinstance(database, PostgresqlDatabase):
+            return self.postgres
+
+        return self.fallback
+
+    def rank(self, model, term, fields):
+        return self.get_backend(model).rank(model, term, fields)
+
+    def create_index(self, model):
+        self.get_backend(model).create_index(model)
+
+    def drop_index(self, model):
+        self.get_backend(model).drop_index(model)
+
+    def rebuild_index(self, model):
+        self.get_backend(model).rebuild_index(model)
+
+    def update_instance(self, instance):
+        self.get_backend(type(instance)).update_instance(instance)
+
+    def delete_instance(self, instance):
+        self.get_backend(type(instance)).delete_instance(instance)
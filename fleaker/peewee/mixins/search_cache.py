@@ -0,0 +1,306 @@
+# ~*~ coding: utf-8 ~*~
+"""
+fleaker.peewee.mixins.search_cache
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Module that provides an in-process cache for the pages returned by
+:meth:`fleaker.peewee.SearchMixin.search_page`. Typeahead UIs send the same
+searches over and over again, and this lets all but the first of them skip the
+database.
+
+Cached pages expire after a TTL, the least recently used pages are evicted
+once the cache is full, and all the pages of a model are dropped whenever one
+of its records is saved or deleted. Only signal enabled models, such as
+:class:`fleaker.peewee.Model`, send those signals. Changes made without them,
+such as with ``insert_many`` or ``update``, are only picked up when the pages
+expire or when :meth:`SearchCache.invalidate` is called.
+
+When every result of a search fit on its first page, the search is cached as
+complete. A later search for a longer term, such as ``'abc'`` after ``'ab'``,
+is then answered by filtering those results in memory, as long as the model's
+search backend supports it.
+
+Example:
+    To cache a model's searches, set ``Meta.search_cache``.
+
+    .. code-block:: python
+
+        import peewee
+
+        from fleaker.peewee import Model, SearchCache, SearchMixin
+
+        class User(SearchMixin, Model):
+            name = peewee.CharField(max_length=255)
+
+            class Meta:
+                search_fields = ('name',)
+                search_cache = SearchCache(max_size=1024, ttl=30)
+
+        User.search_page('jo')
+        User.search_page('jo')
+
+        assert User._meta.search_cache.hits == 1
+"""
+
+import threading
+import time
+
+from fleaker.utils import LRUCache
+
+# Stands in for the limit of complete searches, which have no pages
+_COMPLETE = 'complete'
+
+
+class SearchCache(object):
+    """Caches the pages of searches for the models that use it.
+
+    Keyword Args:
+        max_size (int): The maximum number of pages to keep. This defaults to
+            1024.
+        ttl (float): The number of seconds a page is kept. This defaults to
+            60 seconds.
+        prefix_reuse (bool): Should searches be answered by filtering the
+            complete results of a shorter term? This defaults to ``True``.
+
+    Attributes:
+        hits (int): The number of searches answered by the cache.
+        prefix_hits (int): The number of those hits that were answered by
+            filtering the results of a shorter term.
+        misses (int): The number of searches that had to query the database.
+    """
+
+    def __init__(self, max_size=1024, ttl=60, prefix_reuse=True):
+        self.ttl = ttl
+        self.prefix_reuse = prefix_reuse
+
+        self.hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+
+        self._pages = LRUCache(max_size=max_size)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    @property
+    def evictions(self):
+        """int: The number of pages evicted to make room for newer ones."""
+        return self._pages.evictions
+
+    @property
+    def hit_rate(self):
+        """float: The fraction of searches answered by the cache."""
+        total = self.hits + self.misses
+
+        return float(self.hits) / total if total else 0.0
+
+    def __len__(self):
+        return len(self._pages)
+
+    @staticmethod
+    def normalize(term):
+        """Normalize a search term before it is used as a key and searched
+        for.
+
+        Args:
+            term (str): The search term from the user.
+
+        Returns:
+            str: The term without surrounding whitespace.
+        """
+        return term.strip()
+
+    def invalidate(self, model):
+        """Drop every cached page of the model.
+
+        Args:
+            model (type): The model whose records have changed.
+        """
+        with self._lock:
+            self._generations[model] = self._generations.get(model, 0) + 1
+
+    def clear(self):
+        """Drop every cached page."""
+        self._pages.clear()
+
+    def get_generation(self, model):
+        """Return the generation of the model's pages, which changes every
+        time they are invalidated.
+
+        Read it before the database is searched and pass it to
+        :meth:`set_page`, so pages of records that changed during the search
+        aren't cached.
+
+        Args:
+            model (type): The model that is searched.
+
+        Returns:
+            int: The model's current generation.
+        """
+        return self._generations.get(model, 0)
+
+    def get_page(self, model, fields, term, after, limit):
+        """Return a cached page of a search.
+
+        Args:
+            model (type): The model that was searched.
+            fields (tuple[str]): The names of the searched fields.
+            term (str): The normalized search term.
+            after (tuple|None): The cursor the page starts after.
+            limit (int): The maximum number of records on the page.
+
+        Returns:
+            tuple(list, tuple|None)|None: The records and the cursor for the
+                next page, or ``None`` if the page isn't cached.
+        """
+        key = self._make_key(model, fields, term)
+        page = self._get(key + (after, limit))
+
+        if page is None:
+            rows = self._get(key + (None, _COMPLETE))
+
+            if rows is None and self.prefix_reuse and after is None:
+                rows = self._get_from_prefix(model, fields, term)
+
+            if rows is not None:
+                page = self._paginate(rows, after, limit)
+
+        with self._lock:
+            if page is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        rows, cursor = page
+
+        return [self._load(model, data, ranks) for data, ranks in rows], cursor
+
+    def set_page(self, model, fields, term, after, limit, records, cursor,
+                 generation=None):
+        """Cache a page of a search.
+
+        Args:
+            model (type): The model that was searched.
+            fields (tuple[str]): The names of the searched fields.
+            term (str): The normalized search term.
+            after (tuple|None): The cursor the page starts after.
+            limit (int): The maximum number of records on the page.
+            records (list): The records on the page, with their
+                ``search_rank_*`` attributes.
+            cursor (tuple|None): The cursor for the next page.
+
+        Keyword Args:
+            generation (int, optional): The model's generation from before
+                the search, from :meth:`get_generation`. The page isn't cached
+                if the model's pages have been invalidated since. If not
+                provided, the current generation is used.
+        """
+        if generation is None:
+            generation = self.get_generation(model)
+        elif generation != self.get_generation(model):
+            return
+
+        key = self._make_key(model, fields, term, generation)
+        rows = [(dict(record._data), self._get_ranks(record))
+                for record in records]
+
+        if after is None and cursor is None:
+            self._set(key + (None, _COMPLETE), rows)
+        else:
+            self._set(key + (after, limit), (rows, cursor))
+
+    def _make_key(self, model, fields, term, generation=None):
+        if generation is None:
+            generation = self.get_generation(model)
+
+        return (model, generation, fields, term)
+
+    def _get(self, key):
+        entry = self._pages.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+
+        if expires_at < time.time():
+            self._pages.pop(key)
+            return None
+
+        return value
+
+    def _set(self, key, value):
+        self._pages.set(key, (time.time() + self.ttl, value))
+
+    def _get_from_prefix(self, model, fields, term):
+        """Build the complete results of the term by filtering the complete
+        results of the longest cached prefix of it.
+        """
+        backend = model._meta.search_backend
+        key = self._make_key(model, fields, term)
+
+        for end in range(len(term) - 1, 0, -1):
+            prefix_key = self._make_key(model, fields, term[:end], key[1])
+            rows = self._get(prefix_key + (None, _COMPLETE))
+
+            if rows is None:
+                continue
+
+            try:
+                ranked = []
+
+                for data, ranks in rows:
+                    new_ranks = backend.rank_data(model, term, fields, data)
+
+                    if new_ranks is not None:
+                        ranked.append((data, new_ranks + ranks[-1:]))
+            except NotImplementedError:
+                return None
+
+            ranked.sort(key=lambda row: row[1])
+
+            with self._lock:
+                self.prefix_hits += 1
+
+            self._set(key + (None, _COMPLETE), ranked)
+
+            return ranked
+
+        return None
+
+    @staticmethod
+    def _paginate(rows, after, limit):
+        if after is not None:
+            after = tuple(after)
+            rows = [row for row in rows if row[1] > after]
+
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+
+        return rows, rows[-1][1]
+
+    @staticmethod
+    def _get_ranks(record):
+        ranks = []
+        index = 0
+
+        while hasattr(record, 'search_rank_{}'.format(index)):
+            ranks.append(getattr(record, 'search_rank_{}'.format(index)))
+            index += 1
+
+        return tuple(ranks)
+
+    @staticmethod
+    def _load(model, data, ranks):
+        """Build a record from cached data, like a query would."""
+        instance = model()
+        instance._data = dict(data)
+
+        for index, rank in enumerate(ranks):
+            setattr(instance, 'search_rank_{}'.format(index), rank)
+
+        instance._prepare_instance()
+
+        return instance
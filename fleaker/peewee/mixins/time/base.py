@@ -50,14 +50,121 @@ Example:
         # Which will just unset the archived timestamp.
         assert not user.archived
 
+    Exports can read the timestamps of many records at once, column by
+    column. NumPy_ is needed to read them as ``datetime64`` arrays.
+
+    .. code-block:: python
+
+        columns = User.read_timestamps(as_numpy=True)
+
+        assert columns['created'].dtype == 'datetime64[us]'
+
+.. _NumPy: http://www.numpy.org/
 """
 
-from datetime import datetime
+import warnings
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
 
 from peewee import DateTimeField
 from playhouse.hybrid import hybrid_property
 from playhouse.signals import Model as SignalModel, post_save, pre_save
 
+from fleaker._compat import string_types
+from fleaker.peewee.fields.dates import BaseDateTimeField, parse_iso_datetime
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The names of the timestamp fields, in the order they're read
+_TIMESTAMP_FIELDS = ('created', 'modified', 'archived')
+
+
+def _to_utc_naive(value):
+    """Return a database value as something NumPy parses without a timezone.
+    """
+    if isinstance(value, string_types):
+        if value.endswith('+00:00'):
+            return value[:-6]
+        elif value.endswith('Z'):
+            return value[:-1]
+
+        parsed = parse_iso_datetime(value)
+
+        if parsed is None or parsed[1] is None:
+            return value
+
+        value, offset = parsed
+
+        return value - timedelta(seconds=offset)
+    elif isinstance(value, datetime) and value.tzinfo is not None:
+        return (value - value.utcoffset()).replace(tzinfo=None)
+
+    return value
+
+
+def _parse_datetime64(values):
+    """Parse a column with NumPy at once, returning ``None`` if any of the
+    values can't be parsed as a naive datetime.
+    """
+    try:
+        with warnings.catch_warnings():
+            # NumPy only warns about the timezones it ignores
+            warnings.simplefilter('error', DeprecationWarning)
+            return numpy.array(values, dtype='datetime64[us]')
+    except (DeprecationWarning, TypeError, ValueError):
+        return None
+
+
+def _to_datetime64(values):
+    """Convert a column of database values into a NumPy ``datetime64[us]``
+    array of naive UTC values.
+
+    NumPy parses the column at once. UTC text, which is how the Arrow and
+    Pendulum mixins store their timestamps, only has its offset dropped
+    first. Each value is only normalized on its own if the column has other
+    timezones.
+    """
+    sample = next((value for value in values if value is not None), None)
+    array = None
+
+    if not isinstance(sample, string_types) or sample[-6:] != '+00:00':
+        array = _parse_datetime64(values)
+
+    if array is None:
+        try:
+            array = _parse_datetime64([
+                value[:-6] if value and value[-6:] == '+00:00' else value
+                for value in values
+            ])
+        except TypeError:
+            pass
+
+    if array is None:
+        array = numpy.array([_to_utc_naive(value) for value in values],
+                            dtype='datetime64[us]')
+
+    return array
+
+
+def _decode_column(field, values):
+    """Convert a column of database values, converting each distinct value
+    only once.
+    """
+    if isinstance(field, BaseDateTimeField):
+        convert = field.to_python
+    else:
+        convert = field.python_value
+
+    converted = {None: None}
+
+    return [converted[value] if value in converted
+            else converted.setdefault(value, convert(value))
+            for value in values]
+
 
 class CreatedMixin(SignalModel):
     """Peewee mixin that provides record keeping for when a record was created.
@@ -70,10 +177,19 @@ class CreatedMixin(SignalModel):
     """
     created = DateTimeField(null=False, default=datetime.utcnow)
     _cached_time = None
+    _default_created = None
 
     class Meta:
         datetime = datetime
 
+    def __init__(self, *args, **kwargs):
+        super(CreatedMixin, self).__init__(*args, **kwargs)
+
+        # The default the instance was made with, so saves in bulk only
+        # replace a created time that wasn't set explicitly
+        if 'created' not in kwargs:
+            self._default_created = self._data.get('created')
+
     def _get_cached_time(self):
         """Method that will allow for consistent modified and archived
         timestamps.
@@ -87,6 +203,69 @@ class CreatedMixin(SignalModel):
 
         return self._cached_time
 
+    @classmethod
+    def read_timestamps(cls, query=None, as_numpy=False, chunk_size=10000):
+        """Read the primary keys and timestamps of many records as columns.
+
+        The rows are read straight from the cursor and each column is
+        decoded at once. As NumPy arrays, the timestamps are naive UTC
+        ``datetime64[us]`` values with ``NaT`` for nulls. Otherwise, each
+        distinct timestamp is only converted once.
+
+        Keyword Args:
+            query (peewee.SelectQuery, optional): The query for the records.
+                This defaults to selecting every record.
+            as_numpy (bool, optional): Should the columns be NumPy arrays?
+            chunk_size (int, optional): The number of rows fetched from the
+                cursor at a time. This defaults to 10,000.
+
+        Returns:
+            collections.OrderedDict: The primary key column, followed by the
+                ``created``, ``modified`` and ``archived`` columns the model
+                has, keyed by their names.
+
+        Raises:
+            ImportError: Raised if ``as_numpy`` is set and NumPy isn't
+                installed.
+        """
+        if as_numpy and numpy is None:
+            raise ImportError("NumPy must be installed to read timestamps as "
+                              "NumPy arrays.")
+
+        primary_key = cls._meta.primary_key
+        fields = [primary_key] + [cls._meta.fields[name]
+                                  for name in _TIMESTAMP_FIELDS
+                                  if name in cls._meta.fields]
+
+        # Queries mustn't be truth tested, which would run them
+        if query is None:
+            query = cls.select()
+
+        query = query.select(*fields)
+        cursor = query.database.execute_sql(*query.sql())
+        columns = [[] for _ in fields]
+
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+
+            if not rows:
+                break
+
+            for column, values in zip(columns, zip(*rows)):
+                column.extend(values)
+
+        result = OrderedDict()
+        result[primary_key.name] = (numpy.array(columns[0]) if as_numpy
+                                    else columns[0])
+
+        for field, column in zip(fields[1:], columns[1:]):
+            if as_numpy:
+                result[field.name] = _to_datetime64(column)
+            else:
+                result[field.name] = _decode_column(field, column)
+
+        return result
+
 
 class CreatedModifiedMixin(CreatedMixin):
     """Peewee mixin that provides record keeping for when a record was created
@@ -88,15 +88,43 @@ Example:
         except DoesNotExist:
             pass
 
+        # Many records can be saved at once. The signals are still sent for
+        # every instance, but the rows are written with a few queries.
+        users = User.bulk_create([
+            User(email='user{}@example.com'.format(idx), password='password')
+            for idx in range(1000)
+        ])
+
+        for user in users:
+            user.active = False
+
+        User.bulk_update(users, ['active'])
+
+        # Read only listings can skip building model instances.
+        for record in User.base_query().as_records():
+            print(record.email)
+
 """
 
+from contextlib import contextmanager
+
 import peewee
 
-from playhouse.signals import Model as SignalModel
+from playhouse.shortcuts import case
+from playhouse.signals import Model as SignalModel, post_save, pre_save
 
 from fleaker._compat import PY2, iteritems, exception_message
+from fleaker.constants import MISSING
 from fleaker.orm import _PEEWEE_EXT
 
+from .fields.json import is_frozen
+from .query import RecordQuery
+
+
+def _is_mutable(value):
+    """Could the value have been changed in place?"""
+    return isinstance(value, (dict, list)) and not is_frozen(value)
+
 
 class Model(SignalModel):
     """A Peewee base model with sensible defaults.
@@ -106,14 +134,90 @@ class Model(SignalModel):
     ``playhouse.signals.Model`` so all models that use this will be event
     ready.
 
+    Updates only write the fields that have changed since the instance was
+    loaded or last saved, which are listed in :attr:`dirty_fields`. If no
+    field has changed, :meth:`save` does nothing at all, so no signals are
+    sent and mixins don't update their timestamps or create Events. Fields
+    holding a ``dict`` or a ``list``, such as a
+    :class:`fleaker.peewee.JSONField`, are always treated as changed because
+    they can be modified in place, unless they are immutable all the way
+    down.
+
     Attributes:
         Meta.integrity_error_msg (str):
             The friendly message that should be displayed when ``Model.save``
             catches ``peewee.IntegrityError``.
+        Meta.track_dirty (bool): Should updates only write the changed
+            fields and be skipped when nothing changed? This defaults to
+            ``True``.
     """
 
     class Meta(object):
         database = _PEEWEE_EXT.database
+        track_dirty = True
+
+    @property
+    def dirty_fields(self):
+        """list[peewee.Field]: The fields that will be written by the next
+        save.
+        """
+        return [
+            field for field in self._meta.sorted_fields
+            if field.name in self._dirty or
+            _is_mutable(self._data.get(field.name))
+        ]
+
+    def is_dirty(self):
+        """Has any field changed since the instance was loaded or saved?
+
+        Returns:
+            bool: ``True`` if the next save will write anything.
+        """
+        return bool(self.dirty_fields)
+
+    def save(self, force_insert=False, only=None):
+        """Save the instance, skipping the save if nothing changed.
+
+        Keyword Args:
+            force_insert (bool): Should the instance be inserted, even though
+                it has a primary key?
+            only (list[peewee.Field], optional): Only write these fields.
+
+        Returns:
+            int|bool: The number of rows saved, or ``False`` if nothing
+                changed and the save was skipped.
+        """
+        created = force_insert or not bool(self._get_pk_value())
+
+        if created or only or not self._meta.track_dirty:
+            return super(Model, self).save(force_insert=force_insert,
+                                           only=only)
+
+        if not self.is_dirty():
+            return False
+
+        # The fields changed by the pre_save receivers, like modified, must
+        # be written too, so the signals are sent here instead of by
+        # SignalModel.save.
+        pre_save.send(self, created=False)
+        rows = peewee.Model.save(self, only=self.dirty_fields)
+        post_save.send(self, created=False)
+
+        return rows
+
+    @classmethod
+    def select(cls, *selection):
+        """Return a select query, which can return its rows as records.
+
+        Returns:
+            fleaker.peewee.query.RecordQuery: An unexecuted query.
+        """
+        query = RecordQuery(cls, *selection)
+
+        if cls._meta.order_by:
+            query = query.order_by(*cls._meta.order_by)
+
+        return query
 
     @classmethod
     def base_query(cls):
@@ -160,6 +264,9 @@ class Model(SignalModel):
     def update_instance(self, data):
         """Update a single record by id with the provided data.
 
+        Only the fields whose values actually change are written. If none of
+        them change, the record isn't saved at all.
+
         Args:
             data (dict): The new data to update the record with.
 
@@ -179,8 +286,269 @@ class Model(SignalModel):
                     )
                 )
 
+            # Setting a field marks it dirty, even if it didn't change
+            if key in self._meta.fields and self._data.get(key) == val:
+                continue
+
             setattr(self, key, val)
 
         self.save()
 
         return self
+
+    @classmethod
+    def bulk_create(cls, instances, chunk_size=100):
+        """Insert many new instances with a few ``INSERT`` queries.
+
+        The ``pre_save`` and ``post_save`` signals are sent for every
+        instance, just like :meth:`save` does, so the mixins still set their
+        timestamps, signatures, and Events. Past that, the current time is
+        taken once for the whole batch, the rows are inserted ``chunk_size``
+        at a time, and the Events of an
+        :class:`fleaker.peewee.EventMixin` are written with a single
+        ``INSERT``. Everything happens in one transaction.
+
+        Args:
+            instances (list[fleaker.peewee.Model]): The unsaved instances to
+                insert.
+
+        Keyword Args:
+            chunk_size (int): The maximum number of rows in one ``INSERT``.
+                This defaults to 100.
+
+        Returns:
+            list[fleaker.peewee.Model]: The instances, with their primary
+                keys set.
+        """
+        instances = list(instances)
+
+        if not instances:
+            return instances
+
+        pk_field = cls._meta.primary_key
+
+        with cls._bulk_save(instances, created=True):
+            for instance in instances:
+                pre_save.send(instance, created=True)
+
+            # Only rows with the same columns can be inserted together
+            groups = {}
+
+            for instance in instances:
+                row = dict(instance._data)
+
+                if pk_field and row.get(pk_field.name, False) is None:
+                    del row[pk_field.name]
+
+                groups.setdefault(tuple(sorted(row)), []).append(
+                    (instance, row)
+                )
+
+            for group in groups.values():
+                for start in range(0, len(group), chunk_size):
+                    chunk = group[start:start + chunk_size]
+                    pk_values = cls._insert_rows([row for _, row in chunk])
+
+                    for (instance, _), pk_value in zip(chunk, pk_values):
+                        instance._set_pk_value(pk_value)
+
+            for instance in instances:
+                instance._dirty.clear()
+                post_save.send(instance, created=True)
+
+        return instances
+
+    @classmethod
+    def bulk_update(cls, instances, fields, chunk_size=100):
+        """Update the given fields of many instances with a few ``UPDATE``
+        queries.
+
+        The ``pre_save`` and ``post_save`` signals are sent for every
+        instance, just like :meth:`save` does, and the fields they change,
+        such as ``modified`` and ``signature``, are updated as well. Each
+        chunk of instances is updated with one query that uses a ``CASE`` on
+        the primary key for every field. The originals needed by an
+        :class:`fleaker.peewee.EventMixin` are loaded with one query and its
+        Events are written with a single ``INSERT``. Everything happens in
+        one transaction.
+
+        Args:
+            instances (list[fleaker.peewee.Model]): The saved instances to
+                update.
+            fields (list[str|peewee.Field]): The fields to update.
+
+        Keyword Args:
+            chunk_size (int): The maximum number of records in one
+                ``UPDATE``. This defaults to 100.
+
+        Returns:
+            int: The number of rows that were updated.
+
+        Raises:
+            AttributeError: This is raised if a field isn't a field on the
+                model.
+        """
+        instances = list(instances)
+
+        if not instances:
+            return 0
+
+        pk_field = cls._meta.primary_key
+        names = set()
+
+        for field in fields:
+            name = getattr(field, 'name', field)
+
+            if name not in cls._meta.fields:
+                raise AttributeError(
+                    "No field named {key} for model {model}".format(
+                        key=name,
+                        model=cls.__name__
+                    )
+                )
+
+            names.add(name)
+
+        rows = 0
+
+        with cls._bulk_save(instances, created=False):
+            for instance in instances:
+                data = dict(instance._data)
+                pre_save.send(instance, created=False)
+
+                # Also update the fields that the signals changed
+                names.update(
+                    name for name, value in iteritems(instance._data)
+                    if data.get(name, MISSING) != value
+                )
+
+            names.discard(pk_field.name)
+            update_fields = [cls._meta.fields[name] for name in names]
+
+            for start in range(0, len(instances), chunk_size):
+                chunk = instances[start:start + chunk_size]
+                pk_values = [pk_field.db_value(instance._get_pk_value())
+                             for instance in chunk]
+                update = {}
+
+                for field in update_fields:
+                    update[field] = cls._bulk_case(field, [
+                        (pk_value, field.db_value(instance._data.get(
+                            field.name
+                        )))
+                        for pk_value, instance in zip(pk_values, chunk)
+                    ])
+
+                rows += (cls.update(update)
+                         .where(pk_field << pk_values)
+                         .execute())
+
+            for instance in instances:
+                instance._dirty.difference_update(names)
+                post_save.send(instance, created=False)
+
+        return rows
+
+    @classmethod
+    @contextmanager
+    def _bulk_save(cls, instances, created):
+        """Prepare the mixins of the model for saving the instances in bulk,
+        in a transaction.
+        """
+        # Imported here to avoid a circular import with fleaker.peewee
+        from .mixins import CreatedMixin, EventMixin, EventSink
+
+        if issubclass(cls, CreatedMixin):
+            now = cls._meta.datetime.utcnow()
+
+            for instance in instances:
+                instance._cached_time = now
+
+                # Created rows share the batch's timestamp too, instead of
+                # the time each instance was made, unless it was set
+                default = instance._default_created
+
+                if (created and default is not None and
+                        instance._data.get('created') is default):
+                    instance.created = now
+
+        batch_events = (issubclass(cls, EventMixin) and
+                        cls._meta.event_ready and
+                        cls._meta.event_writer is None)
+
+        if (batch_events and not created and
+                not cls._meta.snapshot_original):
+            cls._load_originals(instances)
+
+        with cls._meta.database.atomic():
+            if batch_events:
+                with EventSink():
+                    yield
+            else:
+                yield
+
+    @classmethod
+    def _load_originals(cls, instances):
+        """Load the originals of the instances with one query, so the Events
+        of an :class:`fleaker.peewee.EventMixin` can compare against them.
+        """
+        pending = {}
+
+        for instance in instances:
+            if not instance._original:
+                pending[instance._get_pk_value()] = instance
+
+        if not pending:
+            return
+
+        pk_field = cls._meta.primary_key
+
+        for original in cls.select().where(pk_field << list(pending)):
+            pending[original._get_pk_value()]._original = original
+
+    @classmethod
+    def _insert_rows(cls, rows):
+        """Insert the rows, which must have the same keys, and return the
+        primary keys of the new records.
+        """
+        pk_field = cls._meta.primary_key
+        query = cls.insert_many(rows)
+
+        if (not pk_field or cls._meta.composite_key or
+                pk_field.name in rows[0]):
+            query.execute()
+            return [row.get(pk_field.name) if pk_field else None
+                    for row in rows]
+
+        database = cls._meta.database
+        database = getattr(database, 'obj', None) or database
+
+        if database.insert_returning:
+            return list(query.return_id_list().execute())
+
+        if isinstance(database, peewee.SqliteDatabase):
+            # SQLite gives the rows of one INSERT consecutive IDs
+            query.execute()
+            last_id = database.execute_sql(
+                'SELECT last_insert_rowid()'
+            ).fetchone()[0]
+
+            return list(range(last_id - len(rows) + 1, last_id + 1))
+
+        return [cls.insert(**row).execute() for row in rows]
+
+    @classmethod
+    def _bulk_case(cls, field, values):
+        """Build a ``CASE`` that picks the value for each primary key."""
+        expression = case(cls._meta.primary_key, values)
+        database = cls._meta.database
+        database = getattr(database, 'obj', None) or database
+
+        # Postgres types the values as text unless they're cast
+        if isinstance(database, peewee.PostgresqlDatabase):
+            compiler = database.compiler()
+            expression = expression.cast(
+                compiler.get_column_type(field.get_db_field())
+            )
+
+        return expression
@@ -0,0 +1,228 @@
+# ~*~ coding: utf-8 ~*~
+"""
+fleaker.peewee.query
+~~~~~~~~~~~~~~~~~~~~
+
+Module that provides the query class of :class:`fleaker.peewee.Model`, which
+can return its rows as lightweight records instead of model instances.
+
+Records are instances of a class with ``__slots__`` for the selected columns,
+and hold the same values as the model instances would, converted by the
+fields. They send no signals, have no mixin attributes and can't be saved,
+which makes them much cheaper to build and hold for read only listings and
+reports. Like rows of ``.dicts()`` queries, they hold the converted values of
+lazy JSON and datetime fields.
+
+Example:
+    .. code-block:: python
+
+        for record in User.base_query().as_records():
+            print(record.id, record.email)
+
+        # Records can be encoded as JSON objects by the Fleaker JSON encoder
+        app.stream_json(User.base_query().as_records())
+"""
+
+import re
+
+import peewee
+
+from peewee import (
+    AggregateQueryResultWrapper, ExtQueryResultWrapper,
+    ModelQueryResultWrapper, NaiveQueryResultWrapper, RESULTS_NAIVE,
+    returns_clone
+)
+
+from fleaker.json import FleakerJSONEncoder
+
+# The record class of each model and selection of columns
+_record_classes = {}
+
+
+class Record(object):
+    """Base class of the lightweight records returned by
+    :meth:`RecordQuery.as_records`.
+
+    Attributes:
+        _fields (tuple[str]): The names of the record's columns.
+    """
+
+    __slots__ = ()
+    _fields = ()
+
+    def _asdict(self):
+        """Return the record's columns as a ``dict``."""
+        return {name: getattr(self, name) for name in self._fields}
+
+    def __eq__(self, other):
+        return (type(self) is type(other) and
+                self._asdict() == other._asdict())
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join('{}={!r}'.format(name, getattr(self, name))
+                      for name in self._fields)
+        )
+
+
+FleakerJSONEncoder.register(Record, Record._asdict)
+
+
+def get_record_class(model, names):
+    """Return the record class for columns selected from a model.
+
+    Args:
+        model (type): The model that was queried.
+        names (tuple[str]): The names of the selected columns.
+
+    Returns:
+        type: The :class:`Record` subclass, which is only made once for each
+            model and columns.
+    """
+    key = (model, names)
+
+    if key not in _record_classes:
+        _record_classes[key] = type(
+            '{}Record'.format(model.__name__), (Record,),
+            {'__slots__': names, '_fields': names}
+        )
+
+    return _record_classes[key]
+
+
+class RecordQueryResultWrapper(ExtQueryResultWrapper):
+    """Result wrapper that returns each row as a :class:`Record`."""
+
+    def initialize(self, description):
+        super(RecordQueryResultWrapper, self).initialize(description)
+
+        names = tuple(re.sub(r'\W', '_', column)
+                      for _, column, _ in self.conv)
+        record_class = get_record_class(self.model, names)
+
+        self._new_record = record_class.__new__
+        self._record_class = record_class
+        self._setters = [
+            (index, getattr(record_class, name).__set__, convert)
+            for (index, _, convert), name in zip(self.conv, names)
+        ]
+
+    def process_row(self, row):
+        record = self._new_record(self._record_class)
+
+        for index, set_value, convert in self._setters:
+            value = row[index]
+            set_value(record, value if convert is None else convert(value))
+
+        return record
+
+
+def _get_lazy_converter(convert):
+    """Return the converter of a column for model instances, which keeps the
+    values of lazy fields for their descriptors to convert on access.
+    """
+    field = getattr(convert, '__self__', None)
+
+    if getattr(field, 'lazy', False) and hasattr(field, 'lazy_value'):
+        return field.lazy_value
+
+    return convert
+
+
+def _has_lazy_fields(model):
+    """Does the model have fields whose values are converted on access?"""
+    return any(getattr(field, 'lazy', False) and hasattr(field, 'lazy_value')
+               for field in model._meta.sorted_fields)
+
+
+class LazyNaiveQueryResultWrapper(NaiveQueryResultWrapper):
+    """Result wrapper for model instances that keeps the values of lazy
+    fields.
+    """
+
+    def initialize(self, description):
+        super(LazyNaiveQueryResultWrapper, self).initialize(description)
+
+        self.conv = [(index, name, _get_lazy_converter(convert))
+                     for index, name, convert in self.conv]
+
+
+class LazyModelQueryResultWrapper(ModelQueryResultWrapper):
+    """Result wrapper for model instances with joins that keeps the values
+    of lazy fields.
+    """
+
+    def generate_column_map(self):
+        column_map, models = super(
+            LazyModelQueryResultWrapper, self
+        ).generate_column_map()
+        column_map = [(key, constructor, attr, _get_lazy_converter(convert))
+                      for key, constructor, attr, convert in column_map]
+
+        return column_map, models
+
+
+class LazyAggregateQueryResultWrapper(AggregateQueryResultWrapper,
+                                      LazyModelQueryResultWrapper):
+    """Result wrapper for aggregated model instances that keeps the values
+    of lazy fields.
+    """
+
+
+# The result wrappers for model instances of models with lazy fields, most
+# specific first
+_LAZY_RESULT_WRAPPERS = (
+    (AggregateQueryResultWrapper, LazyAggregateQueryResultWrapper),
+    (ModelQueryResultWrapper, LazyModelQueryResultWrapper),
+    (NaiveQueryResultWrapper, LazyNaiveQueryResultWrapper),
+)
+
+
+class RecordQuery(peewee.SelectQuery):
+    """Select query that can return its rows as :class:`Record` objects."""
+
+    def __init__(self, model_class, *selection):
+        super(RecordQuery, self).__init__(model_class, *selection)
+        self._records = False
+
+    def _clone_attributes(self, query):
+        query = super(RecordQuery, self)._clone_attributes(query)
+        query._records = self._records
+
+        return query
+
+    @returns_clone
+    def as_records(self, as_records=True):
+        """Return the rows as lightweight records instead of model instances.
+
+        Keyword Args:
+            as_records (bool, optional): Should the rows be records?
+        """
+        self._records = as_records
+
+    def _get_result_wrapper(self):
+        if self._records:
+            return RecordQueryResultWrapper
+
+        wrapper = super(RecordQuery, self)._get_result_wrapper()
+
+        # Every other row holds the converted values of lazy fields
+        if (self._tuples or self._dicts or self._namedtuples or
+                not _has_lazy_fields(self.model_class)):
+            return wrapper
+
+        for model_wrapper, lazy_wrapper in _LAZY_RESULT_WRAPPERS:
+            if issubclass(wrapper, model_wrapper):
+                return lazy_wrapper
+
+        # The naive wrapper may be replaced by Peewee's C extension
+        if wrapper is self.database.get_result_wrapper(RESULTS_NAIVE):
+            return LazyNaiveQueryResultWrapper
+
+        return wrapper
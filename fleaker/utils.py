@@ -11,6 +11,9 @@ but it is technically a public API, so treat it as such!
 :license: BSD, see LICENSE for more details.
 """
 
+from collections import OrderedDict
+from threading import RLock
+
 from flask import current_app
 
 
@@ -28,3 +31,105 @@ def in_app_context(app=None):
 
     # This is the best way to check if current_app is a proxy.
     return bool(dir(app))
+
+
+class LRUCache(object):
+    """A small, thread safe cache that evicts the least recently used items.
+
+    This cache is used internally wherever a value is expensive to compute and
+    likely to be needed again, such as compiled templates or parsed phone
+    numbers.
+
+    >>> cache = LRUCache(max_size=2)
+    >>> cache.set('a', 1)
+    >>> cache.set('b', 2)
+    >>> cache.get('a')
+    1
+    >>> cache.set('c', 3)
+    >>> 'b' in cache
+    False
+
+    Kwargs:
+        max_size (int): The maximum number of items to keep in the cache. This
+            defaults to 128.
+
+    Attributes:
+        hits (int): The number of lookups that found their key.
+        misses (int): The number of lookups that didn't find their key.
+        evictions (int): The number of items that were evicted to make room
+            for newer ones.
+    """
+
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the value for the key, marking it as recently used.
+
+        Args:
+            key (object): The key to look up.
+
+        Kwargs:
+            default (object): Returned if the key isn't in the cache.
+
+        Returns:
+            object: The cached value or ``default``.
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data[key] = value
+            self.hits += 1
+
+            return value
+
+    def set(self, key, value):
+        """Store a value in the cache, evicting the oldest item if needed.
+
+        Args:
+            key (object): The key to store the value under.
+            value (object): The value to store.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Remove the key from the cache and return its value.
+
+        Args:
+            key (object): The key to remove.
+
+        Kwargs:
+            default (object): Returned if the key isn't in the cache.
+
+        Returns:
+            object: The removed value or ``default``.
+        """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        """Remove every item from the cache."""
+        with self._lock:
+            self._data.clear()
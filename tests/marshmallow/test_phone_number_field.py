@@ -3,12 +3,15 @@
 
 import pytest
 
-pytest.importorskip('phonenumber')
+pytest.importorskip('phonenumbers')
 
 from marshmallow import ValidationError
 from marshmallow.fields import String
 
-from fleaker.marshmallow import PhoneNumberField, Schema
+from fleaker.marshmallow import (
+    PhoneNumberField, Schema, normalize_phone_numbers
+)
+from fleaker.utils import LRUCache
 
 
 class PhoneNumberSchema(Schema):
@@ -59,3 +62,81 @@ def test_phone_number_early_exit(payload):
     deserialized = schema.dump(serialized).data
 
     assert not deserialized.get('phone')
+
+
+def test_phone_number_cache(monkeypatch):
+    """Ensure that formatted phone numbers are cached for their options."""
+    monkeypatch.setattr(PhoneNumberField, 'cache', LRUCache(max_size=10))
+    cache = PhoneNumberField.cache
+    schema = PhoneNumberSchema()
+
+    for number in ('1-412-422-9994', '1 (412) 422 9994', '+1 412 422 9994'):
+        assert schema.load({'phone': number}).data == {
+            'phone': '+1 412-422-9994'
+        }
+
+    # The first two numbers are the same once they're stripped
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert schema.dump({'phone': '14124229994'}).data == {
+        'phone': '+1 412-422-9994'
+    }
+    assert cache.hits == 2
+
+    # Other options are cached separately
+    strict = PhoneNumberSchema(context={'strict_phone_validation': True})
+
+    with pytest.raises(ValidationError):
+        strict.load({'phone': '1-412-422-9994'})
+
+    with pytest.raises(ValidationError):
+        strict.load({'phone': '1-412-422-9994'})
+
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_phone_number_options_follow_context():
+    """Ensure that the options are resolved again for a new context."""
+    schema = PhoneNumberSchema()
+    field = schema.fields['phone']
+    options = field.get_phone_options()
+
+    assert options[:3] == (False, False, 'US')
+    assert field.get_phone_options() is options
+
+    schema.context = {'region': 'GB'}
+
+    assert field.get_phone_options()[2] == 'GB'
+    assert schema.load({'phone': '020 7946 0018'}).data == {
+        'phone': '+44 20 7946 0018'
+    }
+
+
+@pytest.mark.parametrize('processes', (1, 2))
+def test_normalize_phone_numbers(processes):
+    """Ensure that many phone numbers can be normalized at once."""
+    values = [
+        '1-412-422-9994', None, '12-3', '(412) 422 9994', '', 'nope',
+        '1-412-422-9994', '+44 20 7946 0018', '+1-555-555-5555',
+    ]
+    formatted, errors = normalize_phone_numbers(
+        values, processes=processes, chunk_size=2
+    )
+
+    assert formatted == [
+        '+1 412-422-9994', None, None, '+1 412-422-9994', '', None,
+        '+1 412-422-9994', '+44 20 7946 0018', '+1 555-555-5555',
+    ]
+    assert errors == [
+        None, None, '12-3 is not a valid phone number.', None, None, None,
+        None, None, None,
+    ]
+
+    formatted, errors = normalize_phone_numbers(
+        values, region='GB', strict=True, processes=processes, chunk_size=2
+    )
+
+    assert formatted[7] == '+44 20 7946 0018'
+    assert errors[7] is None
+    assert formatted[0] is None and errors[0]
+    assert formatted[5] is None and errors[5]
+    assert errors[-1] == '+1-555-555-5555 is not a valid phone number.'
@@ -1,11 +1,18 @@
 # ~*~ coding: utf-8 ~*~
 """Unit tests for the base schema Fleaker provides."""
 
+import datetime
+
+import arrow
+import pendulum
 import pytest
 
-from marshmallow import ValidationError, fields
+from marshmallow import ValidationError, fields, validates_schema
 
-from fleaker.marshmallow import Schema
+from fleaker.marshmallow import (
+    ArrowField, ForeignKeyField, PendulumField, PhoneNumberField, Schema
+)
+from fleaker.marshmallow.compiled import CompiledMarshaller
 
 
 class SchemaTest(Schema):
@@ -73,3 +80,275 @@ def test_make_instance_fails():
     """Ensure that make_instance fail's if no model is specified."""
     with pytest.raises(AttributeError):
         SchemaTest.make_instance({'name': 'Bob Blah'})
+
+
+def _build_compiled_schemas(**options):
+    """Build a schema and its compiled copy with the same fields."""
+    class Thing(object):
+        def __init__(self, id):
+            self.id = id
+
+    class StockSchema(Schema):
+        name = fields.String()
+        nickname = fields.String(dump_to='nick', default='none')
+        count = fields.Integer()
+        total = fields.Integer(as_string=True)
+        price = fields.Decimal(as_string=True)
+        created = ArrowField()
+        modified = PendulumField(format='rfc')
+        day = fields.DateTime(format='%Y-%m-%d')
+        thing_id = ForeignKeyField()
+        phone = PhoneNumberField()
+        secret = fields.String(load_only=True)
+        upper = fields.Method('get_upper')
+
+        def get_upper(self, obj):
+            return obj['name'].upper()
+
+    class CompiledSchema(StockSchema):
+        class Meta:
+            compiled = True
+
+    rows = [
+        {
+            'name': 'Row {}'.format(idx),
+            'count': str(idx),
+            'total': idx,
+            'price': '{}.50'.format(idx),
+            'created': arrow.get(2017, 1, idx + 1, 3, 4, 5),
+            'modified': pendulum.parse(
+                '2017-02-0{}T10:00:00-05:00'.format(idx + 1)
+            ),
+            'day': datetime.datetime(2017, 3, idx + 1),
+            'thing': Thing(idx) if idx else None,
+            'phone': '(330) 828-614{}'.format(idx),
+            'secret': 'hidden',
+        }
+        for idx in range(5)
+    ]
+    rows[0]['nickname'] = 'first'
+    rows[1]['count'] = None
+
+    return (StockSchema(many=True, **options),
+            CompiledSchema(many=True, **options), rows)
+
+
+def test_compiled_schema_dumps_like_marshmallow():
+    """Ensure that compiled schemas dump the same data as Marshmallow does."""
+    stock, compiled, rows = _build_compiled_schemas()
+
+    assert isinstance(compiled._marshal, CompiledMarshaller)
+    assert not isinstance(stock._marshal, CompiledMarshaller)
+
+    dumped = compiled.dump(rows).data
+
+    assert dumped == stock.dump(rows).data
+    assert dumped[0]['nick'] == 'first'
+    assert dumped[1]['nick'] == 'none'
+    assert dumped[1]['count'] is None
+    assert dumped[2]['thing_id'] == 2
+    assert dumped[3]['phone'] == '+1 330-828-6143'
+    assert 'secret' not in dumped[0]
+
+    # Iterators, single objects, only and prefix work like they always do
+    assert compiled.dump(iter(rows)).data == dumped
+    assert compiled.dump(rows[2], many=False).data == dumped[2]
+
+    stock, compiled, rows = _build_compiled_schemas(
+        only=('name', 'created'), prefix='row_'
+    )
+
+    assert compiled.dump(rows).data == stock.dump(rows).data
+    assert set(compiled.dump(rows).data[0]) == {'row_name', 'row_created'}
+
+
+def test_compiled_schema_is_cached():
+    """Ensure that schemas are compiled once for each set of fields."""
+    _, compiled, rows = _build_compiled_schemas()
+    compiled.dump(rows)
+    plans = type(compiled)._compiled_plans
+
+    assert len(plans) == 1
+
+    type(compiled)(many=True).dump(rows)
+    assert len(plans) == 1
+
+    type(compiled)(many=True, exclude=('phone',)).dump(rows)
+    assert len(plans) == 2
+
+
+def test_compiled_schema_errors_like_marshmallow():
+    """Ensure that compiled schemas report errors like Marshmallow does."""
+    stock, compiled, rows = _build_compiled_schemas(strict=False)
+    rows[3]['count'] = 'nope'
+
+    result = compiled.dump(rows)
+
+    assert result.errors == stock.dump(rows).errors == {
+        3: {'count': ['Not a valid integer.']}
+    }
+    assert result.data == stock.dump(rows).data
+
+
+def test_compiled_schema_foreign_keys():
+    """Ensure that compiled schemas dump foreign keys from Peewee instances
+    without loading the related records.
+    """
+    peewee = pytest.importorskip('peewee')
+
+    class Owner(peewee.Model):
+        name = peewee.CharField()
+
+    class Pet(peewee.Model):
+        owner = peewee.ForeignKeyField(Owner, null=True)
+
+    class PetSchema(Schema):
+        id = fields.Integer()
+        owner_id = ForeignKeyField()
+
+        class Meta:
+            compiled = True
+
+    pets = [Pet(id=1, owner=5), Pet(id=2)]
+
+    assert PetSchema(many=True).dump(pets).data == [
+        {'id': 1, 'owner_id': 5},
+        {'id': 2, 'owner_id': None},
+    ]
+    assert 'owner' not in pets[0]._obj_cache
+
+
+def test_borrow_pools_schemas():
+    """Ensure that borrowed schemas are reused for the same arguments."""
+    with SchemaTest.borrow() as schema:
+        # Schemas that are in use are never handed out twice
+        with SchemaTest.borrow() as other:
+            assert other is not schema
+
+    with SchemaTest.borrow() as borrowed:
+        assert borrowed is schema or borrowed is other
+        assert borrowed.strict
+
+    with SchemaTest.borrow(context={'strict': False}) as borrowed:
+        assert borrowed is not schema and borrowed is not other
+        assert not borrowed.strict
+
+    with SchemaTest.borrow(strict=False) as borrowed:
+        assert not borrowed.strict
+
+    # Schemas with unhashable contexts are built every time
+    with SchemaTest.borrow(context={'ids': [1]}) as borrowed:
+        assert borrowed.context == {'ids': [1]}
+
+    with SchemaTest.borrow(context={'ids': [1]}) as other:
+        assert other is not borrowed
+
+
+def test_borrow_restores_context():
+    """Ensure that changes to a borrowed schema's context don't reach the
+    next borrower.
+    """
+    class CountingSchema(Schema):
+        name = fields.String()
+
+        @validates_schema
+        def count_loads(self, data):
+            self.context['loads'] = self.context.get('loads', 0) + 1
+
+    context = {'region': 'US'}
+
+    with CountingSchema.borrow(context=context) as schema:
+        schema.load({'name': 'Bob'})
+        assert schema.context == {'region': 'US', 'loads': 1}
+
+    assert context == {'region': 'US'}
+
+    with CountingSchema.borrow(context=context) as borrowed:
+        assert borrowed is schema
+        assert borrowed.context == {'region': 'US'}
+
+
+def test_make_instances():
+    """Ensure that many model instances can be made with one schema."""
+    peewee = pytest.importorskip('peewee')
+
+    class User(peewee.Model):
+        name = peewee.CharField(max_length=255)
+
+    class UserSchema(Schema):
+        name = fields.String()
+
+        class Meta:
+            model = User
+
+    users = UserSchema.make_instances([{'name': 'Bob'}, {'name': 'Alice'}])
+
+    assert [user.name for user in users] == ['Bob', 'Alice']
+    assert all(isinstance(user, User) for user in users)
+    assert UserSchema.make_instances([]) == []
+
+    with pytest.raises(ValidationError):
+        UserSchema.make_instances([{'name': 1}])
+
+    with pytest.raises(ValidationError):
+        UserSchema.make_instances([{'name': 'Bob'}, {'name': 'Al', 'id': 1}])
+
+    # Objects with invalid keys are never loaded, even when not strict
+    with pytest.raises(ValidationError) as exc:
+        UserSchema.make_instances([{'name': 'Bob'}, {'name': 'Al', 'id': 1}],
+                                  strict=False)
+
+    assert exc.value.messages == {1: {'id': ['Invalid field']}}
+
+    result = UserSchema(many=True, strict=False).load([{'id': 1}])
+
+    assert result.data is None
+    assert result.errors == {0: {'id': ['Invalid field']}}
+
+    with pytest.raises(AttributeError):
+        SchemaTest.make_instances([{'name': 'Bob Blah'}])
+
+
+def test_invalid_fields_many():
+    """Ensure that every object loaded at once is checked for invalid keys."""
+    class AliasSchema(Schema):
+        name = fields.String(load_from='fullName')
+
+    schema = AliasSchema(many=True)
+
+    assert schema.get_accepted_keys() == frozenset(['name', 'fullName'])
+
+    payload = [
+        {'name': 'Bob'},
+        {'fullName': 'Alice', 'age': 3, 'id': 1},
+        {'name': 'Eve'},
+        {'nope': True},
+    ]
+
+    with pytest.raises(ValidationError) as exc:
+        schema.load(payload)
+
+    assert exc.value.messages == {
+        1: {'age': ['Invalid field'], 'id': ['Invalid field']},
+        3: {'nope': ['Invalid field']},
+    }
+
+    class FlatAliasSchema(AliasSchema):
+        class Meta:
+            index_errors = False
+
+    with pytest.raises(ValidationError) as exc:
+        FlatAliasSchema(many=True).load(payload)
+
+    assert exc.value.messages == {
+        'age': ['Invalid field'], 'id': ['Invalid field'],
+        'nope': ['Invalid field'],
+    }
+
+    assert schema.load(payload[::2]).data == [{'name': 'Bob'}, {'name': 'Eve'}]
+    assert AliasSchema().load({'fullName': 'Alice'}).data == {'name': 'Alice'}
+
+    with pytest.raises(ValidationError) as exc:
+        AliasSchema().load({'name': 'Bob', 'age': 3})
+
+    assert exc.value.messages == {'age': ['Invalid field']}
@@ -43,3 +43,20 @@ def database(peewee_app):
         os.remove(SQLITE_DATABASE_NAME)
     except Exception:
         pass
+
+
+@pytest.fixture
+def queries(database, monkeypatch):
+    """Fixture that records the SQL of every query run against the database.
+    """
+    sql_log = []
+    real_database = database.database.obj
+    execute_sql = real_database.execute_sql
+
+    def tracked_execute_sql(sql, *args, **kwargs):
+        sql_log.append(sql)
+        return execute_sql(sql, *args, **kwargs)
+
+    monkeypatch.setattr(real_database, 'execute_sql', tracked_execute_sql)
+
+    return sql_log
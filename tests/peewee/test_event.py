@@ -1,11 +1,18 @@
 """Unit tests for the Event mixin."""
 
+import threading
+
 import peewee
 import pytest
 
+from flask import Flask
 from flask_login import UserMixin, current_user, login_user
 
-from fleaker.peewee import EventStorageMixin, EventMixin
+from fleaker.peewee import (
+    AsyncEventWriter, EventSink, EventStorageMixin, EventMixin, JSONField,
+    Model
+)
+from fleaker.utils import LRUCache
 
 from .conftest import login_manager
 
@@ -271,6 +278,33 @@ def models(database):
     return None
 
 
+@pytest.fixture
+def bulk_models(models, database):
+    """Fixture that provides a Folder model with Fleaker's bulk saves, and
+    the model that stores its Events.
+    """
+    class BulkFolder(Folder, Model):
+        """A folder that can be saved in bulk."""
+
+    class BulkEvent(EventStorageMixin):
+        """Model that tracks the Events of bulk saved folders."""
+        bulkfolder = peewee.ForeignKeyField(BulkFolder, null=True,
+                                            related_name='events')
+        created_by = peewee.ForeignKeyField(User, null=True,
+                                            related_name='bulk_events')
+
+        class Meta:
+            order_by = ('-id',)
+            event_codes = Event._meta.event_codes
+
+    for model in (BulkFolder, BulkEvent):
+        model._meta.database = database.database
+        model._meta.event_model = BulkEvent
+        model.create_table(True)
+
+    return BulkFolder, BulkEvent
+
+
 @pytest.fixture
 def logged_in_user(models):
     """Fixture that will setup the models, create a user, and log them in."""
@@ -403,3 +437,460 @@ def test_rename_user(logged_in_user):
     assert event.code == 'USER_RENAMED'
     assert event.meta['user']['og_name'] == 'Tom Hanks'
     assert event.meta['user']['new_name'] == 'Nick Cage'
+
+
+def test_event_sink_writes_on_exit(logged_in_user):
+    """Ensure that Events are collected by the sink and written on exit."""
+    etc_folder = Folder(name='ETC', created_by=current_user.id)
+    etc_folder.save()
+    root_folder = Folder(name='root', created_by=current_user.id)
+    root_folder.save()
+
+    with EventSink() as sink:
+        etc_folder.name = 'etc'
+        etc_folder.parent_folder = root_folder
+        etc_folder.save()
+
+        assert len(sink) == 2
+        assert etc_folder.events.count() == 1
+
+        # Later changes to the instance must not leak into pending Events
+        etc_folder.name = 'changed'
+
+    assert EventSink.get_current() is None
+    assert etc_folder.events.count() == 3
+
+    renamed = etc_folder.events.where(Event.code == 'FOLDER_RENAMED').get()
+    assert renamed.updated['name'] == 'etc'
+    assert renamed.original['name'] == 'ETC'
+    assert renamed.formatted_message == "Tom Hanks renamed ETC to etc."
+
+    moved = etc_folder.events.where(Event.code == 'FOLDER_MOVED').get()
+    assert moved.formatted_message == (
+        "Tom Hanks moved etc from the root to root."
+    )
+
+
+def test_event_sink_discards_on_error(logged_in_user):
+    """Ensure that the sink doesn't write anything if an error is raised."""
+    with pytest.raises(RuntimeError):
+        with EventSink():
+            Folder(name='tmp', created_by=current_user.id).save()
+
+            raise RuntimeError()
+
+    assert EventSink.get_current() is None
+    assert Event.select().where(Event.code == 'FOLDER_CREATED').count() == 0
+
+
+def test_event_sink_validates_codes(logged_in_user):
+    """Ensure that Event codes are validated before a bulk write."""
+    sink = EventSink()
+    sink.add(Event(code='FOLDER_CREATED', updated={}),
+             Event(code='THIS_IS_NOT_VALID', updated={}))
+
+    with pytest.raises(ValueError):
+        sink.flush()
+
+    assert Event.select().where(Event.code == 'FOLDER_CREATED').count() == 0
+
+
+def test_batch_events_meta(logged_in_user, monkeypatch):
+    """Ensure that Meta.batch_events writes Events through a sink."""
+    monkeypatch.setattr(Folder._meta, 'batch_events', True)
+    flushed = []
+    flush = EventSink.flush
+
+    def tracked_flush(self):
+        flushed.append(len(self))
+        return flush(self)
+
+    monkeypatch.setattr(EventSink, 'flush', tracked_flush)
+
+    folder = Folder(name='ETC', created_by=current_user.id)
+    folder.save()
+    parent = Folder(name='root', created_by=current_user.id)
+    parent.save()
+
+    folder.name = 'etc'
+    folder.parent_folder = parent
+    folder.save()
+
+    assert flushed == [1, 1, 2]
+    assert folder.events.count() == 3
+
+
+def test_event_sink_per_request(logged_in_user):
+    """Ensure the request scoped sink writes Events after the view."""
+    app = Flask(__name__)
+    login_manager.init_app(app)
+    EventSink.init_app(app)
+
+    @app.route('/folders', methods=['POST'])
+    def create_folder():
+        Folder(name='opt', created_by=logged_in_user.id).save()
+        assert len(EventSink.get_current()) == 1
+        query = Event.select().where(Event.code == 'FOLDER_CREATED')
+        assert not query.exists()
+
+        return ''
+
+    @app.route('/fail', methods=['POST'])
+    def fail():
+        Folder(name='srv', created_by=logged_in_user.id).save()
+        raise RuntimeError()
+
+    client = app.test_client()
+
+    assert client.post('/folders').status_code == 200
+    assert EventSink.get_current() is None
+    assert Event.select().where(Event.code == 'FOLDER_CREATED').count() == 1
+
+    assert client.post('/fail').status_code == 500
+    assert EventSink.get_current() is None
+    assert Event.select().where(Event.code == 'FOLDER_CREATED').count() == 1
+
+
+def test_snapshot_original(logged_in_user, queries, monkeypatch):
+    """Ensure the original is built from a snapshot instead of a query."""
+    monkeypatch.setattr(Folder._meta, 'snapshot_original', True)
+
+    root_folder = Folder(name='root', created_by=current_user.id)
+    root_folder.save()
+    Folder(name='ETC', created_by=current_user.id).save()
+
+    etc_folder = Folder.select().where(Folder.name == 'ETC').get()
+    del queries[:]
+
+    etc_folder.name = 'etc'
+    etc_folder.save()
+
+    assert not [sql for sql in queries
+                if sql.startswith('SELECT') and '"folder"' in sql]
+
+    event = etc_folder.events.get()
+    assert event.code == 'FOLDER_RENAMED'
+    assert event.original['name'] == 'ETC'
+    assert event.updated['name'] == 'etc'
+    assert event.formatted_message == "Tom Hanks renamed ETC to etc."
+
+    # The snapshot is refreshed after every save
+    etc_folder.parent_folder = root_folder
+    etc_folder.save()
+
+    event = etc_folder.events.get()
+    assert event.code == 'FOLDER_MOVED'
+    assert event.original['name'] == 'etc'
+    assert event.formatted_message == (
+        "Tom Hanks moved etc from the root to root."
+    )
+
+
+def test_snapshot_json_field_changed_in_place(logged_in_user, database,
+                                              monkeypatch):
+    """Ensure that JSON values changed in place are compared against
+    a snapshot that didn't change with them.
+    """
+    class Settings(EventMixin):
+        created_by = peewee.ForeignKeyField(User, null=False)
+        data = JSONField(default=dict)
+
+        class Meta:
+            snapshot_original = True
+            update_messages = {
+                'data': {
+                    'code': 'SETTINGS_CHANGED',
+                    'message': "{{event.created_by.name}} changed settings.",
+                    'meta': {},
+                },
+            }
+
+    Settings._meta.database = database.database
+    Settings._meta.event_model = Event
+    Settings.create_table(True)
+    monkeypatch.setattr(
+        Event._meta, 'event_codes',
+        Event._meta.event_codes + ('SETTINGS_CHANGED',)
+    )
+
+    settings = Settings(created_by=current_user.id, data={'theme': 'light'})
+    settings.save()
+    settings = Settings.get(Settings.id == settings.id)
+
+    settings.data['theme'] = 'dark'
+    settings.save()
+
+    event = (Event.select()
+             .where(Event.code == 'SETTINGS_CHANGED')
+             .get())
+
+    assert event.original['data'] == {'theme': 'light'}
+    assert event.updated['data'] == {'theme': 'dark'}
+
+
+@pytest.mark.parametrize('snapshot_original', (False, True))
+def test_lazy_json_field_read_is_not_changed(logged_in_user, database,
+                                             monkeypatch, snapshot_original):
+    """Ensure that lazy JSON values that are read but not changed don't
+    create update Events.
+    """
+    class LazySettings(EventMixin, Model):
+        created_by = peewee.ForeignKeyField(
+            User, null=False,
+            related_name='lazy_settings_{}'.format(snapshot_original)
+        )
+        name = peewee.CharField(max_length=255, default='')
+        data = JSONField(lazy=True)
+
+        class Meta:
+            update_messages = {
+                'data': {
+                    'code': 'SETTINGS_CHANGED',
+                    'message': "{{event.created_by.name}} changed settings.",
+                    'meta': {},
+                },
+            }
+
+    LazySettings._meta.database = database.database
+    LazySettings._meta.event_model = Event
+    LazySettings._meta.snapshot_original = snapshot_original
+    LazySettings.create_table(True)
+    monkeypatch.setattr(
+        Event._meta, 'event_codes',
+        Event._meta.event_codes + ('SETTINGS_CHANGED',)
+    )
+
+    settings = LazySettings(created_by=current_user.id,
+                            data={'theme': 'light'})
+    settings.save()
+    query = Event.select().where(Event.code == 'SETTINGS_CHANGED')
+
+    # Saved without reading the value
+    settings = LazySettings.get(LazySettings.id == settings.id)
+    settings.name = 'unread'
+    settings.save()
+
+    assert not query.count()
+
+    # Saved after reading the value
+    settings = LazySettings.get(LazySettings.id == settings.id)
+
+    assert settings.data == {'theme': 'light'}
+
+    settings.name = 'read'
+    settings.save()
+
+    assert not query.count()
+
+    settings.data = {'theme': 'dark'}
+    settings.save()
+
+    assert query.count() == 1
+
+
+def test_async_event_writer(logged_in_user, monkeypatch):
+    """Ensure the writer writes Events in a background thread."""
+    writer = AsyncEventWriter(batch_size=2, flush_interval=0.01)
+    monkeypatch.setattr(Folder._meta, 'event_writer', writer)
+
+    try:
+        for name in ('bin', 'etc', 'usr'):
+            Folder(name=name, created_by=current_user.id).save()
+
+        assert writer.running
+
+        writer.flush()
+
+        query = Event.select().where(Event.code == 'FOLDER_CREATED')
+        assert query.count() == 3
+        assert writer.written == 3
+        assert writer.dropped == writer.failed == 0
+        assert sorted(event.folder.name for event in query) == [
+            'bin', 'etc', 'usr'
+        ]
+    finally:
+        writer.stop()
+
+    assert not writer.running
+
+
+def test_async_event_writer_transaction(logged_in_user, database,
+                                       monkeypatch):
+    """Ensure Events created in a transaction are written in it."""
+    writer = AsyncEventWriter()
+    monkeypatch.setattr(Folder._meta, 'event_writer', writer)
+    query = Event.select().where(Event.code == 'FOLDER_CREATED')
+
+    with pytest.raises(RuntimeError):
+        with database.database.atomic():
+            Folder(name='tmp', created_by=current_user.id).save()
+            raise RuntimeError()
+
+    assert not query.count()
+
+    with database.database.atomic():
+        Folder(name='var', created_by=current_user.id).save()
+
+    assert not writer.running
+    assert [event.folder.name for event in query] == ['var']
+
+
+def test_async_event_writer_validates_codes(logged_in_user):
+    """Ensure invalid Events are reported to the caller right away."""
+    writer = AsyncEventWriter()
+
+    with pytest.raises(ValueError):
+        writer.write([Event(code='THIS_IS_NOT_VALID', updated={})])
+
+    assert not writer.running
+
+
+def test_async_event_writer_synchronous(logged_in_user, monkeypatch):
+    """Ensure the synchronous fallback writes Events in the calling thread."""
+    app = Flask(__name__)
+    app.testing = True
+    writer = AsyncEventWriter()
+    writer.init_app(app)
+    monkeypatch.setattr(Folder._meta, 'event_writer', writer)
+
+    Folder(name='opt', created_by=current_user.id).save()
+
+    assert not writer.running
+    assert writer.written == 1
+    assert Event.select().where(Event.code == 'FOLDER_CREATED').count() == 1
+
+
+def test_async_event_writer_overflow(logged_in_user, monkeypatch):
+    """Ensure the overflow policies are respected when the queue is full."""
+    with pytest.raises(ValueError):
+        AsyncEventWriter(overflow='explode')
+
+    writer = AsyncEventWriter(max_size=1, overflow='drop')
+    # Keep the background thread from consuming the queue
+    blocker = threading.Event()
+    monkeypatch.setattr(writer, '_run', blocker.wait)
+
+    try:
+        events = [Event(code='FOLDER_CREATED', updated={}) for _ in range(3)]
+        writer.write(events)
+
+        assert writer.dropped == 2
+
+        writer.overflow = 'sync'
+        writer.write(events)
+
+        assert writer.written == 3
+        query = Event.select().where(Event.code == 'FOLDER_CREATED')
+        assert query.count() == 3
+    finally:
+        blocker.set()
+
+
+def test_meta_resolvers_are_cached(logged_in_user):
+    """Ensure the meta of the messages in Meta is only parsed once."""
+    resolvers = Folder.get_meta_resolvers()
+
+    assert Folder.get_meta_resolvers() is resolvers
+
+    for meta in (Folder._meta.create_message['meta'],
+                 Folder._meta.delete_message['meta'],
+                 Folder._meta.update_messages['name']['meta']):
+        assert resolvers[id(meta)][0] is meta
+
+
+def test_meta_foreign_key_ids_are_not_queried(logged_in_user, queries):
+    """Ensure paths ending in a foreign key's ID don't load the relation."""
+    root_folder = Folder(name='root', created_by=current_user.id)
+    root_folder.save()
+    Folder(
+        name='etc',
+        parent_folder=root_folder,
+        created_by=current_user.id
+    ).save()
+
+    etc_folder = Folder.select().where(Folder.name == 'etc').get()
+    del queries[:]
+
+    meta = etc_folder.parse_meta({
+        'parent': {'id': 'parent_folder.id'},
+        'user': {'id': 'created_by.id', 'name': 'current_user.name'},
+        'missing': 'parent_folder.parent_folder.name',
+    })
+
+    assert meta == {
+        'parent': {'id': root_folder.id},
+        'user': {'id': logged_in_user.id, 'name': 'Tom Hanks'},
+        'missing': None,
+    }
+    assert len(queries) == 1
+    assert '"folder"' in queries[0]
+
+
+def test_render_messages(logged_in_user, monkeypatch):
+    """Ensure many messages can be rendered with cached templates."""
+    monkeypatch.setattr(Event, 'template_cache', LRUCache(max_size=8))
+
+    for name in ('bin', 'etc', 'usr'):
+        Folder(name=name, created_by=current_user.id).save()
+
+    events = list(Event.select().where(Event.code == 'FOLDER_CREATED'))
+    messages = Event.render_messages(events)
+
+    assert messages == [
+        "Tom Hanks created usr in the root.",
+        "Tom Hanks created etc in the root.",
+        "Tom Hanks created bin in the root.",
+    ]
+    assert [event.formatted_message for event in events] == messages
+
+    # The template was compiled once and reused for the other Events
+    assert len(Event.template_cache) == 1
+    assert Event.template_cache.misses == 1
+    assert Event.template_cache.hits == 2
+
+    event = Event.select().where(Event.code == 'FOLDER_CREATED').get()
+    assert event.formatted_message == "Tom Hanks created usr in the root."
+    assert Event.template_cache.hits == 3
+
+
+def test_bulk_create_and_update_events(logged_in_user, bulk_models,
+                                       queries):
+    """Ensure bulk saves create their Events with one INSERT."""
+    BulkFolder, _ = bulk_models
+    del queries[:]
+    folders = BulkFolder.bulk_create([
+        BulkFolder(name='folder {}'.format(idx), created_by=logged_in_user.id)
+        for idx in range(3)
+    ])
+
+    event_inserts = [sql for sql in queries
+                     if sql.startswith('INSERT INTO "bulkevent"')]
+
+    assert len(event_inserts) == 1
+
+    for folder in folders:
+        event = folder.events.get()
+
+        assert event.code == 'FOLDER_CREATED'
+        assert event.updated['name'] == folder.name
+
+    for folder in folders:
+        folder.name = folder.name.upper()
+
+    del queries[:]
+    BulkFolder.bulk_update(folders, ['name'])
+
+    selects = [sql for sql in queries if sql.startswith('SELECT')]
+    event_inserts = [sql for sql in queries
+                     if sql.startswith('INSERT INTO "bulkevent"')]
+
+    # The originals are loaded with one query
+    assert len(selects) == 1
+    assert len(event_inserts) == 1
+
+    for folder in folders:
+        event = folder.events.get()
+
+        assert event.code == 'FOLDER_RENAMED'
+        assert event.original['name'] == folder.name.lower()
+        assert event.updated['name'] == folder.name
@@ -63,3 +63,72 @@ def test_signature_functionality(folder_model):
     etc_folder.archive_instance()
 
     assert etc_folder.signature is None
+
+
+def test_signature_only_updated_when_stale(folder_model, monkeypatch):
+    """Ensure that the signature is only recomputed when the fields it's
+    computed from change.
+    """
+    etc_folder = folder_model(name='etc')
+    etc_folder.save()
+    apt_folder = folder_model(name='apt', parent_folder=etc_folder)
+    apt_folder.save()
+
+    loaded = folder_model.get(folder_model.id == apt_folder.id)
+
+    # Related records are hashed by their primary key, so loaded records
+    # have the same signature
+    assert not loaded.signature_is_stale()
+    assert loaded.compute_signature(loaded._get_signature_values()) == (
+        apt_folder.signature
+    )
+
+    computed = []
+    compute_signature = folder_model.compute_signature
+
+    def tracked_compute_signature(cls, values):
+        computed.append(values)
+        return compute_signature(values)
+
+    monkeypatch.setattr(folder_model, 'compute_signature',
+                        classmethod(tracked_compute_signature))
+
+    loaded.save()
+
+    assert not computed
+
+    loaded.name = 'dpkg'
+    loaded.save()
+
+    assert len(computed) == 1
+    assert loaded.signature != apt_folder.signature
+
+
+def test_find_existing(folder_model, queries):
+    """Ensure that existing records are found with one query."""
+    etc_folder = folder_model(name='etc')
+    etc_folder.save()
+    apt_folder = folder_model(name='apt', parent_folder=etc_folder)
+    apt_folder.save()
+
+    rows = [
+        {'name': 'apt', 'parent_folder': etc_folder.id},
+        {'name': 'etc', 'parent_folder': None},
+        {'name': 'apt', 'parent_folder': None},
+        {'name': 'etc', 'parent_folder': etc_folder},
+    ]
+
+    assert folder_model.compute_signatures(rows)[:2] == [
+        apt_folder.signature, etc_folder.signature
+    ]
+    assert folder_model.compute_signatures([etc_folder]) == [
+        etc_folder.signature
+    ]
+
+    del queries[:]
+    existing = folder_model.find_existing(rows)
+
+    assert len(queries) == 1
+    assert [folder and folder.id for folder in existing] == [
+        apt_folder.id, etc_folder.id, None, None
+    ]
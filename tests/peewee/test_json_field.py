@@ -1,14 +1,18 @@
 # ~*~ coding: utf-8 ~*~
 """Unit tests for the JSONField."""
 
+import json
+
 from collections import OrderedDict
 
+import flask.json
 import peewee
 import pytest
 
+from simplejson import RawJSON
 from werkzeug.datastructures import ImmutableDict
 
-from fleaker.peewee import JSONField
+from fleaker.peewee import JSONField, Model
 
 
 @pytest.mark.parametrize('value,kwargs,dict_type', (
@@ -52,3 +56,203 @@ def test_json_field(database, value, kwargs, dict_type):
 
     assert isinstance(queried_instance.data, dict_type)
     assert queried_instance.data == value
+
+
+def test_lazy_json_field(database, monkeypatch):
+    """Ensure that lazy JSONFields only decode the values that are accessed,
+    and only once.
+    """
+    class LazyJSONModel(Model):
+        data = JSONField(lazy=True, ordered=True)
+
+    LazyJSONModel._meta.database = database.database
+    LazyJSONModel.create_table(True)
+
+    LazyJSONModel.create(data={'key': 'value', 'int': 3})
+    LazyJSONModel.create(data=None)
+
+    decoded = []
+    decode = JSONField.decode
+
+    def tracked_decode(self, value):
+        decoded.append(value)
+        return decode(self, value)
+
+    monkeypatch.setattr(JSONField, 'decode', tracked_decode)
+
+    instance, empty = LazyJSONModel.select().order_by(LazyJSONModel.id)
+
+    assert not decoded
+
+    # The raw text can be encoded without decoding it
+    raw = LazyJSONModel.data.get_raw_json(instance)
+
+    assert isinstance(raw, RawJSON)
+    assert json.loads(flask.json.dumps({'data': raw})) == {
+        'data': {'key': 'value', 'int': 3}
+    }
+    assert not decoded
+
+    # The value is decoded once, when it's accessed
+    assert instance.data == {'key': 'value', 'int': 3}
+    assert isinstance(instance.data, OrderedDict)
+    assert instance.data is instance.data
+    assert len(decoded) == 1
+
+    # Rows that were never decoded are saved as they were loaded
+    assert empty.data is None
+
+    empty.data = LazyJSONModel.data.get_raw_json(instance)
+    empty.save()
+
+    assert LazyJSONModel.get(id=empty.id).data == instance.data
+
+    # Rows that aren't model instances hold the decoded values
+    query = LazyJSONModel.select().order_by(LazyJSONModel.id)
+
+    assert [row['data'] for row in query.dicts()] == [instance.data] * 2
+    assert isinstance(query.dicts()[0]['data'], OrderedDict)
+    assert [row[1] for row in query.tuples()] == [instance.data] * 2
+    assert query.namedtuples()[0].data == instance.data
+    assert query.as_records()[0].data == instance.data
+
+    # Instances loaded through joins keep the values as well
+    del decoded[:]
+    other = LazyJSONModel.alias()
+    joined = (LazyJSONModel.select(LazyJSONModel, other.data)
+              .join(other, on=(other.id == LazyJSONModel.id))
+              .order_by(LazyJSONModel.id))
+    instance = list(joined)[0]
+
+    assert isinstance(instance._data['data'], RawJSON)
+    assert not decoded
+
+
+def test_json_field_reuses_loaded_text(database, monkeypatch):
+    """Ensure that values that can't have changed since they were loaded are
+    saved without being encoded again.
+    """
+    class StoredJSONModel(peewee.Model):
+        frozen = JSONField(immutable=True)
+        mutable = JSONField(compact=True, sort_keys=False)
+
+    StoredJSONModel._meta.database = database.database
+    StoredJSONModel.create_table(True)
+
+    instance = StoredJSONModel.create(
+        frozen=OrderedDict([('b', 1), ('a', {'nested': 'value'})]),
+        mutable=OrderedDict([('b', [1, 2]), ('a', 'value')]),
+    )
+    raw = database.database.execute_sql(
+        'SELECT frozen, mutable FROM storedjsonmodel'
+    ).fetchone()
+
+    assert raw[1] == '{"b":[1,2],"a":"value"}'
+
+    encoded = []
+    dumps = flask.json.dumps
+
+    def tracked_dumps(value, **kwargs):
+        encoded.append(value)
+        return dumps(value, **kwargs)
+
+    monkeypatch.setattr(flask.json, 'dumps', tracked_dumps)
+
+    instance = StoredJSONModel.get(id=instance.id)
+
+    assert StoredJSONModel.frozen.db_value(instance.frozen) == raw[0]
+    assert not encoded
+
+    # Mutable values may have been changed in place
+    instance.mutable['b'].append(3)
+
+    assert StoredJSONModel.mutable.db_value(instance.mutable) == (
+        '{"b":[1,2,3],"a":"value"}'
+    )
+    assert encoded == [instance.mutable]
+
+    # Equal values that weren't loaded are encoded
+    StoredJSONModel.frozen.db_value(ImmutableDict(instance.frozen))
+
+    assert len(encoded) == 2
+
+
+def test_immutable_json_field_is_not_dirty(database):
+    """Ensure that immutable JSONField values aren't saved unless they're
+    set.
+    """
+    class FrozenJSONModel(Model):
+        frozen = JSONField(immutable=True)
+        mutable = JSONField(null=True)
+
+    FrozenJSONModel._meta.database = database.database
+    FrozenJSONModel.create_table(True)
+
+    instance = FrozenJSONModel.create(frozen={'key': 'value'})
+    instance = FrozenJSONModel.get(id=instance.id)
+
+    assert not instance.is_dirty()
+
+    instance.mutable = {'key': 'value'}
+
+    assert instance.dirty_fields == [FrozenJSONModel.mutable]
+
+
+def test_json_path_queries(database):
+    """Ensure that values inside JSONFields can be queried and indexed."""
+    class PathJSONModel(peewee.Model):
+        meta = JSONField()
+
+    PathJSONModel._meta.database = database.database
+    PathJSONModel.create_table(True)
+
+    first = PathJSONModel.create(meta={'user': {'id': 5}, 'tags': ['a', 'b']})
+    PathJSONModel.create(meta={'user': {'id': 6}, 'tags': ['b']})
+
+    user_id = PathJSONModel.meta['user']['id']
+
+    assert [row.id for row in
+            PathJSONModel.select().where(user_id == 5)] == [first.id]
+    assert [row.id for row in PathJSONModel.select().where(
+        PathJSONModel.meta['tags'][1] == 'b'
+    )] == [first.id]
+
+    # Extracted values aren't decoded as JSON documents
+    assert list(PathJSONModel.select(user_id.cast('text')).order_by(
+        PathJSONModel.id
+    ).tuples()) == [('5',), ('6',)]
+
+    user_id.create_index()
+    query = PathJSONModel.select().where(user_id == 5)
+    sql, params = query.sql()
+    plan = database.database.execute_sql('EXPLAIN QUERY PLAN ' + sql, params)
+
+    assert user_id.get_index_name() == 'pathjsonmodel_meta_user_id'
+    assert 'pathjsonmodel_meta_user_id' in str(plan.fetchall())
+
+    user_id.drop_index()
+
+    with pytest.raises(ValueError):
+        PathJSONModel.meta["it's"]
+
+    with pytest.raises(ValueError):
+        PathJSONModel.meta['user'].cast('text; DROP TABLE')
+
+
+def test_postgres_json_path():
+    """Ensure that JSON paths are extracted with ->> on Postgres."""
+    class PostgresJSONModel(peewee.Model):
+        meta = JSONField()
+
+        class Meta:
+            database = peewee.PostgresqlDatabase('fleaker')
+
+    query = PostgresJSONModel.select().where(
+        PostgresJSONModel.meta['user'][0]['id'].cast('integer') == 5
+    )
+
+    assert query.sql() == (
+        'SELECT "t1"."id", "t1"."meta" FROM "postgresjsonmodel" AS t1 '
+        'WHERE (CAST((CAST("t1"."meta" AS jsonb)->\'user\'->0->>\'id\') '
+        'AS integer) = %s)', [5]
+    )
@@ -1,13 +1,22 @@
 """Unit tests for the base Peewee Model."""
 
+import datetime
+import json
+
+import arrow
 import peewee
 import pytest
 
+from marshmallow import fields
 from playhouse.fields import PasswordField
 from playhouse.signals import post_save, pre_save
 
 from fleaker._compat import exception_message
-from fleaker.peewee import Model
+from fleaker.marshmallow import Schema
+from fleaker.peewee import (
+    ArrowDateTimeField, CreatedModifiedMixin, FieldSignatureMixin, JSONField,
+    Model, Record
+)
 from tests.constants import SQLITE_DATABASE_NAME
 
 
@@ -111,3 +120,238 @@ def test_get_model(user_model):
 
     with pytest.raises(peewee.DoesNotExist):
         user_model.get_by_id(inactive_user.id)
+
+
+@pytest.fixture
+def folder_model(database):
+    """Fixture that provides a model using the timestamp and signature
+    mixins.
+    """
+    class BulkFolder(FieldSignatureMixin, CreatedModifiedMixin, Model):
+        name = peewee.CharField(max_length=255, null=False)
+        parent_id = peewee.IntegerField(null=True)
+
+        class Meta:
+            signature_fields = ('name', 'parent_id')
+
+    BulkFolder._meta.database = database.database
+    BulkFolder.create_table(True)
+
+    yield BulkFolder
+
+    BulkFolder.drop_table()
+
+
+def test_bulk_create(folder_model, queries):
+    """Ensure bulk_create inserts in chunks and keeps the mixins working."""
+    saved = []
+
+    @post_save(sender=folder_model)
+    def remember_bulk_created(sender, instance, created):
+        saved.append((instance.id, created))
+
+    try:
+        folders = folder_model.bulk_create(
+            [folder_model(name='folder {}'.format(idx)) for idx in range(5)] +
+            [folder_model(name='nested', parent_id=1)],
+            chunk_size=2,
+        )
+    finally:
+        post_save.disconnect(remember_bulk_created)
+
+    inserts = [sql for sql in queries if sql.startswith('INSERT')]
+
+    # The rows with a parent are inserted separately from those without
+    assert len(inserts) == 4
+    assert saved == [(folder.id, True) for folder in folders]
+    assert not any(folder.is_dirty() for folder in folders)
+
+    # The whole batch shares one timestamp
+    assert len(set(folder.created for folder in folders)) == 1
+
+    for folder in folders:
+        fresh = folder_model.get_by_id(folder.id)
+
+        assert fresh.name == folder.name
+        assert fresh.signature == folder.signature
+        assert fresh.created == folder.created
+        assert fresh.modified is None
+
+    assert folder_model.select().count() == 6
+
+    # Created times that were set explicitly are kept, like save keeps them
+    backfilled = datetime.datetime(2016, 12, 13, 2, 9, 48)
+    imported, stamped = folder_model.bulk_create([
+        folder_model(name='imported', created=backfilled),
+        folder_model(name='stamped'),
+    ])
+
+    assert imported.created == backfilled
+    assert folder_model.get_by_id(imported.id).created == backfilled
+    assert stamped.created != backfilled
+
+    # Signatures are still enforced
+    with pytest.raises(peewee.IntegrityError):
+        folder_model.bulk_create([folder_model(name='folder 0')])
+
+    assert folder_model.select().count() == 8
+
+
+def test_bulk_update(folder_model, queries):
+    """Ensure bulk_update uses one UPDATE per chunk and keeps the mixins
+    working.
+    """
+    folders = folder_model.bulk_create(
+        [folder_model(name='folder {}'.format(idx)) for idx in range(5)]
+    )
+    other = folder_model(name='other')
+    other.save()
+
+    for folder in folders:
+        folder.name = folder.name.upper()
+
+    del queries[:]
+    rows = folder_model.bulk_update(folders, [folder_model.name],
+                                    chunk_size=3)
+
+    updates = [sql for sql in queries if sql.startswith('UPDATE')]
+
+    assert rows == 5
+    assert len(updates) == 2
+
+    modified = folders[0].modified
+
+    assert modified
+    assert all(folder.modified == modified for folder in folders)
+
+    for folder in folders:
+        fresh = folder_model.get_by_id(folder.id)
+
+        assert fresh.name == folder.name
+        assert fresh.name.startswith('FOLDER')
+        assert fresh.signature == folder.signature
+        assert fresh.modified == modified
+
+    assert folder_model.get_by_id(other.id).modified is None
+
+    with pytest.raises(AttributeError):
+        folder_model.bulk_update(folders, ['not_present'])
+
+
+def test_update_instance_only_writes_changes(folder_model, queries):
+    """Ensure saves only write the changed fields and are skipped when
+    nothing changed.
+    """
+    folder = folder_model(name='etc')
+    folder.save()
+
+    assert not folder.dirty_fields
+
+    del queries[:]
+    folder.update_instance({'name': 'etc', 'parent_id': None})
+
+    # Nothing changed, so nothing was written and modified wasn't set
+    assert not queries
+    assert folder.modified is None
+
+    folder.parent_id = 5
+
+    assert folder.dirty_fields == [folder_model.parent_id]
+
+    folder.save()
+    update = [sql for sql in queries if sql.startswith('UPDATE')][0]
+
+    assert '"parent_id"' in update
+    assert '"modified"' in update
+    assert '"signature"' in update
+    assert '"name"' not in update
+    assert folder_model.get_by_id(folder.id).parent_id == 5
+
+
+def test_stream_json(peewee_app, folder_model):
+    """Ensure that queries are streamed from the cursor without caching
+    the rows.
+    """
+    class FolderSchema(Schema):
+        id = fields.Integer()
+        name = fields.String()
+
+    folder_model.bulk_create([folder_model(name='folder{}'.format(idx))
+                              for idx in range(5)])
+    query = folder_model.base_query().order_by(folder_model.id)
+
+    response = peewee_app.stream_json(query, FolderSchema, chunk_size=2)
+    data = json.loads(response.get_data(as_text=True))
+
+    assert [row['name'] for row in data] == [
+        'folder{}'.format(idx) for idx in range(5)
+    ]
+    assert set(data[0]) == {'id', 'name'}
+    # The rows were read with .iterator(), so the query didn't cache them
+    assert query._qr is None or not query._qr._result_cache
+
+
+def test_stream_json_response(peewee_app, database, folder_model):
+    """Ensure that streamed queries are read while the request's database
+    connection is still open.
+    """
+    class FolderSchema(Schema):
+        id = fields.Integer()
+        name = fields.String()
+
+    @peewee_app.route('/folders')
+    def list_folders():
+        query = folder_model.base_query().order_by(folder_model.id)
+        return peewee_app.stream_json(query, FolderSchema, chunk_size=2)
+
+    folder_model.bulk_create([folder_model(name='folder{}'.format(idx))
+                              for idx in range(5)])
+
+    # The request opens and closes its own connection
+    database.database.close()
+    response = peewee_app.test_client().get('/folders')
+
+    assert response.status_code == 200
+    assert [row['name'] for row in json.loads(response.data)] == [
+        'folder{}'.format(idx) for idx in range(5)
+    ]
+
+
+def test_as_records(peewee_app, database):
+    """Ensure that queries can return lightweight records."""
+    class Report(Model):
+        name = peewee.CharField(max_length=255)
+        occurred = ArrowDateTimeField()
+        data = JSONField()
+
+    Report._meta.database = database.database
+    Report.create_table(True)
+
+    now = arrow.utcnow()
+    report = Report.create(name='daily', occurred=now, data={'rows': 5})
+    Report.create(name='weekly', occurred=now, data={'rows': 35})
+
+    records = list(Report.base_query().order_by(Report.id).as_records())
+    record = records[0]
+
+    assert isinstance(record, Record)
+    assert not hasattr(record, '__dict__')
+    assert record.id == report.id
+    assert record.name == 'daily'
+    assert record.occurred == now
+    assert isinstance(record.occurred, arrow.Arrow)
+    assert record.data == {'rows': 5}
+    assert record._fields == ('id', 'name', 'occurred', 'data')
+    assert type(records[1]) is type(record)
+
+    # Queries keep returning records as they're refined
+    query = Report.base_query().as_records()
+    weekly = query.where(Report.name == 'weekly').get()
+
+    assert weekly.data == {'rows': 35}
+    assert Report.select(Report.name).as_records().where(
+        Report.id == report.id
+    ).get()._asdict() == {'name': 'daily'}
+    assert isinstance(query.as_records(False).first(), Report)
+
+    assert json.loads(peewee_app.json.dumps(weekly))['name'] == 'weekly'
@@ -1,9 +1,14 @@
 """Unit tests for the SearchMixin."""
 
+import time
+
 import peewee
 import pytest
 
-from fleaker.peewee import SearchMixin
+from fleaker.peewee import (
+    FullTextSearchBackend, Model, SearchCache, SearchMixin,
+    TrigramSearchBackend
+)
 
 
 @pytest.fixture
@@ -73,3 +78,302 @@ def test_search_mixin_functionality(post_model):
     hacked_search = post_model.search('hacked', fields=('title',))
 
     assert hacked_search.count() == 1
+
+
+@pytest.fixture
+def fts_post_model(database):
+    """Fixture that provides a Post model that uses full text search."""
+    class FTSPost(SearchMixin, Model):
+        title = peewee.CharField(max_length=255, null=False)
+        body = peewee.TextField(null=False, default='')
+
+        class Meta:
+            search_fields = ('title', 'body')
+            search_backend = FullTextSearchBackend()
+
+    FTSPost._meta.database = database.database
+    FTSPost.create_table(True)
+    FTSPost.create_search_index()
+
+    yield FTSPost
+
+    FTSPost.drop_search_index()
+    FTSPost.drop_table()
+
+
+def test_full_text_search(fts_post_model):
+    """Ensure the full text search backend matches and ranks words."""
+    for title, body in (('Welcome!', 'Content'),
+                        ('Content is hard to write.', 'I am lazy.'),
+                        ('Hacked!', 'Some malcontent hacked this site!')):
+        fts_post_model(title=title, body=body).save()
+
+    content_query = fts_post_model.search('content')
+
+    # Full text search matches words, so 'malcontent' doesn't match
+    assert {post.title for post in content_query} == {
+        'Welcome!', 'Content is hard to write.'
+    }
+
+    # Words are matched as prefixes, in any order
+    assert [post.title for post in fts_post_model.search('writ hard')] == [
+        'Content is hard to write.'
+    ]
+
+    # Quotes and FTS syntax in the term are searched for literally
+    assert not list(fts_post_model.search('"hard" OR NEAR('))
+
+    hacked_search = fts_post_model.search('hacked', fields=('title',))
+
+    assert hacked_search.count() == 1
+
+    with pytest.raises(AttributeError):
+        fts_post_model.search('hacked', fields=('id',))
+
+
+def test_full_text_search_index_is_kept_in_sync(fts_post_model):
+    """Ensure saves and deletes update the full text search index."""
+    post = fts_post_model(title='Welcome!', body='Content')
+    post.save()
+
+    post.body = 'Nothing here'
+    post.save()
+
+    assert not list(fts_post_model.search('content'))
+    assert list(fts_post_model.search('nothing')) == [post]
+
+    post.delete_instance()
+
+    assert not list(fts_post_model.search('nothing'))
+
+    # Changes that don't send signals are picked up by a rebuild
+    fts_post_model.insert(title='Bulk', body='Inserted').execute()
+
+    assert not list(fts_post_model.search('bulk'))
+
+    fts_post_model.rebuild_search_index()
+
+    assert fts_post_model.search('bulk').get().body == 'Inserted'
+
+
+@pytest.fixture
+def trigram_user_model(database):
+    """Fixture that provides a User model that uses the n-gram index."""
+    class TrigramUser(SearchMixin, Model):
+        name = peewee.CharField(max_length=255, null=False)
+        email = peewee.CharField(max_length=255, null=True)
+
+        class Meta:
+            search_fields = ('name', 'email')
+            search_backend = TrigramSearchBackend()
+
+    TrigramUser._meta.database = database.database
+    TrigramUser.create_table(True)
+    TrigramUser.create_search_index()
+
+    yield TrigramUser
+
+    TrigramUser.drop_search_index()
+    TrigramUser.drop_table()
+
+
+def test_trigram_search_matches_like_search(trigram_user_model):
+    """Ensure the n-gram index finds the same records as LIKE does."""
+    for name, email in (('Johnny', 'johnny@example.com'),
+                        ('John', None),
+                        ('Elton John', 'elton@example.com'),
+                        ('Jane', 'jane@example.org')):
+        trigram_user_model(name=name, email=email).save()
+
+    like_backend = trigram_user_model._meta.search_backend.like
+
+    for term in ('John', 'jo', 'j', 'ohnn', 'example.org', 'nope', ''):
+        for fields in (('name', 'email'), ('email',)):
+            expected = like_backend.search(trigram_user_model, term, fields)
+
+            assert (list(trigram_user_model.search(term, fields=fields)) ==
+                    list(expected))
+
+    assert ([user.name for user in trigram_user_model.search('John')] ==
+            ['John', 'Johnny', 'Elton John'])
+
+
+def test_trigram_index_is_kept_in_sync(trigram_user_model):
+    """Ensure saves, deletes and rebuilds update the n-gram index."""
+    user = trigram_user_model(name='Johnny')
+    user.save()
+
+    user.name = 'Bobby'
+    user.save()
+
+    assert not list(trigram_user_model.search('john'))
+    assert list(trigram_user_model.search('obb')) == [user]
+
+    user.delete_instance()
+
+    assert not list(trigram_user_model.search('obb'))
+
+    trigram_user_model.insert(name='Bulk').execute()
+
+    assert not list(trigram_user_model.search('bulk'))
+
+    trigram_user_model.rebuild_search_index()
+
+    assert trigram_user_model.search('bulk').get().name == 'Bulk'
+
+
+@pytest.mark.parametrize('backend', [None, TrigramSearchBackend(),
+                                     FullTextSearchBackend()])
+def test_search_page(database, backend):
+    """Ensure search_page walks the ranked results with a cursor."""
+    class PagedPost(SearchMixin, Model):
+        title = peewee.CharField(max_length=255, null=False)
+
+        class Meta:
+            search_fields = ('title',)
+
+    if backend is not None:
+        PagedPost._meta.search_backend = backend
+
+    PagedPost._meta.database = database.database
+    PagedPost.create_table(True)
+    PagedPost.create_search_index()
+
+    for title in ('Post', 'Post about posts', 'A post', 'Postal', 'Other',
+                  'Post', 'My post'):
+        PagedPost(title=title).save()
+
+    expected = list(PagedPost.search('post'))
+    pages = []
+    cursor = None
+
+    while True:
+        page, cursor = PagedPost.search_page('post', after=cursor, limit=2)
+        pages.append(page)
+
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [2, 2, 2]
+    assert [post for page in pages for post in page] == expected
+
+    PagedPost.drop_search_index()
+    PagedPost.drop_table()
+
+
+@pytest.fixture
+def cached_user_model(database):
+    """Fixture that provides a User model that caches its searches."""
+    class CachedUser(SearchMixin, Model):
+        name = peewee.CharField(max_length=255, null=False)
+
+        class Meta:
+            search_fields = ('name',)
+            search_cache = SearchCache(max_size=2, ttl=60)
+
+    CachedUser._meta.database = database.database
+    CachedUser.create_table(True)
+
+    for name in ('John', 'Johnny', 'Jane', 'Elton John'):
+        CachedUser(name=name).save()
+
+    yield CachedUser
+
+    CachedUser.drop_table()
+
+
+def test_search_cache_hits_and_invalidation(cached_user_model, queries):
+    """Ensure repeated searches are cached until a record changes."""
+    cache = cached_user_model._meta.search_cache
+    first, cursor = cached_user_model.search_page('John ')
+
+    assert cursor is None
+    assert cache.misses == 1
+
+    del queries[:]
+    cached, cursor = cached_user_model.search_page('John')
+
+    assert not queries
+    assert cache.hits == 1
+    assert [user.name for user in cached] == [user.name for user in first]
+    assert cached[0] is not first[0]
+    assert not cached[0].dirty_fields
+
+    # Saving a record drops the cached pages
+    cached_user_model(name='Johnson').save()
+    del queries[:]
+    names = [user.name for user in cached_user_model.search_page('John')[0]]
+
+    assert queries
+    assert 'Johnson' in names
+
+    cached_user_model.search_page('Jane', limit=1)
+    cached_user_model.search_page('Elton', limit=1)
+
+    assert cache.evictions == 2
+    assert cache.hit_rate == 0.2
+
+
+def test_search_cache_skips_pages_changed_during_search(cached_user_model,
+                                                       monkeypatch):
+    """Ensure pages of records saved while they were searched aren't
+    cached.
+    """
+    cache = cached_user_model._meta.search_cache
+    get_page = cache.get_page
+
+    def get_page_then_save(*args):
+        page = get_page(*args)
+        cached_user_model(name='Johnson').save()
+
+        return page
+
+    monkeypatch.setattr(cache, 'get_page', get_page_then_save)
+    cached_user_model.search_page('John')
+    monkeypatch.undo()
+
+    assert not len(cache)
+
+    names = [user.name for user in cached_user_model.search_page('John')[0]]
+
+    assert 'Johnson' in names
+    assert cache.misses == 2
+
+
+def test_search_cache_prefix_reuse(cached_user_model, queries):
+    """Ensure longer terms are answered from complete shorter ones."""
+    cache = cached_user_model._meta.search_cache
+    cached_user_model.search_page('jo')
+
+    expected = [user.name for user in cached_user_model.search('john')]
+    del queries[:]
+    page, cursor = cached_user_model.search_page('john', limit=2)
+
+    assert not queries
+    assert cache.prefix_hits == 1
+    assert [user.name for user in page] == expected[:2]
+
+    page, cursor = cached_user_model.search_page('john', after=cursor)
+
+    assert not queries
+    assert [user.name for user in page] == expected[2:]
+    assert cursor is None
+
+    # Wildcards can't be matched in memory
+    cached_user_model.search_page('j')
+    cached_user_model.search_page('j%n')
+
+    assert queries
+
+
+def test_search_cache_expires(cached_user_model, monkeypatch):
+    """Ensure cached pages expire after their TTL."""
+    cache = cached_user_model._meta.search_cache
+    cached_user_model.search_page('John')
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    cached_user_model.search_page('John')
+
+    assert cache.hits == 0
+    assert cache.misses == 2
@@ -7,6 +7,8 @@ import peewee
 import pendulum
 import pytest
 
+from fleaker.peewee import Model
+from fleaker.peewee.mixins.time import base as time_base
 from fleaker.peewee.fields import ArrowDateTimeField, PendulumDateTimeField
 from fleaker.peewee.mixins import (
     ArchivedMixin, CreatedMixin, CreatedModifiedMixin, ArrowArchivedMixin,
@@ -147,3 +149,138 @@ def test_time_python_value(database, dt, Field):
     assert isinstance(
         field.python_value('2016-12-13T02:09:48.075736+00:00'), dt
     )
+
+
+@pytest.mark.parametrize('dt,Field', (
+    (arrow.Arrow, ArrowDateTimeField),
+    (pendulum.Pendulum, PendulumDateTimeField)
+))
+def test_time_python_value_fast_path(dt, Field):
+    """Ensure that common datetimes are converted like the libraries would
+    convert them.
+    """
+    field = Field()
+    naive = datetime.datetime(2016, 12, 13, 2, 9, 48, 75736)
+
+    for value, utcoffset in (
+            (naive, 0),
+            ('2016-12-13 02:09:48.075736', 0),
+            ('2016-12-13T02:09:48.075736Z', 0),
+            ('2016-12-13 02:09:48.075736+00:00', 0),
+            ('2016-12-13 02:09:48.075736-05:30', -19800),
+    ):
+        converted = field.python_value(value)
+
+        assert isinstance(converted, dt)
+        assert converted.utcoffset().total_seconds() == utcoffset
+        assert converted.isoformat()[:26] == naive.isoformat()
+
+
+@pytest.mark.parametrize('dt,Field', (
+    (arrow.Arrow, ArrowDateTimeField),
+    (pendulum.Pendulum, PendulumDateTimeField)
+))
+def test_lazy_time_field(database, dt, Field):
+    """Ensure that lazy time fields are converted when they're accessed."""
+    class LazyTimeModel(Model):
+        occurred = Field(lazy=True)
+
+    LazyTimeModel._meta.database = database.database
+    LazyTimeModel.create_table(True)
+
+    now = datetime.datetime(2016, 12, 13, 2, 9, 48, 75736)
+    LazyTimeModel.create(occurred=now)
+
+    instance = LazyTimeModel.select().get()
+
+    assert not isinstance(instance._data['occurred'], dt)
+    assert isinstance(instance.occurred, dt)
+    assert instance.occurred is instance.occurred
+    assert instance.occurred.isoformat()[:26] == now.isoformat()
+
+    # Rows that aren't model instances hold the converted values
+    query = LazyTimeModel.select(LazyTimeModel.occurred)
+
+    for value in (query.dicts().get()['occurred'], query.tuples().get()[0],
+                  query.as_records().get().occurred):
+        assert isinstance(value, dt)
+        assert value == instance.occurred
+
+
+@pytest.mark.parametrize('Mixin,dt', (
+    (ArchivedMixin, datetime.datetime),
+    (ArrowArchivedMixin, arrow.Arrow),
+    (PendulumArchivedMixin, pendulum.Pendulum),
+))
+def test_read_timestamps(database, monkeypatch, Mixin, dt):
+    """Ensure that the timestamps of many records can be read as columns."""
+    class MixinTest(Mixin):
+        class Meta:
+            db_table = Mixin.__name__
+
+    MixinTest._meta.database = database.database
+    MixinTest.create_table(True)
+
+    instances = [MixinTest.create() for _ in range(3)]
+    instances[1].archive_instance()
+
+    columns = MixinTest.read_timestamps(
+        query=MixinTest.select().order_by(MixinTest.id), chunk_size=2
+    )
+
+    assert list(columns) == ['id', 'created', 'modified', 'archived']
+    assert columns['id'] == [instance.id for instance in instances]
+    assert all(isinstance(value, dt) for value in columns['created'])
+    assert columns['created'] == [instance.created for instance in instances]
+    assert columns['archived'] == [None, instances[1].archived, None]
+
+    columns = MixinTest.read_timestamps(
+        query=MixinTest.select().where(MixinTest.id == instances[2].id)
+    )
+
+    assert columns['id'] == [instances[2].id]
+
+    columns = MixinTest.read_timestamps(
+        query=MixinTest.select().where(MixinTest.id < 0)
+    )
+
+    assert columns['id'] == columns['created'] == []
+
+    numpy = pytest.importorskip('numpy')
+    arrays = MixinTest.read_timestamps(
+        query=MixinTest.select().order_by(MixinTest.id), as_numpy=True
+    )
+
+    assert arrays['created'].dtype == numpy.dtype('datetime64[us]')
+    assert numpy.isnat(arrays['archived']).tolist() == [True, False, True]
+    assert arrays['created'][0].item() == datetime.datetime.strptime(
+        instances[0].created.strftime('%Y-%m-%d %H:%M:%S.%f'),
+        '%Y-%m-%d %H:%M:%S.%f'
+    )
+
+    # Naive and UTC columns are parsed by NumPy at once, and only columns
+    # with other timezones are normalized value by value
+    normalized = []
+    to_utc_naive = time_base._to_utc_naive
+
+    def tracked_to_utc_naive(value):
+        normalized.append(value)
+        return to_utc_naive(value)
+
+    monkeypatch.setattr(time_base, '_to_utc_naive', tracked_to_utc_naive)
+    MixinTest.read_timestamps(as_numpy=True)
+
+    assert not normalized
+
+    database.database.execute_sql(
+        'UPDATE {} SET archived = ? WHERE id = ?'.format(Mixin.__name__),
+        ('2016-12-13 07:39:48.075736+05:30', instances[0].id)
+    )
+    arrays = MixinTest.read_timestamps(
+        query=MixinTest.select().order_by(MixinTest.id), as_numpy=True
+    )
+
+    assert normalized
+    assert arrays['archived'][0].item() == datetime.datetime(
+        2016, 12, 13, 2, 9, 48, 75736
+    )
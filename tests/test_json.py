@@ -8,15 +8,22 @@ Unit tests for Fleaker.json module.
 
 import datetime
 import decimal
+import json
 
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 
 import arrow
 import pendulum
 import phonenumbers
 import pytest
+import simplejson
 
+from marshmallow import fields
+
+from fleaker import App
 from fleaker._compat import text_type
+from fleaker.json import FleakerJSONEncoder, FleakerOrjsonEncoder
+from fleaker.marshmallow import Schema
 
 
 @pytest.mark.parametrize('dt_mod', (pendulum, arrow))
@@ -106,3 +113,134 @@ def test_dump_nested_values(app):
     ])
 
     assert app.json.dumps(data)
+
+
+def test_register_serializer(app):
+    """Ensure that apps can register serializers for their own types."""
+    class Money(object):
+        def __init__(self, amount):
+            self.amount = amount
+
+    class Euros(Money):
+        pass
+
+    class DateEncoder(FleakerJSONEncoder):
+        pass
+
+    DateEncoder.register(datetime.date, lambda obj: 'a date')
+
+    with pytest.raises(TypeError):
+        app.json.dumps(Money(1))
+
+    @FleakerJSONEncoder.register(Money)
+    def serialize_money(money):
+        return {'amount': money.amount}
+
+    try:
+        # Subclasses are resolved through their MRO and then cached
+        assert app.json.loads(app.json.dumps([Money(1), Euros(2)])) == [
+            {'amount': 1}, {'amount': 2}
+        ]
+        assert FleakerJSONEncoder.get_serializer(Euros) is serialize_money
+
+        # Subclassed encoders have their own registries
+        assert DateEncoder.get_serializer(Money) is serialize_money
+        assert DateEncoder().default(datetime.date.today()) == 'a date'
+        assert FleakerJSONEncoder().default(
+            datetime.date(2017, 1, 1)
+        ) == '2017-01-01'
+    finally:
+        assert FleakerJSONEncoder.unregister(Money) is serialize_money
+
+    # Serializers resolved before they were unregistered aren't used
+    assert FleakerJSONEncoder.get_serializer(Euros) is None
+    assert DateEncoder.get_serializer(Money) is None
+
+    with pytest.raises(TypeError):
+        app.json.dumps(Euros(2))
+
+
+def test_orjson_backend():
+    """Ensure that the orjson backend serializes like simplejson does."""
+    pytest.importorskip('orjson')
+
+    app = App.create_app(__name__)
+    app.configure({'JSON_BACKEND': 'orjson'})
+
+    assert app.json_encoder is FleakerOrjsonEncoder
+
+    data = OrderedDict([
+        ('decimal', decimal.Decimal('2.010')),
+        ('pendulum', pendulum.utcnow()),
+        ('arrow', arrow.utcnow()),
+        ('datetime', datetime.datetime.utcnow()),
+        ('date', datetime.date.today()),
+        ('tel', phonenumbers.parse("+13308286147")),
+        ('iter', iter([1, 2])),
+        ('big', 2 ** 70),
+        ('raw', simplejson.RawJSON('{"a": [1]}')),
+        (1, 'key'),
+    ])
+
+    with app.app_context():
+        dumped = app.json.dumps(data)
+        data['iter'] = iter([1, 2])
+        expected = json.loads(FleakerJSONEncoder().encode(data))
+
+        assert json.loads(dumped) == expected
+        assert expected['decimal'] == '2.01'
+        assert expected['iter'] == [1, 2]
+        assert expected['raw'] == {'a': [1]}
+
+        with pytest.raises(TypeError):
+            app.json.dumps({'obj': object})
+
+        # Namedtuples are objects with both backends
+        point = namedtuple('Point', 'a b')(1, 2)
+        assert json.loads(app.json.dumps({'p': point})) == json.loads(
+            FleakerJSONEncoder().encode({'p': point})
+        ) == {'p': {'a': 1, 'b': 2}}
+
+        # Non finite floats are null with orjson, and NaN with simplejson
+        assert app.json.dumps({'n': float('nan')}) == '{"n":null}'
+        assert FleakerJSONEncoder().encode({'n': float('nan')}) == (
+            '{"n": NaN}'
+        )
+
+
+def test_json_backend_must_be_valid():
+    """Ensure that only known JSON backends can be configured."""
+    app = App.create_app(__name__)
+
+    with pytest.raises(ValueError):
+        app.configure({'JSON_BACKEND': 'nope'})
+
+
+def test_stream_json(app):
+    """Ensure that rows can be streamed as a JSON array."""
+    class RowSchema(Schema):
+        price = fields.Decimal(as_string=False)
+
+    rows = [{'price': decimal.Decimal('{}.50'.format(idx))}
+            for idx in range(5)]
+
+    with app.test_request_context():
+        response = app.stream_json(iter(rows), RowSchema, chunk_size=2)
+
+        assert response.is_streamed
+        assert response.mimetype == 'application/json'
+
+    chunks = list(response.response)
+
+    assert len(chunks) == 3
+    assert json.loads(''.join(chunks)) == [
+        {'price': '{}.5'.format(idx)} for idx in range(5)
+    ]
+
+    for chunk_size in (1, 5, 10):
+        response = app.stream_json(rows, chunk_size=chunk_size)
+        assert json.loads(response.get_data(as_text=True)) == [
+            {'price': '{}.5'.format(idx)} for idx in range(5)
+        ]
+
+    assert app.stream_json([]).get_data(as_text=True) == '[]'
@@ -0,0 +1,52 @@
+# ~*~ coding: utf-8 ~*~
+"""
+tests.test_utils
+~~~~~~~~~~~~~~~~
+
+Provides tests for the helpers in :mod:`fleaker.utils`.
+
+:copyright: (c) 2016 by Croscon Consulting, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from fleaker.utils import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Ensure the least recently used item is evicted when the cache fills."""
+    cache = LRUCache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    # Using 'a' makes 'b' the least recently used item
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+
+    assert len(cache) == 2
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert cache.get('c') == 3
+    assert cache.evictions == 1
+
+
+def test_lru_cache_counters():
+    """Ensure hits and misses are counted."""
+    cache = LRUCache()
+
+    assert cache.get('missing') is None
+    assert cache.get('missing', default=5) == 5
+
+    cache.set('key', 'value')
+
+    assert cache.get('key') == 'value'
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+    assert cache.pop('key') == 'value'
+    assert cache.pop('key') is None
+
+    cache.set('key', 'value')
+    cache.clear()
+
+    assert not len(cache)